@@ -0,0 +1,93 @@
+import io
+import mmap
+import struct
+import zipfile
+
+from src.errors import InvalidAssetError
+from src.logging import get_logger
+
+logger = get_logger()
+
+# Local file header: signature, version, flags, method, time, date, crc,
+# compressed size, size, name length, extra length
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_LOCAL_HEADER_SIGNATURE = 0x04034B50
+
+
+class PackArchive:
+    def __init__(self, path: str):
+        """
+        Read-only view of a .zip asset pack. The central directory is read once and
+        every member is served from the same open file handle; stored (uncompressed)
+        members are sliced straight out of an mmap of the archive.
+        """
+        self.path = path
+        try:
+            self._zip = zipfile.ZipFile(path, "r")
+        except (zipfile.BadZipFile, OSError) as e:
+            logger.error(
+                "InvalidAssetError: Cannot open asset pack archive %s: %s", path, e
+            )
+            raise InvalidAssetError(
+                f"Cannot open asset pack archive '{path}'."
+            ) from e
+        self._infos = {info.filename: info for info in self._zip.infolist()}
+        self._mmap = mmap.mmap(self._zip.fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data_offsets: dict[str, int] = {}
+        self.root = self._find_root()
+
+    def _find_root(self) -> str:
+        # Packs are often zipped with their folder, e.g. "mypack/textures/..."
+        for name in self._infos:
+            for folder in ("textures/", "sounds/"):
+                index = name.find(folder)
+                if index != -1 and (index == 0 or name[index - 1] == "/"):
+                    return name[:index]
+        return ""
+
+    def members(self, folder: str, extension: str) -> dict[str, str]:
+        """Map asset id -> member name for files in `folder` with `extension`."""
+        prefix = f"{self.root}{folder}/"
+        manifest = {}
+        for name, info in self._infos.items():
+            if info.is_dir() or not name.startswith(prefix):
+                continue
+            rest = name[len(prefix) :]
+            if "/" not in rest and rest.endswith(extension):
+                manifest[rest[: -len(extension)]] = name
+        return manifest
+
+    def stamp(self, name: str) -> tuple[str, int, int]:
+        """(archive!member, crc, size) identifying the member's current contents."""
+        info = self._infos[name]
+        return f"{self.path}!{name}", info.CRC, info.file_size
+
+    def _data_offset(self, info: zipfile.ZipInfo) -> int:
+        offset = self._data_offsets.get(info.filename)
+        if offset is None:
+            header = _LOCAL_HEADER.unpack_from(self._mmap, info.header_offset)
+            if header[0] != _LOCAL_HEADER_SIGNATURE:
+                logger.error(
+                    "InvalidAssetError: Corrupt member %s in %s", info.filename, self.path
+                )
+                raise InvalidAssetError(
+                    f"Corrupt member '{info.filename}' in '{self.path}'."
+                )
+            name_len, extra_len = header[9], header[10]
+            offset = info.header_offset + _LOCAL_HEADER.size + name_len + extra_len
+            self._data_offsets[info.filename] = offset
+        return offset
+
+    def read(self, name: str) -> bytes:
+        info = self._infos[name]
+        if info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1:
+            start = self._data_offset(info)
+            return self._mmap[start : start + info.file_size]
+        return self._zip.read(info)
+
+    def open(self, name: str) -> io.BytesIO:
+        return io.BytesIO(self.read(name))
+
+    def close(self):
+        self._mmap.close()
+        self._zip.close()
@@ -1,16 +1,59 @@
 import os
-from PIL import Image
+from typing import TYPE_CHECKING
+
 from pygame import Surface
 import pygame
 import pygame.mixer
 
+from src.asset.archive import PackArchive
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+MISSING_TEXTURE_ID = "openbench.missing"
+
+
+def _scan_dir(directory, extension):
+    # Map asset id -> file path for every file with the extension in directory
+    manifest = {}
+    try:
+        entries = os.scandir(directory)
+    except (FileNotFoundError, NotADirectoryError):
+        return manifest
+    with entries:
+        for entry in entries:
+            if entry.name.endswith(extension) and entry.is_file():
+                manifest[entry.name[: -len(extension)]] = entry.path
+    return manifest
+
 
 class AssetPack:
     def __init__(self, pack_dir):
+        """
+        pack_dir: a pack directory, or a .zip archive with the same layout
+        """
         self.pack_dir = pack_dir
-        self._texture_cache: dict[str, Image.Image] = {}
+        self.archive = (
+            PackArchive(pack_dir)
+            if pack_dir.endswith(".zip") and os.path.isfile(pack_dir)
+            else None
+        )
+        self._texture_cache: dict[str, "Image.Image"] = {}
         self._surface_cache: dict[str, Surface] = {}
         self._sound_cache: dict[str, pygame.mixer.Sound] = {}
+        # Manifests of asset id -> path, scanned once instead of a stat per lookup
+        self.textures: dict[str, str] = {}
+        self.sounds: dict[str, str] = {}
+        self.scan()
+
+    def scan(self):
+        if self.archive:
+            self.textures = self.archive.members("textures", ".png")
+            self.sounds = self.archive.members("sounds", ".wav")
+            return
+        self.textures = _scan_dir(os.path.join(self.pack_dir, "textures"), ".png")
+        self.sounds = _scan_dir(os.path.join(self.pack_dir, "sounds"), ".wav")
 
     def get_texture_path(self, texture_id):
         return os.path.join(self.pack_dir, "textures", f"{texture_id}.png")
@@ -19,17 +62,67 @@ class AssetPack:
         return os.path.join(self.pack_dir, "sounds", f"{sound_id}.wav")
 
     def has_texture(self, texture_id):
-        return os.path.isfile(self.get_texture_path(texture_id))
+        return texture_id in self.textures
 
     def has_sound(self, sound_id):
-        return os.path.isfile(self.get_sound_path(sound_id))
+        return sound_id in self.sounds
+
+    def texture_stamp(self, texture_id):
+        """(path, mtime_ns, size) identifying the current contents of a texture file."""
+        path = self.textures[texture_id]
+        if self.archive:
+            return self.archive.stamp(path)
+        st = os.stat(path)
+        return path, st.st_mtime_ns, st.st_size
+
+    def open_texture(self, texture_id):
+        if self.archive:
+            return self.archive.open(self.textures[texture_id])
+        return open(self.textures[texture_id], "rb")
+
+    def open_sound(self, sound_id):
+        if self.archive:
+            return self.archive.open(self.sounds[sound_id])
+        return open(self.sounds[sound_id], "rb")
+
+    def install_surface(self, texture_id, surface: Surface):
+        self._surface_cache[texture_id] = surface
+
+    def install_sound(self, sound_id, sound: pygame.mixer.Sound):
+        self._sound_cache[sound_id] = sound
+
+    def forget_texture(self, texture_id):
+        self._texture_cache.pop(texture_id, None)
+        self._surface_cache.pop(texture_id, None)
+
+    def forget_sound(self, sound_id):
+        self._sound_cache.pop(sound_id, None)
+
+    def watch_paths(self) -> list[str]:
+        """Directories (or the archive file) whose changes affect this pack."""
+        if self.archive:
+            return [self.pack_dir]
+        return [
+            os.path.join(self.pack_dir, "textures"),
+            os.path.join(self.pack_dir, "sounds"),
+        ]
+
+    def reopen(self):
+        """Re-read the pack's archive index (if any) and manifests."""
+        if self.archive:
+            self.archive.close()
+            self.archive = PackArchive(self.pack_dir)
+        self.scan()
 
     def load_texture(self, texture_id):
         if texture_id in self._texture_cache:
             return self._texture_cache[texture_id]
-        path = self.get_texture_path(texture_id)
-        if os.path.isfile(path):
-            img = Image.open(path).convert("RGBA")
+        if texture_id in self.textures:
+            # PIL is only needed when a texture was not preloaded from the cache
+            from PIL import Image
+
+            with self.open_texture(texture_id) as f:
+                img = Image.open(f).convert("RGBA")
             self._texture_cache[texture_id] = img
             return img
         return None
@@ -50,40 +143,134 @@ class AssetPack:
     def load_sound(self, sound_id):
         if sound_id in self._sound_cache:
             return self._sound_cache[sound_id]
-        path = self.get_sound_path(sound_id)
-        if os.path.isfile(path):
-            sound = pygame.mixer.Sound(path)
+        if sound_id in self.sounds:
+            with self.open_sound(sound_id) as f:
+                sound = pygame.mixer.Sound(file=f)
             self._sound_cache[sound_id] = sound
             return sound
         return None
 
 
 class PackManager:
-    def __init__(self, default_pack_dir, custom_pack_dir=None):
+    def __init__(self, default_pack_dir, *overlay_pack_dirs):
+        """
+        default_pack_dir: base pack, always at the bottom of the stack
+        overlay_pack_dirs: packs layered on top, lowest priority first
+        (e.g. seasonal, server, user); None entries are ignored
+        """
         self.default_pack = AssetPack(default_pack_dir)
-        self.custom_pack = AssetPack(custom_pack_dir) if custom_pack_dir else None
+        self.overlay_packs: list[AssetPack] = []
+        self.texture_sources: dict[str, AssetPack] = {}
+        self.sound_sources: dict[str, AssetPack] = {}
+        # Resolved results per id, including missing-texture fallbacks
+        self._textures: dict[str, "Image.Image | None"] = {}
+        self._surfaces: dict[str, Surface | None] = {}
+        # Lookups that had to go to a pack (hits are not counted on the hot path)
+        self.surface_misses = 0
+        # Called with the set of texture ids whose resolved source changed
+        self._listeners = []
+        self.set_overlays(overlay_pack_dirs)
+
+    @property
+    def packs(self) -> list[AssetPack]:
+        """Packs from lowest to highest priority."""
+        return [self.default_pack, *self.overlay_packs]
+
+    @property
+    def custom_pack(self) -> AssetPack | None:
+        return self.overlay_packs[-1] if self.overlay_packs else None
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    def set_overlays(self, pack_dirs):
+        """Replace the overlay stack; packs already loaded keep their caches."""
+        existing = {pack.pack_dir: pack for pack in self.overlay_packs}
+        self.overlay_packs = [
+            existing.get(pack_dir) or AssetPack(pack_dir)
+            for pack_dir in pack_dirs
+            if pack_dir
+        ]
+        self.resolve()
+
+    def resolve(self):
+        """
+        Flatten the stack into id -> pack tables and invalidate only the ids whose
+        resolved pack changed, notifying listeners (e.g. renderer caches).
+        """
+        texture_sources: dict[str, AssetPack] = {}
+        sound_sources: dict[str, AssetPack] = {}
+        for pack in self.packs:
+            for texture_id in pack.textures:
+                texture_sources[texture_id] = pack
+            for sound_id in pack.sounds:
+                sound_sources[sound_id] = pack
+
+        old_sources = self.texture_sources
+        changed = {
+            texture_id
+            for texture_id in old_sources.keys() | texture_sources.keys()
+            if old_sources.get(texture_id) is not texture_sources.get(texture_id)
+        }
+        # Unknown ids resolve to the missing texture, so they change along with it
+        if MISSING_TEXTURE_ID in changed:
+            changed.update(
+                texture_id
+                for texture_id in self._surfaces.keys() | self._textures.keys()
+                if texture_id not in texture_sources
+            )
+
+        self.texture_sources = texture_sources
+        self.sound_sources = sound_sources
+        self.invalidate(changed)
+
+    def invalidate(self, texture_ids=None):
+        """Forget resolved textures for `texture_ids` (all if None) and notify listeners."""
+        if texture_ids is None:
+            texture_ids = set(self._surfaces) | set(self._textures)
+            self._surfaces.clear()
+            self._textures.clear()
+        else:
+            for texture_id in texture_ids:
+                self._surfaces.pop(texture_id, None)
+                self._textures.pop(texture_id, None)
+        if texture_ids:
+            for listener in self._listeners:
+                listener(texture_ids)
+
+    def _texture_source(self, texture_id):
+        pack = self.texture_sources.get(texture_id)
+        if pack is not None:
+            return pack, texture_id
+        return self.texture_sources.get(MISSING_TEXTURE_ID), MISSING_TEXTURE_ID
 
     def load_texture(self, texture_id):
-        if self.custom_pack and self.custom_pack.has_texture(texture_id):
-            return self.custom_pack.load_texture(texture_id)
-        if self.default_pack.has_texture(texture_id):
-            return self.default_pack.load_texture(texture_id)
-        if self.default_pack.has_texture("openbench.missing"):
-            return self.default_pack.load_texture("openbench.missing")
-        return None
+        try:
+            return self._textures[texture_id]
+        except KeyError:
+            pass
+        pack, resolved_id = self._texture_source(texture_id)
+        texture = pack.load_texture(resolved_id) if pack else None
+        self._textures[texture_id] = texture
+        return texture
 
     def load_texture_as_surface(self, texture_id):
-        if self.custom_pack and self.custom_pack.has_texture(texture_id):
-            return self.custom_pack.load_texture_as_surface(texture_id)
-        if self.default_pack.has_texture(texture_id):
-            return self.default_pack.load_texture_as_surface(texture_id)
-        if self.default_pack.has_texture("openbench.missing"):
-            return self.default_pack.load_texture_as_surface("openbench.missing")
-        return None
+        try:
+            return self._surfaces[texture_id]
+        except KeyError:
+            self.surface_misses += 1
+        pack, resolved_id = self._texture_source(texture_id)
+        surface = pack.load_texture_as_surface(resolved_id) if pack else None
+        self._surfaces[texture_id] = surface
+        return surface
+
+    @property
+    def cache_sizes(self) -> dict[str, int]:
+        return {"textures": len(self._textures), "surfaces": len(self._surfaces)}
 
     def load_sound(self, sound_id):
-        if self.custom_pack and self.custom_pack.has_sound(sound_id):
-            return self.custom_pack.load_sound(sound_id)
-        if self.default_pack.has_sound(sound_id):
-            return self.default_pack.load_sound(sound_id)
-        return None
+        pack = self.sound_sources.get(sound_id)
+        return pack.load_sound(sound_id) if pack else None
@@ -0,0 +1,228 @@
+import io
+import json
+import mmap
+import os
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+import pygame.mixer
+
+from src.asset.pack_manager import PackManager
+from src.logging import get_logger
+
+logger = get_logger()
+
+CACHE_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "cache")
+)
+CACHE_FILE = os.path.join(CACHE_DIR, "textures.bin")
+CACHE_MAGIC = b"OBTXC1"
+CACHE_VERSION = 1
+
+
+def decode_texture(pack, texture_id):
+    """Decode a texture to raw RGBA bytes; runs on a worker thread."""
+    # Imported lazily: with a warm cache PIL is never needed
+    from PIL import Image
+
+    with pack.open_texture(texture_id) as f:
+        img = Image.open(f).convert("RGBA")
+    return img.tobytes(), img.size
+
+
+def read_sound(pack, sound_id):
+    with pack.open_sound(sound_id) as f:
+        return f.read()
+
+
+class DecodedTextureCache:
+    def __init__(self, path: str = CACHE_FILE):
+        """
+        Persistent cache of decoded RGBA buffers in a single file: a JSON index
+        followed by the raw pixel data, read back through mmap. Entries are keyed
+        by source path, mtime and size so edited files are decoded again.
+        """
+        self.path = path
+        self._index: dict[str, list[int]] = {}
+        self._mmap: mmap.mmap | None = None
+        self._file = None
+        self._data_start = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    @staticmethod
+    def key(stamp) -> str:
+        path, mtime_ns, size = stamp
+        return f"{path}|{mtime_ns}|{size}"
+
+    def load(self):
+        try:
+            self._file = open(self.path, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError, OSError):
+            # Missing or empty cache file
+            self.close()
+            return
+        try:
+            if self._mmap[: len(CACHE_MAGIC)] != CACHE_MAGIC:
+                raise ValueError("bad magic")
+            offset = len(CACHE_MAGIC)
+            (index_len,) = struct.unpack_from("<I", self._mmap, offset)
+            offset += 4
+            header = json.loads(self._mmap[offset : offset + index_len])
+            if header.get("version") != CACHE_VERSION:
+                raise ValueError("unsupported version")
+            self._index = header["entries"]
+            self._data_start = offset + index_len
+        except (ValueError, KeyError, struct.error) as e:
+            logger.warning("Ignoring unreadable texture cache %s: %s", self.path, e)
+            self.close()
+
+    def get(self, key: str):
+        """Return (memoryview of RGBA bytes, (w, h)) or None."""
+        entry = self._index.get(key)
+        if entry is None or self._mmap is None:
+            return None
+        offset, length, width, height = entry
+        start = self._data_start + offset
+        # Release the whole-map view so only the slice holds the mmap open
+        with memoryview(self._mmap) as whole:
+            data = whole[start : start + length]
+        return data, (width, height)
+
+    def close(self):
+        self._index = {}
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Still exported through a memoryview; released with it
+                pass
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def save(self, keep: list[str], new: dict[str, tuple[bytes, tuple[int, int]]]):
+        """
+        Atomically replace the cache file with the `keep` entries of the current
+        file plus the `new` ones; anything else is pruned.
+        """
+        entries = {key: self.get(key) for key in keep if key in self._index}
+        entries.update(new)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        index = {}
+        offset = 0
+        for key, (data, (width, height)) in entries.items():
+            index[key] = [offset, len(data), width, height]
+            offset += len(data)
+        header = json.dumps({"version": CACHE_VERSION, "entries": index}).encode()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(CACHE_MAGIC + struct.pack("<I", len(header)) + header)
+            for data, _ in entries.values():
+                f.write(data)
+                if isinstance(data, memoryview):
+                    data.release()
+        self.close()
+        os.replace(tmp_path, self.path)
+
+
+def preload_assets(
+    pack_manager: PackManager, workers: int | None = None, cache_path: str = CACHE_FILE
+) -> dict:
+    """
+    Decode every resolved texture and read every sound up front on a thread pool,
+    using the decoded-texture cache to skip PIL for unchanged files. Must run after
+    pygame.init() since surfaces and sounds are created here.
+    """
+    start = time.perf_counter()
+    workers = workers or min(8, os.cpu_count() or 1)
+
+    textures = {}
+    for texture_id, pack in pack_manager.texture_sources.items():
+        try:
+            textures[(pack, texture_id)] = pack.texture_stamp(texture_id)
+        except OSError as e:
+            logger.warning("Cannot stat texture '%s': %s", texture_id, e)
+    sounds = list(pack_manager.sound_sources.items())
+
+    cache = DecodedTextureCache(cache_path)
+    cache.load()
+
+    decoded: dict[str, tuple[bytes, tuple[int, int]]] = {}
+    hit_keys: list[str] = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        jobs = {}
+        for (pack, texture_id), stamp in textures.items():
+            key = DecodedTextureCache.key(stamp)
+            cached = cache.get(key)
+            if cached is not None:
+                data, size = cached
+                hit_keys.append(key)
+                surface = pygame.image.frombuffer(data, size, "RGBA").copy()
+                pack.install_surface(texture_id, surface)
+                data.release()
+            else:
+                jobs[(pack, texture_id, key)] = executor.submit(
+                    decode_texture, pack, texture_id
+                )
+        sound_jobs = {
+            (pack, sound_id): executor.submit(read_sound, pack, sound_id)
+            for sound_id, pack in sounds
+        }
+
+        for (pack, texture_id, key), job in jobs.items():
+            try:
+                data, size = job.result()
+            except Exception as e:
+                logger.warning("Failed to decode texture '%s': %s", texture_id, e)
+                continue
+            pack.install_surface(
+                texture_id, pygame.image.fromstring(data, size, "RGBA")
+            )
+            decoded[key] = (data, size)
+
+        mixer_ready = pygame.mixer.get_init() is not None
+        for (pack, sound_id), job in sound_jobs.items():
+            try:
+                data = job.result()
+                if mixer_ready:
+                    sound = pygame.mixer.Sound(file=io.BytesIO(data))
+                    pack.install_sound(sound_id, sound)
+            except Exception as e:
+                logger.warning("Failed to preload sound '%s': %s", sound_id, e)
+
+    # Rewrite only when something was decoded or stale entries can be pruned
+    if decoded or len(hit_keys) != len(cache):
+        try:
+            cache.save(hit_keys, decoded)
+        except OSError as e:
+            logger.warning("Failed to write texture cache %s: %s", cache_path, e)
+    cache.close()
+
+    # Drop memoized lookups made before the surfaces were installed
+    pack_manager.invalidate()
+
+    stats = {
+        "textures": len(textures),
+        "texture_cache_hits": len(hit_keys),
+        "textures_decoded": len(jobs),
+        "sounds": len(sounds),
+        "seconds": time.perf_counter() - start,
+    }
+    logger.info(
+        "Preloaded %d textures (%d from cache, %d decoded) and %d sounds in %.3fs",
+        stats["textures"],
+        stats["texture_cache_hits"],
+        stats["textures_decoded"],
+        stats["sounds"],
+        stats["seconds"],
+    )
+    return stats
@@ -1,3 +1,145 @@
+import math
+
+import pygame
+import pygame.mixer
+
+from src.logging import get_logger
+
+logger = get_logger()
+
+
 class Sound:
     def __init__(self, sound_id: str):
         self.sound_id = sound_id
+
+
+class SoundManager:
+    def __init__(
+        self,
+        pack_manager,
+        num_channels: int = 16,
+        music_channels: int = 1,
+        ui_channels: int = 2,
+        max_per_frame: int = 1,
+        min_interval_ms: int = 40,
+        steal: str = "oldest",
+        max_distance: float = 512.0,
+        ref_distance: float = 64.0,
+    ):
+        """
+        Plays sounds from `pack_manager` on a fixed pool of mixer channels.
+
+        The first channels are reserved for music and UI so world sounds can never
+        cut them off. Identical sounds are limited to max_per_frame per frame and
+        one per min_interval_ms, and when a pool is full the oldest (or quietest,
+        steal="quietest") voice in it is stopped and reused.
+        max_distance/ref_distance: pixel distances for positional attenuation
+        """
+        self.pack_manager = pack_manager
+        self.max_per_frame = max_per_frame
+        self.min_interval_ms = min_interval_ms
+        self.steal = steal
+        self.max_distance = max_distance
+        self.ref_distance = ref_distance
+
+        pygame.mixer.set_num_channels(num_channels)
+        reserved = music_channels + ui_channels
+        # Reserved channels are never picked by pygame's automatic Sound.play()
+        pygame.mixer.set_reserved(reserved)
+        channels = [pygame.mixer.Channel(i) for i in range(num_channels)]
+        self.pools: dict[str, list[pygame.mixer.Channel]] = {
+            "music": channels[:music_channels],
+            "ui": channels[music_channels:reserved],
+            "world": channels[reserved:],
+        }
+        # channel id -> (start ticks, volume) of the voice playing on it
+        self._voices: dict[int, tuple[int, float]] = {}
+        self._frame_counts: dict[str, int] = {}
+        self._last_played: dict[str, int] = {}
+        self.played = 0
+        self.dropped = 0
+        self.stolen = 0
+
+    def begin_frame(self):
+        self._frame_counts.clear()
+
+    def attenuate(self, position, listener) -> tuple[float, float]:
+        """(gain, pan) for a sound at `position` heard from `listener`; pan is -1..1."""
+        dx = position[0] - listener[0]
+        dy = position[1] - listener[1]
+        distance = math.hypot(dx, dy)
+        if distance >= self.max_distance:
+            return 0.0, 0.0
+        if distance <= self.ref_distance:
+            gain = 1.0
+        else:
+            span = self.max_distance - self.ref_distance
+            gain = 1.0 - (distance - self.ref_distance) / span
+        pan = max(-1.0, min(1.0, dx / self.max_distance))
+        return gain, pan
+
+    def _pick_channel(self, pool: list[pygame.mixer.Channel]):
+        for channel in pool:
+            if not channel.get_busy():
+                return channel
+        if not pool:
+            return None
+        if self.steal == "quietest":
+            victim = min(pool, key=lambda c: self._voices.get(id(c), (0, 0.0))[1])
+        else:
+            victim = min(pool, key=lambda c: self._voices.get(id(c), (0, 0.0))[0])
+        victim.stop()
+        self.stolen += 1
+        return victim
+
+    def play(
+        self,
+        sound_id: str,
+        category: str = "world",
+        volume: float = 1.0,
+        position=None,
+        listener=None,
+        loops: int = 0,
+    ):
+        """Play a sound, returning its channel or None if it was dropped."""
+        now = pygame.time.get_ticks()
+        count = self._frame_counts.get(sound_id, 0)
+        last = self._last_played.get(sound_id)
+        if count >= self.max_per_frame or (
+            last is not None and now - last < self.min_interval_ms
+        ):
+            self.dropped += 1
+            return None
+
+        left = right = volume
+        if position is not None and listener is not None:
+            gain, pan = self.attenuate(position, listener)
+            if gain <= 0.0:
+                self.dropped += 1
+                return None
+            left = volume * gain * min(1.0, 1.0 - pan)
+            right = volume * gain * min(1.0, 1.0 + pan)
+
+        sound = self.pack_manager.load_sound(sound_id)
+        if sound is None:
+            return None
+        channel = self._pick_channel(self.pools.get(category, self.pools["world"]))
+        if channel is None:
+            self.dropped += 1
+            return None
+
+        channel.play(sound, loops=loops)
+        channel.set_volume(left, right)
+        self._voices[id(channel)] = (now, max(left, right))
+        self._frame_counts[sound_id] = count + 1
+        self._last_played[sound_id] = now
+        self.played += 1
+        return channel
+
+    def play_music(self, sound_id: str, volume: float = 1.0):
+        """Loop a sound forever on the reserved music channel."""
+        return self.play(sound_id, "music", volume, loops=-1)
+
+    def stop_all(self):
+        pygame.mixer.stop()
+        self._voices.clear()
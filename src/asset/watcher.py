@@ -0,0 +1,324 @@
+import ctypes
+import ctypes.util
+import io
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+
+import pygame
+import pygame.mixer
+
+from src.asset.archive import PackArchive
+from src.asset.pack_manager import AssetPack, PackManager
+from src.logging import get_logger
+
+logger = get_logger()
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+
+_EXTENSIONS = {"textures": ".png", "sounds": ".wav"}
+
+
+class _Inotify:
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, str] = {}
+
+    def add_dir(self, path: str):
+        mask = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self._dirs[wd] = path
+
+    def read(self, timeout: float) -> set[str]:
+        """Wait up to `timeout` seconds and return the paths that changed."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        paths = set()
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, _, _, name_len = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset : offset + name_len].rstrip(b"\0")
+            offset += name_len
+            if wd in self._dirs and name:
+                paths.add(os.path.join(self._dirs[wd], os.fsdecode(name)))
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _snapshot(paths: list[str]) -> dict[str, tuple[int, int]]:
+    """(mtime_ns, size) of each file in the given directories or of the files given."""
+    result = {}
+    for path in paths:
+        if os.path.isdir(path):
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    # Files can vanish between listing and stat, e.g. while an
+                    # editor saves by replacing them; they show up next time
+                    try:
+                        if entry.is_file():
+                            st = entry.stat()
+                            result[entry.path] = (st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        continue
+        else:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            result[path] = (st.st_mtime_ns, st.st_size)
+    return result
+
+
+class AssetWatcher:
+    def __init__(
+        self,
+        pack_manager: PackManager,
+        poll_interval: float = 1.0,
+        debounce: float = 0.1,
+        use_inotify: bool = True,
+    ):
+        """
+        Watches every pack in `pack_manager` for changed asset files on a background
+        thread (inotify on Linux, mtime polling elsewhere and for .zip packs) and
+        decodes changed files there. apply_pending() installs the results on the
+        main thread and evicts the matching renderer cache entries.
+        """
+        self.pack_manager = pack_manager
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.use_inotify = use_inotify and sys.platform.startswith("linux")
+        self._results: queue.Queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.reloads = 0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="asset-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _owner(self, path: str) -> tuple[AssetPack, str, str] | None:
+        # Map a changed file to (pack, "textures"/"sounds", asset id)
+        folder_path, name = os.path.split(path)
+        folder = os.path.basename(folder_path)
+        extension = _EXTENSIONS.get(folder)
+        if extension is None or not name.endswith(extension):
+            return None
+        pack_dir = os.path.abspath(os.path.dirname(folder_path))
+        for pack in self.pack_manager.packs:
+            if not pack.archive and os.path.abspath(pack.pack_dir) == pack_dir:
+                return pack, folder, name[: -len(extension)]
+        return None
+
+    def _run(self):
+        packs = list(self.pack_manager.packs)
+        dirs = [p for pack in packs if not pack.archive for p in pack.watch_paths()]
+        archives = [pack for pack in packs if pack.archive]
+
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = _Inotify()
+                for path in dirs:
+                    if os.path.isdir(path):
+                        inotify.add_dir(path)
+                logger.info("Watching %d asset directories with inotify", len(dirs))
+            except (OSError, AttributeError) as e:
+                logger.info("inotify unavailable (%s), polling asset files", e)
+                if inotify is not None:
+                    inotify.close()
+                inotify = None
+        # Archives are always polled; directories only without inotify
+        polled = [pack.pack_dir for pack in archives]
+        if inotify is None:
+            polled += dirs
+        previous = _snapshot(polled)
+
+        try:
+            while not self._stop.is_set():
+                changed = set()
+                if inotify is not None:
+                    changed |= inotify.read(self.poll_interval)
+                    if changed:
+                        # Let editors finish writing before decoding
+                        time.sleep(self.debounce)
+                        changed |= inotify.read(0)
+                else:
+                    self._stop.wait(self.poll_interval)
+                current = _snapshot(polled)
+                changed |= {
+                    path
+                    for path in previous.keys() | current.keys()
+                    if previous.get(path) != current.get(path)
+                }
+                previous = current
+                if changed:
+                    self._decode_changes(changed, archives)
+        except Exception:
+            logger.exception("Asset watcher stopped")
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def _decode_changes(self, paths: set[str], archives: list[AssetPack]):
+        from PIL import Image
+
+        for pack in archives:
+            if pack.pack_dir in paths:
+                self._decode_archive(pack)
+        for path in paths:
+            owner = self._owner(path)
+            if owner is None:
+                continue
+            pack, folder, asset_id = owner
+            data = None
+            try:
+                if os.path.isfile(path):
+                    if folder == "textures":
+                        with Image.open(path) as img:
+                            img = img.convert("RGBA")
+                        data = (img.tobytes(), img.size)
+                    else:
+                        with open(path, "rb") as f:
+                            data = f.read()
+            except Exception as e:
+                logger.warning("Failed to reload %s: %s", path, e)
+                continue
+            self._results.put((pack, folder, asset_id, data))
+
+    def _decode_archive(self, pack: AssetPack):
+        from PIL import Image
+
+        try:
+            archive = PackArchive(pack.pack_dir)
+        except Exception as e:
+            logger.warning("Failed to reopen %s: %s", pack.pack_dir, e)
+            return
+        textures = {}
+        sounds = {}
+        old = pack.archive
+        try:
+            for folder, decoded in (("textures", textures), ("sounds", sounds)):
+                members = archive.members(folder, _EXTENSIONS[folder])
+                old_members = old.members(folder, _EXTENSIONS[folder])
+                for asset_id in members.keys() | old_members.keys():
+                    name = members.get(asset_id)
+                    old_name = old_members.get(asset_id)
+                    if (
+                        name
+                        and old_name
+                        and archive.stamp(name)[1:] == old.stamp(old_name)[1:]
+                    ):
+                        continue
+                    if name is None:
+                        decoded[asset_id] = None
+                        continue
+                    # A broken member keeps its old asset, like a broken loose file
+                    try:
+                        if folder == "textures":
+                            with Image.open(archive.open(name)) as img:
+                                img = img.convert("RGBA")
+                            decoded[asset_id] = (img.tobytes(), img.size)
+                        else:
+                            decoded[asset_id] = archive.read(name)
+                    except Exception as e:
+                        logger.warning(
+                            "Failed to reload %s from %s: %s", name, pack.pack_dir, e
+                        )
+        except Exception as e:
+            logger.warning("Failed to reload %s: %s", pack.pack_dir, e)
+            archive.close()
+            return
+        self._results.put((pack, "archive", archive, (textures, sounds)))
+
+    def apply_pending(self) -> int:
+        """Install reloaded assets; call once per frame on the main thread."""
+        changed_textures = set()
+        rescan = set()
+        applied = 0
+        while True:
+            try:
+                pack, kind, key, data = self._results.get_nowait()
+            except queue.Empty:
+                break
+            applied += 1
+            if kind == "archive":
+                old_archive = pack.archive
+                pack.archive = key
+                old_archive.close()
+                rescan.add(pack)
+                textures, sounds = data
+                for texture_id, texture in textures.items():
+                    self._install_texture(pack, texture_id, texture)
+                    changed_textures.add(texture_id)
+                for sound_id, sound in sounds.items():
+                    self._install_sound(pack, sound_id, sound)
+            elif kind == "textures":
+                self._install_texture(pack, key, data)
+                changed_textures.add(key)
+                if (key in pack.textures) != (data is not None):
+                    rescan.add(pack)
+            else:
+                self._install_sound(pack, key, data)
+                if (key in pack.sounds) != (data is not None):
+                    rescan.add(pack)
+
+        if not applied:
+            return 0
+        for pack in rescan:
+            pack.scan()
+        if rescan:
+            self.pack_manager.resolve()
+        self.pack_manager.invalidate(changed_textures)
+        self.reloads += applied
+        logger.info("Hot-reloaded %d asset change(s)", applied)
+        return applied
+
+    def _install_texture(self, pack: AssetPack, texture_id: str, data):
+        pack.forget_texture(texture_id)
+        if data is not None:
+            rgba, size = data
+            surface = pygame.image.fromstring(rgba, size, "RGBA")
+            pack.install_surface(texture_id, surface)
+
+    def _install_sound(self, pack: AssetPack, sound_id: str, data):
+        pack.forget_sound(sound_id)
+        if data is not None and pygame.mixer.get_init() is not None:
+            sound = pygame.mixer.Sound(file=io.BytesIO(data))
+            pack.install_sound(sound_id, sound)
@@ -0,0 +1,443 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from src.atrribute import Attribute
+from src.entities.hitbox import Hitbox
+from src.entities.npe import NonPlayerEntity
+from src.entities.physics import Physics
+from src.world.chunk import Chunk
+from src.world.grid import TileGrid
+from src.world.set_tile import set_tile
+from src.world.tile import Tile
+from src.logging import get_logger
+
+logger = get_logger()
+
+FORMAT_VERSION = 1
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), "..", "assets", "default")
+
+# name -> setup function returning the callable to time
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def dense_world(size: int = 8) -> list[Chunk]:
+    """size x size chunks with every tile filled."""
+    return [
+        Chunk(
+            (cx, cy),
+            [Tile(x, y, "openbench.wood") for y in range(16) for x in range(16)],
+        )
+        for cy in range(size)
+        for cx in range(size)
+    ]
+
+
+def sparse_world(size: int = 8) -> list[Chunk]:
+    """A row of size chunks with only a floor, like the default world."""
+    return [
+        Chunk((cx, 0), [Tile(x, 15, "openbench.wood") for x in range(16)])
+        for cx in range(size)
+    ]
+
+
+def _random_points(rng: random.Random, count: int, width: int, height: int):
+    # World pixel positions at tile centres
+    return [
+        (rng.randrange(width) * 16 + 8, rng.randrange(height) * 16 + 8)
+        for _ in range(count)
+    ]
+
+
+@benchmark("set_tile.dense.replace")
+def bench_set_tile_dense():
+    chunks = dense_world()
+    index = {chunk.position: chunk for chunk in chunks}
+    # Unique points, so every call in a run replaces a tile
+    points = list(dict.fromkeys(_random_points(random.Random(1), 256, 8 * 16, 8 * 16)))
+    # The world starts as wood; alternating the type between runs means no call
+    # hits the same-type no-op path
+    types = ("openbench.stone", "openbench.wood")
+    runs = [0]
+
+    def run():
+        tile_type = types[runs[0] & 1]
+        runs[0] += 1
+        for x, y in points:
+            set_tile(chunks, x, y, tile_type, index)
+
+    return run
+
+
+@benchmark("set_tile.sparse.place_remove")
+def bench_set_tile_sparse():
+    chunks = sparse_world()
+    index = {chunk.position: chunk for chunk in chunks}
+    # Above the floor, so every point is a place followed by a remove
+    points = _random_points(random.Random(2), 256, 8 * 16, 15)
+
+    def run():
+        for x, y in points:
+            set_tile(chunks, x, y, "openbench.wood", index)
+        for x, y in points:
+            set_tile(chunks, x, y, None, index)
+
+    return run
+
+
+@benchmark("set_tile.sparse.linear_search")
+def bench_set_tile_linear():
+    # Same edits without a chunk index, the path older callers still take
+    chunks = sparse_world(32)
+    points = _random_points(random.Random(3), 256, 32 * 16, 15)
+
+    def run():
+        for x, y in points:
+            set_tile(chunks, x, y, "openbench.wood")
+        for x, y in points:
+            set_tile(chunks, x, y, None)
+
+    return run
+
+
+def _physics_case(entities: int, chunks: list[Chunk]):
+    grid = TileGrid(chunks)
+    rng = random.Random(4)
+    width = max(chunk.position[0] for chunk in chunks) * 16 + 16
+    bodies = []
+    for i in range(entities):
+        entity = NonPlayerEntity(
+            uuid=f"#bench-{i}",
+            hitbox=Hitbox(1.0, 1.0),
+            position=(rng.uniform(0, width * 16 - 16), rng.uniform(0, 200)),
+            attributes={"gravity": Attribute("gravity", 250.0)},
+        )
+        entity.physics = Physics(entity, grid)
+        bodies.append((entity, entity.position, [rng.uniform(-60, 60), 0.0]))
+
+    def run():
+        # Reset so every run simulates the same second of falling and sliding
+        for entity, position, velocity in bodies:
+            entity.position = position
+            entity.velocity = list(velocity)
+        for _ in range(60):
+            for entity, _, _ in bodies:
+                entity.physics.apply(1 / 60)
+
+    return run
+
+
+@benchmark("physics.apply.100x_sparse")
+def bench_physics_sparse():
+    return _physics_case(100, sparse_world())
+
+
+@benchmark("physics.apply.100x_dense")
+def bench_physics_dense():
+    # Solid ground below y=256 px, so entities land on the top chunk row
+    solid = [Tile(x, y, "openbench.wood") for y in range(16) for x in range(16)]
+    chunks = sparse_world() + [Chunk((cx, 1), list(solid)) for cx in range(8)]
+    return _physics_case(100, chunks)
+
+
+@benchmark("tile_updates.sand_and_water")
+def bench_tile_updates():
+    from src.simulation import Simulation
+
+    rng = random.Random(5)
+    # Columns of sand and water dropped onto the floor of a sparse world
+    drops = [
+        (x, y, "openbench.sand" if x % 3 else "openbench.water")
+        for x in rng.sample(range(8 * 16), 48)
+        for y in range(4, 12)
+    ]
+
+    def run():
+        # A fresh world each run, so every run settles the same piles
+        simulation = Simulation(sparse_world(), None, None, seed=0)
+        for x, y, tile_type in drops:
+            simulation.set_tiles([(x, y)], tile_type)
+        for _ in range(60):
+            simulation.tile_updater.tick()
+
+    return run
+
+
+@benchmark("settings.load")
+def bench_load_settings():
+    from src.settings import loader
+
+    # Point the loader at a scratch file so the benchmark never writes settings.json
+    scratch = os.path.join(tempfile.mkdtemp(), "settings.json")
+    with open(loader.DEFAULT_SETTINGS_PATH) as f:
+        defaults = f.read()
+    with open(scratch, "w") as f:
+        f.write(defaults)
+
+    def run():
+        original = loader.SETTINGS_PATH
+        loader.SETTINGS_PATH = scratch
+        try:
+            for _ in range(20):
+                loader.load_settings()
+        finally:
+            loader.SETTINGS_PATH = original
+
+    return run
+
+
+def _headless_pygame():
+    # Dummy drivers so the renderer benchmarks need no window or audio device
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+
+    if not pygame.display.get_init():
+        pygame.display.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((768, 768))
+    return pygame
+
+
+def _pack_manager():
+    from src.asset.pack_manager import PackManager
+
+    return PackManager(ASSETS_DIR)
+
+
+@benchmark("pack_manager.surface_lookup")
+def bench_pack_lookup():
+    _headless_pygame()
+    pack_manager = _pack_manager()
+    ids = list(pack_manager.texture_sources) + ["openbench.unknown"]
+    for texture_id in ids:
+        pack_manager.load_texture_as_surface(texture_id)
+
+    def run():
+        for _ in range(1000):
+            for texture_id in ids:
+                pack_manager.load_texture_as_surface(texture_id)
+
+    return run
+
+
+@benchmark("pack_manager.resolve")
+def bench_pack_resolve():
+    _headless_pygame()
+    pack_manager = _pack_manager()
+    return pack_manager.resolve
+
+
+@benchmark("render.chunks")
+def bench_render_chunks():
+    pygame = _headless_pygame()
+    from src.camera import Camera
+    from src.renderer.world import WorldRenderer
+
+    surface = pygame.Surface((768, 768))
+    renderer = WorldRenderer(_pack_manager(), surface)
+    chunks = dense_world(4)
+    camera = Camera(position=(100.0, 100.0), zoom=1.0)
+
+    def run():
+        renderer.render_chunks(chunks, camera)
+
+    return run
+
+
+@benchmark("render.chunks.thumbnails")
+def bench_render_thumbnails():
+    pygame = _headless_pygame()
+    from src.camera import Camera
+    from src.renderer.thumbnails import ChunkThumbnails
+    from src.renderer.world import WorldRenderer
+
+    surface = pygame.Surface((768, 768))
+    pack_manager = _pack_manager()
+    renderer = WorldRenderer(
+        pack_manager, surface, thumbnails=ChunkThumbnails(pack_manager)
+    )
+    # Zoomed out far enough to see all 16x16 chunks at once
+    chunks = dense_world(16)
+    camera = Camera(position=(0.0, 0.0), zoom=0.18)
+
+    def run():
+        renderer.render_chunks(chunks, camera)
+
+    return run
+
+
+@benchmark("render.entities")
+def bench_render_entities():
+    pygame = _headless_pygame()
+    from src.camera import Camera
+    from src.renderer.entities import EntityRenderer
+
+    surface = pygame.Surface((768, 768))
+    renderer = EntityRenderer(_pack_manager(), surface)
+    rng = random.Random(5)
+    entities = [
+        NonPlayerEntity(
+            uuid=f"#bench-{i}",
+            texture_id="openbench.icon",
+            hitbox=Hitbox(1.0, 1.0),
+            position=(rng.uniform(0, 900), rng.uniform(0, 900)),
+        )
+        for i in range(200)
+    ]
+    camera = Camera(position=(0.0, 0.0), zoom=1.0)
+
+    def run():
+        renderer.render_entities(entities, camera)
+
+    return run
+
+
+def measure(run, repeat: int = 5, min_time: float = 0.1) -> dict:
+    """
+    Time `run` like timeit: pick a loop count so one repeat takes at least
+    min_time, then report per-call seconds over `repeat` repeats.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        # Jump straight to the estimated count, at least doubling each try
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)) + 1)
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        samples.append((time.perf_counter() - start) / loops)
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def run_benchmarks(
+    names: list[str] | None = None, repeat: int = 5, min_time: float = 0.1
+) -> dict:
+    results = {}
+    skipped = {}
+    for name, setup in BENCHMARKS.items():
+        if names and not any(pattern in name for pattern in names):
+            continue
+        try:
+            run = setup()
+        except ImportError as e:
+            # Renderer and pack benchmarks need pygame (and PIL)
+            skipped[name] = str(e)
+            logger.warning("Skipping %s: %s", name, e)
+            continue
+        results[name] = measure(run, repeat, min_time)
+        logger.info("%-32s %12.3f us", name, results[name]["median"] * 1e6)
+    return {
+        "format": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float = 0.10) -> list[dict]:
+    """
+    Benchmarks whose median got slower than the baseline's by more than
+    `threshold` (0.10 = 10%). Benchmarks missing from either side are ignored.
+    """
+    regressions = []
+    for name, result in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base["median"]:
+            continue
+        change = result["median"] / base["median"] - 1.0
+        logger.info("%-32s %+7.1f%% vs baseline", name, change * 100)
+        if change > threshold:
+            regressions.append(
+                {
+                    "name": name,
+                    "baseline": base["median"],
+                    "current": result["median"],
+                    "change": change,
+                }
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.benchmarks",
+        description="Run the hot-path microbenchmarks headless.",
+    )
+    parser.add_argument(
+        "names", nargs="*", help="only run benchmarks whose name contains one of these"
+    )
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare against a previous --json file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="slowdown that counts as a regression (default 0.10 = 10%%)",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-time", type=float, default=0.1, help="seconds per repeat (default 0.1)"
+    )
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in BENCHMARKS:
+            print(name)
+        return 0
+
+    report = run_benchmarks(args.names, args.repeat, args.min_time)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            for regression in regressions:
+                logger.error(
+                    "Regression: %s %.3fus -> %.3fus (%+.1f%%)",
+                    regression["name"],
+                    regression["baseline"] * 1e6,
+                    regression["current"] * 1e6,
+                    regression["change"] * 100,
+                )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
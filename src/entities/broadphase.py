@@ -0,0 +1,81 @@
+from typing import Iterable
+
+from src.entities.entity import Entity
+from src.world.grid import TILE_SIZE
+
+
+def entity_aabb(entity: Entity) -> tuple[float, float, float, float] | None:
+    """World AABB (min_x, min_y, max_x, max_y) in pixels, or None without a hitbox."""
+    hitbox = entity.hitbox
+    if hitbox is None:
+        return None
+    x, y = entity.position
+    return (x, y, x + hitbox.width * TILE_SIZE, y + hitbox.height * TILE_SIZE)
+
+
+class SweepAndPrune:
+    def __init__(self):
+        """
+        Incremental sweep-and-prune over entity AABBs on the x axis.
+
+        The sorted order is kept between updates and repaired with an insertion
+        sort, which is close to linear when entities move coherently.
+        """
+        self._order: list[Entity] = []
+        self.pairs: set[tuple[str, str]] = set()
+        self.began: set[tuple[str, str]] = set()
+        self.ended: set[tuple[str, str]] = set()
+
+    def update(self, entities: Iterable[Entity]) -> set[tuple[str, str]]:
+        """
+        Recompute overlapping pairs for `entities` and return them as (uuid, uuid)
+        tuples with the smaller uuid first. `began` and `ended` hold the pairs that
+        started or stopped overlapping since the previous update.
+        """
+        boxes: dict[str, tuple[float, float, float, float]] = {}
+        current: dict[str, Entity] = {}
+        for entity in entities:
+            box = entity_aabb(entity)
+            if box is not None:
+                boxes[entity.uuid] = box
+                current[entity.uuid] = entity
+
+        # Keep last tick's order for survivors, then append newcomers
+        order = [e for e in self._order if current.get(e.uuid) is e]
+        if len(order) != len(current):
+            seen = {e.uuid for e in order}
+            order.extend(e for uuid, e in current.items() if uuid not in seen)
+
+        keys = [boxes[e.uuid][0] for e in order]
+        for i in range(1, len(order)):
+            key = keys[i]
+            if keys[i - 1] <= key:
+                continue
+            entity = order[i]
+            j = i - 1
+            while j >= 0 and keys[j] > key:
+                keys[j + 1] = keys[j]
+                order[j + 1] = order[j]
+                j -= 1
+            keys[j + 1] = key
+            order[j + 1] = entity
+
+        pairs: set[tuple[str, str]] = set()
+        active: list[tuple[str, tuple[float, float, float, float]]] = []
+        for entity in order:
+            uuid = entity.uuid
+            box = boxes[uuid]
+            min_x, min_y, _, max_y = box
+            active = [item for item in active if item[1][2] > min_x]
+            for other_uuid, other in active:
+                if min_y < other[3] and max_y > other[1]:
+                    pairs.add(
+                        (uuid, other_uuid) if uuid < other_uuid else (other_uuid, uuid)
+                    )
+            active.append((uuid, box))
+
+        self._order = order
+        self.began = pairs - self.pairs
+        self.ended = self.pairs - pairs
+        self.pairs = pairs
+        return pairs
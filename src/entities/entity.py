@@ -63,5 +63,7 @@ class Entity:
         self.velocity = [0.0, 0.0]  # [vx, vy]
         self.on_ground = False
         self.physics: Physics | None = (
-            None  # To be set externally with Physics(self, world_tiles)
+            None  # To be set externally with Physics(self, grid)
         )
+        # Optional behaviour driving the physics each tick, e.g. PathFollower
+        self.controller = None
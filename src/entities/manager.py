@@ -0,0 +1,168 @@
+from typing import Callable, Iterable, Iterator
+
+from src.entities.entity import Entity
+from src.errors import EntityLimitError, InvalidEntityDataError
+from src.logging import get_logger
+
+logger = get_logger("openbench_common")
+
+
+def bounds_from_chunks(chunks, margin: int = 1):
+    """Return the world bounds in pixels covered by `chunks`, padded by `margin` chunks."""
+    if not chunks:
+        return None
+    xs = [chunk.position[0] for chunk in chunks]
+    ys = [chunk.position[1] for chunk in chunks]
+    chunk_px = 16 * 16
+    return (
+        (min(xs) - margin) * chunk_px,
+        (min(ys) - margin) * chunk_px,
+        (max(xs) + 1 + margin) * chunk_px,
+        (max(ys) + 1 + margin) * chunk_px,
+    )
+
+
+class EntityManager:
+    def __init__(self, max_entities: int = 1024, default_lifetime: int | None = None):
+        """
+        Owns spawned entities in a slot array with a free list so that slots are
+        reused and memory stays flat when entities are spawned and removed constantly.
+
+        max_entities: hard cap on live entities
+        default_lifetime: lifetime in ticks for entities spawned without one (None = forever)
+        """
+        self.max_entities = max_entities
+        self.default_lifetime = default_lifetime
+        self.tick = 0
+        self.world_bounds: tuple[float, float, float, float] | None = None
+
+        self._slots: list[Entity | None] = []
+        self._expires_at: list[int | None] = []
+        self._free: list[int] = []
+        self._slot_of: dict[str, int] = {}
+        self._rules: list[Callable[[Entity], bool]] = []
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, uuid: str) -> bool:
+        return uuid in self._slot_of
+
+    def __iter__(self) -> Iterator[Entity]:
+        for entity in self._slots:
+            if entity is not None:
+                yield entity
+
+    @property
+    def capacity(self) -> int:
+        return len(self._slots)
+
+    def get(self, uuid: str) -> Entity | None:
+        slot = self._slot_of.get(uuid)
+        return self._slots[slot] if slot is not None else None
+
+    def spawn(self, entity: Entity, lifetime: int | None = None) -> int:
+        if entity.uuid in self._slot_of:
+            logger.error(
+                "InvalidEntityDataError: Entity %s is already spawned.", entity.uuid
+            )
+            raise InvalidEntityDataError(f"Entity {entity.uuid} is already spawned.")
+
+        if len(self._slot_of) >= self.max_entities:
+            logger.error(
+                "EntityLimitError: Cannot spawn %s, limit of %d entities reached.",
+                entity.uuid,
+                self.max_entities,
+            )
+            raise EntityLimitError(
+                f"Entity limit of {self.max_entities} entities reached."
+            )
+
+        if lifetime is None:
+            lifetime = self.default_lifetime
+        expires_at = self.tick + lifetime if lifetime is not None else None
+
+        if self._free:
+            slot = self._free.pop()
+            self._slots[slot] = entity
+            self._expires_at[slot] = expires_at
+        else:
+            slot = len(self._slots)
+            self._slots.append(entity)
+            self._expires_at.append(expires_at)
+
+        self._slot_of[entity.uuid] = slot
+        return slot
+
+    def spawn_batch(
+        self, entities: Iterable[Entity], lifetime: int | None = None
+    ) -> list[Entity]:
+        """Spawn as many of `entities` as fit under the limit and return those spawned."""
+        spawned = []
+        for entity in entities:
+            if len(self._slot_of) >= self.max_entities:
+                logger.warning(
+                    "Entity limit of %d reached, dropping remaining spawns.",
+                    self.max_entities,
+                )
+                break
+            self.spawn(entity, lifetime)
+            spawned.append(entity)
+        return spawned
+
+    def scale_lifetimes(self, factor: float):
+        """Multiply the remaining lifetime of every live entity, e.g. on a tick rate change."""
+        for slot, expires_at in enumerate(self._expires_at):
+            if expires_at is not None:
+                remaining = expires_at - self.tick
+                self._expires_at[slot] = self.tick + max(1, round(remaining * factor))
+
+    def despawn(self, uuid: str) -> bool:
+        slot = self._slot_of.pop(uuid, None)
+        if slot is None:
+            return False
+        entity = self._slots[slot]
+        self._slots[slot] = None
+        self._expires_at[slot] = None
+        self._free.append(slot)
+        # Drop the physics back-reference so the entity can be collected
+        if entity is not None:
+            entity.physics = None
+        return True
+
+    def despawn_batch(self, uuids: Iterable[str]) -> int:
+        return sum(1 for uuid in uuids if self.despawn(uuid))
+
+    def clear(self):
+        self.despawn_batch(list(self._slot_of))
+
+    def add_despawn_rule(self, rule: Callable[[Entity], bool]):
+        """Register a predicate; entities for which it returns True are despawned on update."""
+        self._rules.append(rule)
+
+    def is_out_of_world(self, entity: Entity) -> bool:
+        if self.world_bounds is None:
+            return False
+        min_x, min_y, max_x, max_y = self.world_bounds
+        x, y = entity.position
+        return not (min_x <= x <= max_x and min_y <= y <= max_y)
+
+    def update(self) -> list[str]:
+        """Advance one tick, apply despawn rules and return the despawned uuids."""
+        self.tick += 1
+        expired = []
+        for slot, entity in enumerate(self._slots):
+            if entity is None:
+                continue
+            expires_at = self._expires_at[slot]
+            if expires_at is not None and self.tick >= expires_at:
+                expired.append(entity.uuid)
+            elif self.is_out_of_world(entity):
+                expired.append(entity.uuid)
+            elif any(rule(entity) for rule in self._rules):
+                expired.append(entity.uuid)
+
+        if expired:
+            self.despawn_batch(expired)
+            logger.debug("Despawned %d entities", len(expired))
+        return expired
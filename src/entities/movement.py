@@ -20,3 +20,79 @@ class PlayerMovement:
             self.player.position[1] + self.player.velocity[1],
         )
         self.player.on_ground = False  # Disable ground checks in fly mode
+
+
+class PathFollower:
+    def __init__(self, entity, planner, repath_interval: int = 120):
+        """
+        Steers an entity with physics along paths from a PathPlanner.
+
+        repath_interval: ticks after which the current path is requested again
+        """
+        self.entity = entity
+        self.planner = planner
+        self.repath_interval = repath_interval
+        self.goal: tuple[int, int] | None = None
+        self.path: list[tuple[int, int]] = []
+        self._ticks_since_request = 0
+        self._waiting = False
+
+    def current_cell(self) -> tuple[int, int]:
+        x, y = self.entity.position
+        hitbox = self.entity.hitbox
+        width = hitbox.width * 16 if hitbox else 16
+        height = hitbox.height * 16 if hitbox else 16
+        return int((x + width / 2) // 16), int((y + height - 1e-6) // 16)
+
+    def set_goal(self, goal: tuple[int, int] | None):
+        self.goal = goal
+        self.path = []
+        if goal is None:
+            self.planner.cancel(self.entity.uuid)
+            self._waiting = False
+        else:
+            self._request()
+
+    def _request(self):
+        start = self.current_cell()
+        start = self.planner.nav.find_ground(start) or start
+        self.planner.request(self.entity.uuid, start, self.goal)
+        self._ticks_since_request = 0
+        self._waiting = True
+
+    def update(self):
+        physics = self.entity.physics
+        if self.goal is None or physics is None:
+            return
+
+        if self._waiting:
+            ready, path = self.planner.take_result(self.entity.uuid)
+            if ready:
+                self._waiting = False
+                self.path = list(path) if path else []
+        self._ticks_since_request += 1
+        if not self._waiting and self._ticks_since_request >= self.repath_interval:
+            self._request()
+
+        cell = self.current_cell()
+        while self.path and self.path[0] == cell:
+            self.path.pop(0)
+        if not self.path:
+            physics.stop_horizontal()
+            return
+
+        # Steer towards the centre of the next cell rather than its column so an
+        # entity still standing on a ledge keeps walking off it
+        target_x, target_y = self.path[0]
+        hitbox = self.entity.hitbox
+        width = hitbox.width * 16 if hitbox else 16
+        offset = (target_x * 16 + 8) - (self.entity.position[0] + width / 2)
+        deadzone = 0.0 if target_y > cell[1] else 1.0
+        if offset > deadzone:
+            physics.move_right()
+        elif offset < -deadzone:
+            physics.move_left()
+        else:
+            physics.stop_horizontal()
+        if target_y < cell[1]:
+            physics.jump()
@@ -1,14 +1,19 @@
+import math
+
 from src.atrribute import Attribute
-from src.world.tile import Tile
+from src.world.grid import TileGrid, TILE_SIZE
 from src.logging import get_logger
 
 logger = get_logger()
 
+# Keeps edges that sit exactly on a tile boundary from counting as overlapping it
+EPSILON = 1e-6
+
 
 class Physics:
-    def __init__(self, entity, world_tiles: list[Tile]):
+    def __init__(self, entity, grid: TileGrid):
         self.entity = entity
-        self.world_tiles = world_tiles
+        self.grid = grid
 
     def get_attr(self, key, default):
         return (
@@ -17,6 +22,55 @@ class Physics:
             else default
         )
 
+    def _span(self, start: float, size: float) -> range:
+        # Tile rows/columns covered by an extent in pixels
+        first = math.floor(start / TILE_SIZE)
+        last = math.floor((start + size - EPSILON) / TILE_SIZE)
+        return range(first, last + 1)
+
+    def sweep_x(self, x: float, y: float, width: float, height: float, dx: float):
+        """
+        Walk the tile columns crossed by the leading edge when moving dx pixels and
+        stop at the first solid one. Returns (new_x, collided).
+        """
+        if dx == 0:
+            return x, False
+        rows = self._span(y, height)
+        is_solid = self.grid.is_solid
+        if dx > 0:
+            start = math.floor((x + width - EPSILON) / TILE_SIZE) + 1
+            end = math.floor((x + width + dx - EPSILON) / TILE_SIZE)
+            for col in range(start, end + 1):
+                if any(is_solid(col, row) for row in rows):
+                    return col * TILE_SIZE - width, True
+        else:
+            start = math.floor(x / TILE_SIZE) - 1
+            end = math.floor((x + dx) / TILE_SIZE)
+            for col in range(start, end - 1, -1):
+                if any(is_solid(col, row) for row in rows):
+                    return (col + 1) * TILE_SIZE, True
+        return x + dx, False
+
+    def sweep_y(self, x: float, y: float, width: float, height: float, dy: float):
+        """Same as sweep_x for the vertical axis. Returns (new_y, collided)."""
+        if dy == 0:
+            return y, False
+        cols = self._span(x, width)
+        is_solid = self.grid.is_solid
+        if dy > 0:
+            start = math.floor((y + height - EPSILON) / TILE_SIZE) + 1
+            end = math.floor((y + height + dy - EPSILON) / TILE_SIZE)
+            for row in range(start, end + 1):
+                if any(is_solid(col, row) for col in cols):
+                    return row * TILE_SIZE - height, True
+        else:
+            start = math.floor(y / TILE_SIZE) - 1
+            end = math.floor((y + dy) / TILE_SIZE)
+            for row in range(start, end - 1, -1):
+                if any(is_solid(col, row) for col in cols):
+                    return (row + 1) * TILE_SIZE, True
+        return y + dy, False
+
     def apply(self, dt: float = 1.0):
         # Gravity
         gravity = self.get_attr("gravity", 0.5)
@@ -31,80 +85,33 @@ class Physics:
             )
             return
 
-        # Predict new position
-        orig_x, orig_y = self.entity.position
+        # Continuous collision: sweep each axis through the tile grid so fast
+        # entities cannot tunnel through thin floors, whatever the timestep.
+        x, y = self.entity.position
         vx, vy = self.entity.velocity
-        new_x = orig_x + vx * dt
-        new_y = orig_y + vy * dt
-
-        # Helper: get AABB for entity at (x, y)
-        def get_aabb(x, y):
-            return (
-                x,
-                y,
-                x + hitbox.width,
-                y + hitbox.height,
-            )
+        width = hitbox.width * TILE_SIZE
+        height = hitbox.height * TILE_SIZE
 
-        # Helper: get AABB for tile
-        def get_tile_aabb(tile: Tile):
-            tx, ty = tile.x, tile.y
-            return (tx, ty, tx + 1, ty + 1)
-
-        # Check collisions for each axis separately (swept AABB)
-        collided_x = False
-        collided_y = False
-
-        # Move X
-        entity_aabb_x = get_aabb(new_x, new_y)
-        for tile in self.world_tiles:
-            tx, ty = getattr(tile, "x", None), getattr(tile, "y", None)
-            if tx is None or ty is None:
-                continue
-            tile_aabb = get_tile_aabb(tile)
-            if (
-                entity_aabb_x[0] < tile_aabb[2]
-                and entity_aabb_x[2] > tile_aabb[0]
-                and entity_aabb_x[1] < tile_aabb[3]
-                and entity_aabb_x[3] > tile_aabb[1]
-            ):
-                collided_x = True
-                if vx > 0:
-                    temp_x = tile_aabb[0] - hitbox.width
-                elif vx < 0:
-                    temp_x = tile_aabb[2]
-                vx = 0
-                break
-
-        # Move Y
-        entity_aabb_y = get_aabb(new_x, new_y)
-        for tile in self.world_tiles:
-            tx, ty = tile.x, tile.y
-            if tx is None or ty is None:
-                continue
-            tile_aabb = get_tile_aabb(tile)
-            if (
-                entity_aabb_y[0] < tile_aabb[2]
-                and entity_aabb_y[2] > tile_aabb[0]
-                and entity_aabb_y[1] < tile_aabb[3]
-                and entity_aabb_y[3] > tile_aabb[1]
-            ):
-                collided_y = True
-                if vy > 0:
-                    temp_y = tile_aabb[1] - hitbox.height
-                elif vy < 0:
-                    temp_y = tile_aabb[3]
-                vy = 0
-                break
-
-        self.entity.position = (new_x, new_y)
-        self.entity.velocity = [vx, vy]
+        x, collided_x = self.sweep_x(x, y, width, height, vx * dt)
+        if collided_x:
+            vx = 0
 
+        y, collided_y = self.sweep_y(x, y, width, height, vy * dt)
         # On ground if collided downward with a solid tile
-        self.entity.on_ground = collided_y and vy == 0 and orig_y < new_y
+        on_ground = collided_y and vy > 0
+        if collided_y:
+            vy = 0
+
+        self.entity.position = (x, y)
+        self.entity.velocity = [vx, vy]
+        self.entity.on_ground = on_ground
 
         logger.debug(
-            f"Entity {self.entity.uuid} position: {self.entity.position}, velocity: {self.entity.velocity}, on_ground: {self.entity.on_ground}"
+            "Entity %s position: %s, velocity: %s, on_ground: %s",
+            self.entity.uuid,
+            self.entity.position,
+            self.entity.velocity,
+            self.entity.on_ground,
         )
 
     def move_left(self):
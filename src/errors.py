@@ -56,3 +56,21 @@ class MissingTextureError(GameError):
     """Exception raised when a required texture is missing."""
 
     pass
+
+
+class EntityLimitError(GameError):
+    """Exception raised when the entity limit is reached."""
+
+    pass
+
+
+class InvalidSettingsError(GameError):
+    """Exception raised for invalid settings values."""
+
+    pass
+
+
+class ProtocolError(GameError):
+    """Exception raised for malformed network messages."""
+
+    pass
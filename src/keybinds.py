@@ -1,6 +1,3 @@
-import pygame
-
-
 class KeybindManager:
     def __init__(self, keybinds: dict[str, list[int]]):
         """
@@ -12,6 +9,8 @@ class KeybindManager:
 
     def update(self):
         """Update active keys from pygame.key.get_pressed()"""
+        import pygame
+
         pressed = pygame.key.get_pressed()
         self.active.clear()
         for action, keys in self.keybinds.items():
@@ -24,6 +23,11 @@ class KeybindManager:
     def get_active_actions(self) -> set:
         return set(self.active)
 
+    def set_active(self, actions):
+        """Replace the active actions directly (used when replaying recorded input)"""
+        self.active.clear()
+        self.active.update(actions)
+
     @staticmethod
     def from_settings(settings: dict) -> "KeybindManager":
         """Create KeybindManager from settings dict (expects key names as strings)"""
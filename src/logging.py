@@ -1,35 +1,74 @@
+import atexit
 import logging
 import os
+import queue
 from datetime import datetime
 
 import logging.handlers
 
 LOG_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "logs")
-os.makedirs(LOG_DIR, exist_ok=True)
 
 LOG_FILE = os.path.join(LOG_DIR, f'client_{datetime.now().strftime("%Y%m%d")}.log')
 
+# All loggers enqueue records; one background listener writes them to the file
+# and the console so the game thread never blocks on log I/O.
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener: logging.handlers.QueueListener | None = None
+# Per-logger levels from settings, applied to loggers created later too
+_levels: dict[str, int] = {}
+
+
+def _start_listener():
+    global _listener
+    if _listener is not None:
+        return
+    formatter = logging.Formatter(
+        "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    # Created on first use rather than as a side effect of importing
+    os.makedirs(LOG_DIR, exist_ok=True)
+    file_handler = logging.handlers.RotatingFileHandler(
+        LOG_FILE, maxBytes=5 * 1024 * 1024, backupCount=5
+    )
+    file_handler.setFormatter(formatter)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    _listener = logging.handlers.QueueListener(_queue, file_handler, stream_handler)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush queued records and stop the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def get_logger(name: str = "openbench", level: int = logging.INFO) -> logging.Logger:
     logger = logging.getLogger(name)
-    logger.setLevel(level)
+    logger.setLevel(_levels.get(name, level))
     if not logger.handlers:
-        formatter = logging.Formatter(
-            "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-
-        file_handler = logging.handlers.RotatingFileHandler(
-            LOG_FILE, maxBytes=5 * 1024 * 1024, backupCount=5
-        )
-        file_handler.setFormatter(formatter)
-        file_handler.setLevel(level)
-
-        stream_handler = logging.StreamHandler()
-        stream_handler.setFormatter(formatter)
-        stream_handler.setLevel(level)
-
-        logger.addHandler(file_handler)
-        logger.addHandler(stream_handler)
+        _start_listener()
+        logger.addHandler(logging.handlers.QueueHandler(_queue))
         logger.propagate = False
     return logger
+
+
+def set_log_levels(levels: dict[str, str | int]):
+    """
+    levels: logger name -> level name or number, e.g. {"openbench": "DEBUG"}
+    """
+    for name, level in levels.items():
+        if isinstance(level, str):
+            level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            get_logger().warning("Ignoring invalid log level for %s: %s", name, level)
+            continue
+        _levels[name] = level
+        logging.getLogger(name).setLevel(level)
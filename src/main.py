@@ -1,29 +1,66 @@
-from .entities.physics import Physics
-from .entities.player import Player
-from .entities.movement import PlayerMovement
-from .entities.npe import NonPlayerEntity
-from .entities.hitbox import Hitbox
-from .atrribute import Attribute
-from .world.tile import Tile
-from .world.chunk import Chunk
-from .world.set_tile import set_tile
-from .camera import Camera
-from .logging import get_logger
-from .asset.pack_manager import PackManager
-from .renderer.world import WorldRenderer
-from .renderer.entities import EntityRenderer
-from .settings.loader import load_settings
-from .keybinds import KeybindManager
-
-import pygame
-import easygui
+import argparse
 import sys
-from uuid import uuid4
+
+from .startup import ImportProfiler, StartupTimeline
+
+timeline = StartupTimeline()
+
+parser = argparse.ArgumentParser(prog="python -m src.main")
+parser.add_argument("--record", help="record input to this file for replay")
+parser.add_argument("--seed", type=int, help="seed for the simulation RNG")
+parser.add_argument(
+    "--metrics", help="write periodic metrics to this .jsonl or .csv file"
+)
+parser.add_argument(
+    "--profile-frames",
+    type=int,
+    help="run cProfile over the first N frames and write a .pstats file",
+)
+parser.add_argument(
+    "--startup-profile",
+    nargs="?",
+    const="startup_profile.txt",
+    help="write -X importtime style import timings to this file",
+)
+args = parser.parse_args()
+
+import_profiler = None
+if args.startup_profile:
+    import_profiler = ImportProfiler()
+    import_profiler.install()
+
+with timeline.phase("imports"):
+    from .entities.player import Player
+    from .simulation import Simulation, create_default_chunks
+    from .world.grid import line_tiles
+    from .world.storage import WorldSaver, load_world
+    from .camera import Camera
+    from .logging import get_logger, set_log_levels
+    from .asset.pack_manager import PackManager
+    from .asset.preload import preload_assets
+    from .asset.sound import SoundManager
+    from .renderer.world import WorldRenderer
+    from .renderer.entities import EntityRenderer
+    from .renderer.profiler import ProfilerOverlay
+    from .renderer.scaling import RenderScaler
+    from .renderer.thumbnails import ChunkThumbnails
+    from .renderer.minimap import Minimap
+    from .profiler import CProfileCapture, FrameProfiler, HitchWatchdog
+    from .metrics import MetricsSink, hit_rate, rss_bytes
+    from .settings.loader import load_default_settings, load_settings
+    from .settings.model import LIVE_KEYS, Settings
+    from .settings.watcher import SettingsWatcher
+    from .keybinds import KeybindManager
+
+    import pygame
 
 
 def show_game_panic_window(exc_type, exc_value, exc_traceback):
     error_message = f"An unrecoverable error occurred and the game crashed!\n\n{exc_type.__name__}: {exc_value}"
     try:
+        # easygui pulls in tkinter, so only import it when actually crashing
+        import easygui
+
         easygui.buttonbox(error_message, "Game Panic!", choices=["OK"])
     except Exception as e:
         print(error_message)
@@ -37,28 +74,31 @@ sys.excepthook = show_game_panic_window
 logger = get_logger()
 
 # Load settings
-settings = load_settings()
-logger.info(f"Settings loaded: {settings}")
+with timeline.phase("settings"):
+    # Invalid values in settings.json fall back to the defaults
+    settings = Settings(load_settings(), fallback=load_default_settings())
+    set_log_levels(settings.effective_log_levels())
+logger.info("Settings loaded: %s", settings)
 
-# Default texture pack path
-pack_manager = PackManager("assets/default")
+# Setup pygame
+with timeline.phase("pygame init"):
+    pygame.init()
+    pygame.display.set_caption("Openbench")
 
-# Create a simple world
-chunks = []
-for cx in range(3):
-    tiles = [Tile(x, 15, "openbench.wood") for x in range(16)]
-    chunk = Chunk((cx, 0), tiles)
-    chunks.append(chunk)
+with timeline.phase("packs"):
+    # Default texture pack with any resource packs layered on top (lowest first)
+    pack_manager = PackManager("assets/default", *settings.resource_packs)
 
-# Create player
-player = Player(uuid="player1", username="Player", position=(0, 10))
+    # Decode all textures and sounds up front so new blocks never hitch on first sight
+    preload_assets(pack_manager)
 
-# Camera will follow player
-camera = Camera(position=(0, 0), zoom=1.0)  # Start with default zoom
+    # Optional live reloading of changed asset files while the game runs
+    asset_watcher = None
+    if settings.hot_reload_assets:
+        from .asset.watcher import AssetWatcher
 
-# Setup pygame
-pygame.init()
-pygame.display.set_caption("Openbench")
+        asset_watcher = AssetWatcher(pack_manager)
+        asset_watcher.start()
 
 # Try to set custom cursor
 cursor_surface = pack_manager.load_texture_as_surface("openbench.cursor")
@@ -83,117 +123,220 @@ def set_custom_cursor(zoom):
         logger.info("Custom cursor 'openbench.cursor' not found, using default cursor.")
 
 
-set_custom_cursor(camera.zoom)
+set_custom_cursor(1.0)  # Start with default zoom
 
 icon = pack_manager.load_texture_as_surface("openbench.icon")
 if icon:
     logger.info("Attempting to set icon... (may not work on some platforms)")
     pygame.display.set_icon(icon)
 
-resolution = settings.get("resolution", (768, 768))
-
-# Fullscreen setting
-fullscreen = settings.get("fullscreen", False)
-if fullscreen:
-    screen = pygame.display.set_mode(resolution, pygame.FULLSCREEN)
-else:
-    screen = pygame.display.set_mode(resolution)
-
-
-# Renderer
-renderer = WorldRenderer(pack_manager, screen)
-entity_renderer = EntityRenderer(pack_manager, screen)
-
-# List to hold spawned entities
-spawned_entities = []
+with timeline.phase("pygame init"):
+    resolution = settings.resolution
 
-# FPS counter setup
-clock = pygame.time.Clock()
-font = pygame.font.SysFont(None, 24)
-
-keybind_manager = KeybindManager.from_settings(settings)
-player_movement = PlayerMovement(player, keybind_manager)
-
-# Preload click sound
-click_sound = pack_manager.load_sound("openbench.click")
+    # Fullscreen setting
+    if settings.fullscreen:
+        screen = pygame.display.set_mode(resolution, pygame.FULLSCREEN)
+    else:
+        screen = pygame.display.set_mode(resolution)
+
+    # FPS counter setup
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont(None, 24)
+
+    # Per-phase frame timings; F3 toggles the overlay
+    profiler = FrameProfiler()
+    profiler_overlay = ProfilerOverlay(profiler, screen, pygame.font.SysFont(None, 18))
+
+    # F4 runs cProfile over the next profile_frames frames
+    cprofile_capture = CProfileCapture(settings.profile_dir)
+
+    # Frames slower than hitch_threshold_ms get their main-thread stacks sampled
+    hitch_watchdog = None
+    if settings.hitch_threshold_ms:
+        hitch_watchdog = HitchWatchdog(
+            profiler,
+            settings.hitch_threshold_ms / 1000,
+            output_dir=settings.profile_dir,
+        )
+        hitch_watchdog.start()
+
+    # Sounds play on a bounded channel pool with reserved music and UI channels
+    sound_manager = SoundManager(pack_manager)
+
+with timeline.phase("world build"):
+    # Load the saved world, or create a simple one. Recordings always start from
+    # the default world so they replay the same
+    chunks = [] if args.record else load_world(settings.world_dir)
+    world_loaded = bool(chunks)
+    if not world_loaded:
+        chunks = create_default_chunks()
+
+    # Create player
+    player = Player(uuid="player1", username="Player", position=(0, 10))
+
+    # Camera will follow player
+    camera = Camera(position=(0, 0), zoom=1.0)  # Start with default zoom
+
+    # Renderer
+    # One average-colour pixel per tile, for far zoom-out and the minimap (M)
+    thumbnails = ChunkThumbnails(pack_manager)
+    renderer = WorldRenderer(
+        pack_manager,
+        screen,
+        cache_budget=settings.scaled_cache_budget,
+        thumbnails=thumbnails,
+        thumbnail_zoom=settings.thumbnail_zoom,
+    )
+    minimap = Minimap(thumbnails, screen)
+    entity_renderer = EntityRenderer(pack_manager, screen)
+    # The world may be drawn below native resolution and upscaled; UI is not
+    render_scaler = RenderScaler(
+        screen,
+        settings.render_scale,
+        adaptive=settings.adaptive_render_scale,
+        min_scale=settings.min_render_scale,
+        target_frame_time=1 / (settings.fps_cap or 60),
+    )
 
-# Preload music sound and play it looping
-music_sound = pack_manager.load_sound("openbench.music")
-if music_sound:
-    music_sound.set_volume(0.10)  # Set volume to 10%
-    music_sound.play(loops=-1)
+    keybind_manager = KeybindManager.from_settings(settings.to_dict())
+    simulation = Simulation(
+        chunks,
+        player,
+        keybind_manager,
+        seed=args.seed,
+        max_entities=settings.max_entities,
+        tick_rate=settings.tick_rate,
+        tile_update_budget=settings.tile_update_budget,
+    )
+    simulation.path_planner.cache_size = settings.path_cache_size
+    entity_manager = simulation.entity_manager
+
+    if args.record:
+        from .replay import InputRecorder
+
+        simulation.recorder = InputRecorder(
+            args.record,
+            simulation.seed,
+            list(keybind_manager.keybinds),
+            tick_rate=simulation.tick_rate,
+            tile_update_budget=simulation.tile_updater.budget,
+            max_entities=entity_manager.max_entities,
+        )
+
+    # Changed chunks are written on a worker thread every autosave_interval.
+    # Recordings play in the default world, which must not overwrite the save
+    world_saver = None
+    if not args.record:
+        world_saver = WorldSaver(
+            simulation.grid, settings.world_dir, settings.autosave_interval
+        )
+        if world_loaded:
+            world_saver.mark_saved()
+
+    # Performance settings edited in settings.json apply without a restart
+    settings_watcher = SettingsWatcher(settings)
+    settings_watcher.start()
+
+# Optional metrics export for offline analysis of long sessions
+metrics_sink = None
+metrics_file = args.metrics or settings.metrics_file
+if metrics_file:
+    metrics_sink = MetricsSink(metrics_file, settings.metrics_interval)
+
+# Play music looping on its reserved channel
+sound_manager.play_music("openbench.music", volume=0.10)  # Set volume to 10%
 
 # --- Fixed timestep main loop ---
 
-TICK_RATE = 60  # ticks per second
-TICK_INTERVAL = 1.0 / TICK_RATE
-
-
 mouse_left_held = False
 mouse_right_held = False
 last_tile_pos = None
+# Number keys 1-3 pick the tile left click places
+PAINT_TILES = {
+    pygame.K_1: "openbench.wood",
+    pygame.K_2: "openbench.sand",
+    pygame.K_3: "openbench.water",
+}
+paint_tile = "openbench.wood"
+
+
+def screen_to_world(camera, pos):
+    return (
+        camera.position[0] + pos[0] / camera.zoom,
+        camera.position[1] + pos[1] / camera.zoom,
+    )
+
+
+def paint_stroke(drag_targets: list[tuple[int, int]]):
+    """
+    Paint the line from the last painted tile through every tile the mouse moved
+    over this frame as one batched edit, so fast drags leave no gaps.
+    """
+    global last_tile_pos
+    if not drag_targets or not (mouse_left_held or mouse_right_held):
+        drag_targets.clear()
+        return
+    stroke = []
+    previous = last_tile_pos
+    for target in drag_targets:
+        if previous is None:
+            stroke.append(target)
+        else:
+            stroke.extend(line_tiles(*previous, *target))
+        previous = target
+    last_tile_pos = previous
+    drag_targets.clear()
+
+    tile_type = paint_tile if mouse_left_held else None
+    if simulation.set_tiles(stroke, tile_type):
+        sound_manager.play("openbench.click", "ui")
 
 
 def handle_events(running, camera):
-    global mouse_left_held, mouse_right_held, last_tile_pos
+    global mouse_left_held, mouse_right_held, last_tile_pos, paint_tile
+    sound_manager.begin_frame()
+    # Tiles under the mouse for each motion event this frame, painted in one batch
+    drag_targets = []
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             logger.info("Quit event received, exiting...")
             running[0] = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_m:
+            minimap.toggle()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            profiler_overlay.toggle()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+            cprofile_capture.start(settings.profile_frames)
+        elif event.type == pygame.KEYDOWN and event.key in PAINT_TILES:
+            paint_tile = PAINT_TILES[event.key]
         elif event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            world_x = camera.position[0] + mouse_x / camera.zoom
-            world_y = camera.position[1] + mouse_y / camera.zoom
-            tile_x = int(world_x // 16)
-            tile_y = int(world_y // 16)
-            last_tile_pos = (tile_x, tile_y)
+            paint_stroke(drag_targets)
+            world_x, world_y = screen_to_world(camera, event.pos)
+            last_tile_pos = (int(world_x // 16), int(world_y // 16))
             if event.button == 1:
                 mouse_left_held = True
-                if click_sound:
-                    click_sound.play()
-                set_tile(chunks, world_x, world_y, "openbench.wood")
+                sound_manager.play("openbench.click", "ui")
+                simulation.set_tile(world_x, world_y, paint_tile)
             elif event.button == 3:
                 mouse_right_held = True
-                if click_sound:
-                    click_sound.play()
-                set_tile(chunks, world_x, world_y, None)
+                sound_manager.play("openbench.click", "ui")
+                simulation.set_tile(world_x, world_y, None)
             elif event.button == 2:
                 # Middle click: spawn entity
-                entity_uuid = f"#{str(uuid4())}"
-                hitbox = Hitbox(1.0, 1.0)
-                attributes = {
-                    "gravity": Attribute("gravity", 250.0),
-                    "move_speed": Attribute("move_speed", 1.0),
-                }
-                entity = NonPlayerEntity(
-                    uuid=entity_uuid,
-                    texture_id="openbench.icon",
-                    hitbox=hitbox,
-                    position=(world_x, world_y),
-                    attributes=attributes,
-                )
-                entity.physics = Physics(
-                    entity, [tile for chunk in chunks for tile in chunk.tiles]
-                )
-                spawned_entities.append(entity)
+                simulation.spawn_npe(world_x, world_y)
         elif event.type == pygame.MOUSEBUTTONUP:
+            # Finish the stroke with the button state it was drawn with
+            paint_stroke(drag_targets)
             if event.button == 1:
                 mouse_left_held = False
             elif event.button == 3:
                 mouse_right_held = False
         elif event.type == pygame.MOUSEMOTION:
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            world_x = camera.position[0] + mouse_x / camera.zoom
-            world_y = camera.position[1] + mouse_y / camera.zoom
-            tile_x = int(world_x // 16)
-            tile_y = int(world_y // 16)
-            if last_tile_pos != (tile_x, tile_y):
-                if mouse_left_held:
-                    set_tile(chunks, world_x, world_y, "openbench.wood")
-                    last_tile_pos = (tile_x, tile_y)
-                elif mouse_right_held:
-                    set_tile(chunks, world_x, world_y, None)
-                    last_tile_pos = (tile_x, tile_y)
+            if mouse_left_held or mouse_right_held:
+                world_x, world_y = screen_to_world(camera, event.pos)
+                tile = (int(world_x // 16), int(world_y // 16))
+                if not drag_targets or drag_targets[-1] != tile:
+                    drag_targets.append(tile)
         elif event.type == pygame.MOUSEWHEEL:
             mouse_x, mouse_y = pygame.mouse.get_pos()
             world_x_before = camera.position[0] + mouse_x / camera.zoom
@@ -205,7 +348,7 @@ def handle_events(running, camera):
                 new_zoom = camera.zoom / zoom_factor
             else:
                 new_zoom = camera.zoom
-            new_zoom = max(0.5, min(new_zoom, 5.0))
+            new_zoom = max(settings.min_zoom, min(new_zoom, settings.max_zoom))
             world_x_after = camera.position[0] + mouse_x / new_zoom
             world_y_after = camera.position[1] + mouse_y / new_zoom
             camera.position = (
@@ -214,21 +357,12 @@ def handle_events(running, camera):
             )
             camera.zoom = new_zoom
             set_custom_cursor(camera.zoom)
+    paint_stroke(drag_targets)
 
 
 def update_game_logic(accumulated_time):
     keybind_manager.update()
-    while accumulated_time[0] >= TICK_INTERVAL:
-        player_movement.update()
-        # Update spawned entities
-        for entity in spawned_entities:
-            dt = TICK_INTERVAL
-            # Apply physics (gravity, collisions)
-            entity.physics.world_tiles = [
-                tile for chunk in chunks for tile in chunk.tiles
-            ]
-            entity.physics.apply(dt)
-        accumulated_time[0] -= TICK_INTERVAL
+    profiler.record_ticks(simulation.advance(accumulated_time))
 
 
 def center_camera_on_player():
@@ -253,39 +387,187 @@ def fix_rendering_bug():
     )
 
 
+def chunks_in_render_distance(view_camera: Camera):
+    if renderer.thumbnails is not None and view_camera.zoom < renderer.thumbnail_zoom:
+        # Far zoomed out the view spans more chunks than render_distance, and each
+        # is one thumbnail blit; render_chunks skips those outside the view
+        return chunks
+    # Chunks within render_distance chunks of the player's chunk on both axes
+    centre_x = int(player.position[0] // 256)
+    centre_y = int(player.position[1] // 256)
+    distance = settings.render_distance
+    return [
+        chunk
+        for chunk in chunks
+        if abs(chunk.position[0] - centre_x) <= distance
+        and abs(chunk.position[1] - centre_y) <= distance
+    ]
+
+
 def render_frame():
     fix_rendering_bug()
 
-    renderer.render_chunks(chunks, camera)
-    entity_renderer.render_entities(spawned_entities, camera)
+    world_surface, world_camera = render_scaler.begin(camera)
+    renderer.surface = entity_renderer.surface = world_surface
+    renderer.render_chunks(chunks_in_render_distance(world_camera), world_camera)
+    profiler.mark("render_chunks")
+    entity_renderer.render_entities(entity_manager, world_camera)
+    profiler.mark("render_entities")
+    render_scaler.present()
+    renderer.surface = entity_renderer.surface = screen
+    profiler.mark("render_scale")
+    renderer.render_selector(camera)
+    profiler.mark("render_selector")
+    minimap.render(simulation.grid, player.position, camera)
+    profiler.mark("render_minimap")
+    profiler_overlay.render()
+    profiler.mark("render_overlay")
 
     pygame.display.flip()
+    profiler.mark("display_flip")
 
 
-def update_title(fps_stats: list[dict], player: Player):
-    clock.tick()
-    fps = clock.get_fps()
+# The caption is only refreshed a few times a second; set_caption is not free
+TITLE_INTERVAL_MS = 500
+last_title_update = [-TITLE_INTERVAL_MS]
+
+
+def update_title(player: Player):
+    # Sleeps to hold the frame rate at fps_cap (0 = uncapped)
+    clock.tick(settings.fps_cap)
+    profiler.mark("frame_wait")
     now = pygame.time.get_ticks()
-    fps_stats[0][now] = fps
-    fps_stats[0] = {t: f for t, f in fps_stats[0].items() if now - t <= 1000}
-    if not isinstance(fps_stats[0], dict):
-        fps_stats[0] = {}
-    fps_stats[0][now] = fps
-    recent_fps = [f for t, f in fps_stats[0].items() if now - t <= 1000]
-    avg_fps = sum(recent_fps) / len(recent_fps) if recent_fps else 0
-    min_fps = min(recent_fps) if recent_fps else 0
-    max_fps = max(recent_fps) if recent_fps else 0
+    if now - last_title_update[0] < TITLE_INTERVAL_MS:
+        return
+    last_title_update[0] = now
 
+    stats = profiler.stats()
+    frame = stats["frame"]
     pygame.display.set_caption(
-        f"Openbench - X {player.position[0] / 16} Y {player.position[1] / 16} - FPS {int(fps)} Avg {avg_fps:.1f} Min {min_fps:.1f} Max {max_fps:.1f}"
+        f"Openbench - X {player.position[0] / 16} Y {player.position[1] / 16}"
+        f" - FPS {clock.get_fps():.0f} Avg {stats['fps']:.1f}"
+        f" p95 {frame['p95'] * 1000:.1f}ms Max {frame['max'] * 1000:.1f}ms"
+    )
+
+
+def apply_settings(new_settings: Settings, changed: set[str]):
+    global settings, hitch_watchdog
+    old_settings, settings = settings, new_settings
+    if "log_level" in changed or "log_levels" in changed:
+        levels = settings.effective_log_levels()
+        # Loggers dropped from log_levels go back to log_level
+        for name in old_settings.log_levels:
+            levels.setdefault(name, settings.log_level)
+        set_log_levels(levels)
+    if "tick_rate" in changed:
+        if simulation.recorder:
+            logger.warning("Not changing the tick rate while recording input")
+        else:
+            simulation.set_tick_rate(settings.tick_rate)
+    if "tile_update_budget" in changed:
+        if simulation.recorder:
+            logger.warning("Not changing the tile update budget while recording input")
+        else:
+            simulation.tile_updater.budget = settings.tile_update_budget
+    if changed & {"render_scale", "adaptive_render_scale", "min_render_scale"}:
+        render_scaler.configure(
+            settings.render_scale,
+            settings.adaptive_render_scale,
+            settings.min_render_scale,
+        )
+    if "fps_cap" in changed:
+        render_scaler.target_frame_time = 1 / (settings.fps_cap or 60)
+    if "thumbnail_zoom" in changed:
+        renderer.thumbnail_zoom = settings.thumbnail_zoom
+    if "scaled_cache_budget" in changed:
+        renderer.set_cache_budget(settings.scaled_cache_budget)
+    if "autosave_interval" in changed and world_saver:
+        world_saver.interval = settings.autosave_interval
+    if "path_cache_size" in changed:
+        simulation.path_planner.cache_size = settings.path_cache_size
+    if "max_entities" in changed:
+        if simulation.recorder:
+            logger.warning("Not changing the entity limit while recording input")
+        else:
+            # Lowering it only stops new spawns; live entities are kept
+            entity_manager.max_entities = settings.max_entities
+    if "min_zoom" in changed or "max_zoom" in changed:
+        camera.zoom = max(settings.min_zoom, min(camera.zoom, settings.max_zoom))
+        set_custom_cursor(camera.zoom)
+    if "hitch_threshold_ms" in changed:
+        if not settings.hitch_threshold_ms:
+            if hitch_watchdog:
+                hitch_watchdog.stop()
+            hitch_watchdog = None
+        elif hitch_watchdog:
+            hitch_watchdog.threshold = settings.hitch_threshold_ms / 1000
+        else:
+            hitch_watchdog = HitchWatchdog(
+                profiler,
+                settings.hitch_threshold_ms / 1000,
+                output_dir=settings.profile_dir,
+            )
+            hitch_watchdog.start()
+    # fps_cap, render_distance and profile_frames are read every time they are used
+
+    live = sorted(changed & LIVE_KEYS)
+    restart = sorted(changed - LIVE_KEYS)
+    if live:
+        logger.info("Applied settings: %s", ", ".join(live))
+    if restart:
+        logger.info("Restart to apply settings: %s", ", ".join(restart))
+
+
+last_metrics = [0, 0.0]  # frame count and time at the previous record
+
+
+def write_metrics():
+    now = pygame.time.get_ticks() / 1000.0
+    frames = profiler.frame_count - last_metrics[0]
+    elapsed = now - last_metrics[1]
+    last_metrics[0] = profiler.frame_count
+    last_metrics[1] = now
+
+    planner = simulation.path_planner
+    pack_caches = pack_manager.cache_sizes
+    autosave = (world_saver and world_saver.last_report) or {}
+    metrics_sink.write(
+        {
+            "time": round(now, 3),
+            "fps": round(frames / elapsed, 2) if elapsed > 0 else 0.0,
+            "frame_ms": round(profiler.frames.last() * 1000, 3),
+            "tick": simulation.tick_count,
+            "ticks_last_frame": int(profiler.ticks.last()),
+            "entities": len(entity_manager) + len(simulation.players),
+            "visible_chunks": renderer.visible_chunks,
+            "render_scale": render_scaler.current_scale,
+            "blits": renderer.blits + entity_renderer.blits,
+            "scaled_cache_size": renderer.cache_size,
+            "scaled_cache_hit_rate": round(
+                hit_rate(renderer.cache_hits, renderer.cache_misses), 4
+            ),
+            "texture_cache_size": pack_caches["textures"],
+            "surface_cache_size": pack_caches["surfaces"],
+            "surface_cache_misses": pack_manager.surface_misses,
+            "path_cache_hit_rate": round(
+                hit_rate(planner.cache_hits, planner.cache_misses), 4
+            ),
+            "active_tile_cells": simulation.tile_updater.active_cells,
+            "awake_tile_chunks": simulation.tile_updater.awake_chunks,
+            "rss_bytes": rss_bytes(),
+            "autosave_ms": autosave.get("duration_ms", 0.0),
+            "autosave_bytes": autosave.get("bytes", 0),
+        }
     )
 
 
 running = [True]
-fps_stats = [{}]
 accumulated_time = [0.0]
 last_time = pygame.time.get_ticks() / 1000.0  # seconds
 
+if args.profile_frames:
+    cprofile_capture.start(args.profile_frames)
+
 
 try:
     while running[0]:
@@ -294,15 +576,61 @@ try:
         last_time = current_time
         accumulated_time[0] += frame_time
 
+        profiler.begin_frame()
+        # The first frame warms caches, so it is not watched for hitches
+        if hitch_watchdog and timeline.total is not None:
+            hitch_watchdog.begin_frame()
         handle_events(running, camera)
+        if asset_watcher:
+            asset_watcher.apply_pending()
+        settings_update = settings_watcher.apply_pending()
+        if settings_update:
+            apply_settings(*settings_update)
+        profiler.mark("handle_events")
         update_game_logic(accumulated_time)
+        # Only the snapshot runs here; writing happens on the saver's thread
+        if world_saver:
+            world_saver.update()
+        profiler.mark("update_game_logic")
         center_camera_on_player()
+        profiler.mark("center_camera_on_player")
         render_frame()
-        update_title(fps_stats, player)
+        update_title(player)
+        profiler.end_frame()
+        # Adapt to the time spent working, not waiting on the frame cap
+        busy = profiler.frames.last() - profiler.phases["frame_wait"].last()
+        render_scaler.adapt(busy)
+        if hitch_watchdog:
+            hitch_watchdog.end_frame()
+        cprofile_capture.end_frame()
+        if metrics_sink and metrics_sink.due():
+            write_metrics()
+
+        if timeline.total is None:
+            timeline.mark("first frame")
+            timeline.log(logger)
+            if import_profiler:
+                import_profiler.uninstall()
+                import_profiler.dump(args.startup_profile)
+                logger.info("Import timings written to %s", args.startup_profile)
 except (KeyboardInterrupt, SystemExit):
     logger.info("Exiting game...")
 except Exception as e:
     # Panic window will be shown by sys.excepthook
     raise
 finally:
+    cprofile_capture.stop()
+    settings_watcher.stop()
+    if hitch_watchdog:
+        hitch_watchdog.stop()
+    sound_manager.stop_all()
+    if asset_watcher:
+        asset_watcher.stop()
+    if simulation.recorder:
+        simulation.recorder.close()
+    # Saves whatever changed since the last autosave
+    if world_saver:
+        world_saver.close()
+    if metrics_sink:
+        metrics_sink.close()
     pygame.quit()
@@ -0,0 +1,120 @@
+import csv
+import json
+import os
+import queue
+import threading
+import time
+
+from src.logging import get_logger
+
+logger = get_logger()
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes() -> int:
+    """Current resident set size, or the peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        pass
+    try:
+        import resource
+        import sys
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+def hit_rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return hits / total if total else 0.0
+
+
+class MetricsSink:
+    def __init__(
+        self,
+        path: str,
+        interval: float = 1.0,
+        fmt: str | None = None,
+        flush_interval: float = 5.0,
+    ):
+        """
+        Writes one metrics record every `interval` seconds to `path` as JSON lines,
+        or CSV when fmt="csv" or the path ends in .csv.
+
+        Records are handed to a background thread that writes through a large
+        buffer and flushes every flush_interval seconds, so the game thread only
+        builds a dict and enqueues it.
+        """
+        if fmt is None:
+            fmt = "csv" if path.endswith(".csv") else "jsonl"
+        if fmt not in ("csv", "jsonl"):
+            logger.warning("Unknown metrics format %r, writing JSON lines", fmt)
+            fmt = "jsonl"
+        self.path = path
+        self.interval = interval
+        self.fmt = fmt
+        self.flush_interval = flush_interval
+        self.records = 0
+        self._next_due = time.perf_counter() + interval
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-writer", daemon=True
+        )
+        self._thread.start()
+        logger.info("Writing %s metrics to %s every %.1fs", fmt, path, interval)
+
+    def due(self) -> bool:
+        """True once per interval; check before building a record."""
+        now = time.perf_counter()
+        if now < self._next_due:
+            return False
+        # Skip missed intervals rather than emitting a burst after a long hitch
+        self._next_due += self.interval
+        if self._next_due <= now:
+            self._next_due = now + self.interval
+        return True
+
+    def write(self, record: dict):
+        self._queue.put(record)
+        self.records += 1
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5.0)
+
+    def _run(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", newline="", buffering=64 * 1024) as f:
+            writer = None
+            last_flush = time.monotonic()
+            while True:
+                try:
+                    record = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    f.flush()
+                    last_flush = time.monotonic()
+                    continue
+                if record is None:
+                    break
+                if self.fmt == "jsonl":
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+                else:
+                    if writer is None:
+                        # Columns are fixed by the first record
+                        writer = csv.DictWriter(
+                            f, fieldnames=list(record), extrasaction="ignore"
+                        )
+                        writer.writeheader()
+                    writer.writerow(record)
+                now = time.monotonic()
+                if now - last_flush >= self.flush_interval:
+                    f.flush()
+                    last_flush = now
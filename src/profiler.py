@@ -0,0 +1,337 @@
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from array import array
+from collections import Counter
+from datetime import datetime
+
+from src.logging import get_logger
+
+logger = get_logger()
+
+# Phases timed every frame, in the order main.py runs them
+FRAME_PHASES = (
+    "handle_events",
+    "update_game_logic",
+    "center_camera_on_player",
+    "render_chunks",
+    "render_entities",
+    "render_scale",
+    "render_selector",
+    "render_minimap",
+    "render_overlay",
+    "display_flip",
+    "frame_wait",
+)
+
+
+class RingBuffer:
+    def __init__(self, capacity: int):
+        """Fixed-size buffer of floats that overwrites its oldest sample when full."""
+        self.capacity = capacity
+        self._data = array("d", bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def append(self, value: float):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    def values(self) -> list[float]:
+        """Samples from oldest to newest."""
+        if self._count < self.capacity:
+            return self._data[: self._count].tolist()
+        return self._data[self._next :].tolist() + self._data[: self._next].tolist()
+
+    def last(self, default: float = 0.0) -> float:
+        if not self._count:
+            return default
+        return self._data[self._next - 1]
+
+    def clear(self):
+        self._next = 0
+        self._count = 0
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = round(pct / 100 * (len(sorted_values) - 1))
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
+
+class FrameProfiler:
+    def __init__(self, capacity: int = 600, phases=FRAME_PHASES):
+        """
+        Times each phase of a frame into ring buffers of the last `capacity` frames.
+
+        Call begin_frame() at the top of the loop, mark(name) as each phase ends
+        (it records the time since the previous mark) and end_frame() last.
+        Times are in seconds.
+        """
+        self.capacity = capacity
+        self.phases: dict[str, RingBuffer] = {
+            name: RingBuffer(capacity) for name in phases
+        }
+        self.frames = RingBuffer(capacity)
+        self.ticks = RingBuffer(capacity)
+        self.frame_count = 0
+        self._frame_start = time.perf_counter()
+        self._last_mark = self._frame_start
+
+    def begin_frame(self):
+        self._frame_start = self._last_mark = time.perf_counter()
+
+    def mark(self, name: str):
+        now = time.perf_counter()
+        buffer = self.phases.get(name)
+        if buffer is None:
+            buffer = self.phases[name] = RingBuffer(self.capacity)
+        buffer.append(now - self._last_mark)
+        self._last_mark = now
+
+    def record_ticks(self, ticks: int):
+        self.ticks.append(ticks)
+
+    def end_frame(self):
+        self.frames.append(time.perf_counter() - self._frame_start)
+        self.frame_count += 1
+
+    def reset(self):
+        for buffer in self.phases.values():
+            buffer.clear()
+        self.frames.clear()
+        self.ticks.clear()
+
+    def last_frame(self) -> dict[str, float]:
+        """Phase name -> seconds spent in it during the most recent frame."""
+        return {name: buffer.last() for name, buffer in self.phases.items()}
+
+    def summarize(self, samples: list[float], percentiles=(50, 95, 99)) -> dict:
+        ordered = sorted(samples)
+        summary = {
+            "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+            "max": ordered[-1] if ordered else 0.0,
+        }
+        for pct in percentiles:
+            summary[f"p{pct}"] = percentile(ordered, pct)
+        return summary
+
+    def stats(self, percentiles=(50, 95, 99)) -> dict:
+        """
+        Summary of the buffered frames:
+        {"frames": n, "fps": average fps, "frame": {...}, "ticks": {...},
+         "phases": {name: {"mean", "max", "p50", ...}}}
+        """
+        frames = self.frames.values()
+        total = sum(frames)
+        return {
+            "frames": len(frames),
+            "fps": len(frames) / total if total > 0 else 0.0,
+            "frame": self.summarize(frames, percentiles),
+            "ticks": self.summarize(self.ticks.values(), percentiles),
+            "phases": {
+                name: self.summarize(buffer.values(), percentiles)
+                for name, buffer in self.phases.items()
+            },
+        }
+
+
+class CProfileCapture:
+    def __init__(self, output_dir: str = "profiles"):
+        """
+        Runs cProfile for a fixed number of frames and writes the result to a
+        .pstats file in output_dir (open it with `python -m pstats` or snakeviz).
+        """
+        self.output_dir = output_dir
+        self.remaining = 0
+        self.last_path: str | None = None
+        self._profile = None
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
+
+    def start(self, frames: int):
+        if self.active or frames <= 0:
+            return
+        import cProfile
+
+        self.remaining = frames
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        logger.info("Profiling the next %d frames", frames)
+
+    def end_frame(self) -> str | None:
+        """Count a frame; returns the .pstats path when the capture finishes."""
+        if self._profile is None:
+            return None
+        self.remaining -= 1
+        if self.remaining > 0:
+            return None
+        return self.stop()
+
+    def stop(self) -> str | None:
+        if self._profile is None:
+            return None
+        profile = self._profile
+        profile.disable()
+        self._profile = None
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.last_path = os.path.join(self.output_dir, f"frames_{stamp}.pstats")
+        profile.dump_stats(self.last_path)
+        logger.info("Profile written to %s", self.last_path)
+        return self.last_path
+
+
+class HitchWatchdog:
+    def __init__(
+        self,
+        profiler: FrameProfiler,
+        threshold: float = 0.1,
+        interval: float = 0.005,
+        output_dir: str = "profiles",
+        cooldown: float = 5.0,
+    ):
+        """
+        Samples the main thread's stack from a background thread while the current
+        frame has been running longer than `threshold` seconds, and writes the
+        stacks and the frame's phase breakdown to a hitch report afterwards.
+
+        Must be created on the thread it watches. Call begin_frame()/end_frame()
+        around each frame, end_frame() after profiler.end_frame(). At most one
+        report is written per `cooldown` seconds.
+        """
+        self.profiler = profiler
+        self.threshold = threshold
+        self.interval = interval
+        self.output_dir = output_dir
+        self.cooldown = cooldown
+        self.hitches = 0
+        self.reports = 0
+        self._thread_id = threading.get_ident()
+        self._lock = threading.Lock()
+        self._frame_start: float | None = None
+        self._samples: list[tuple] = []
+        self._pending: queue.SimpleQueue = queue.SimpleQueue()
+        self._last_report = float("-inf")
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="hitch-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def begin_frame(self):
+        with self._lock:
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        with self._lock:
+            start = self._frame_start
+            samples = self._samples
+            self._frame_start = None
+            self._samples = []
+        if start is None:
+            return
+        duration = time.perf_counter() - start
+        if duration < self.threshold:
+            return
+        self.hitches += 1
+        now = time.monotonic()
+        if now - self._last_report < self.cooldown:
+            return
+        self._last_report = now
+        # Formatting and writing happen on the watchdog thread
+        self._pending.put(
+            (
+                datetime.now(),
+                self.profiler.frame_count,
+                duration,
+                self.profiler.last_frame(),
+                samples,
+            )
+        )
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+            while True:
+                try:
+                    hitch = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    self._write_report(*hitch)
+                except OSError as e:
+                    logger.warning("Failed to write hitch report: %s", e)
+
+    def _sample(self):
+        with self._lock:
+            start = self._frame_start
+        if start is None or time.perf_counter() - start < self.threshold:
+            return
+        frame = sys._current_frames().get(self._thread_id)
+        if frame is None:
+            return
+        stack = tuple(
+            (summary.filename, summary.lineno, summary.name)
+            for summary in traceback.extract_stack(frame)
+        )
+        with self._lock:
+            # Drop the sample if the frame ended while the stack was being walked
+            if self._frame_start == start:
+                self._samples.append(stack)
+
+    def _write_report(self, when, frame_number, duration, phases, samples):
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = when.strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.output_dir, f"hitch_{stamp}_{frame_number}.txt")
+        lines = [
+            f"Hitch at {when.isoformat(timespec='milliseconds')}: frame {frame_number}"
+            f" took {duration * 1000:.1f}ms (threshold {self.threshold * 1000:.1f}ms)",
+            "",
+            "Phases:",
+        ]
+        for name, seconds in phases.items():
+            lines.append(f"  {name:<24} {seconds * 1000:8.2f}ms")
+        lines += [
+            "",
+            f"Main thread stacks ({len(samples)} samples, every"
+            f" {self.interval * 1000:.1f}ms once past the threshold):",
+        ]
+        for stack, count in Counter(samples).most_common():
+            lines.append("")
+            lines.append(f"{count} sample(s):")
+            for filename, lineno, name in stack:
+                lines.append(f'  File "{filename}", line {lineno}, in {name}')
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        self.reports += 1
+        logger.warning(
+            "Frame %d took %.1fms, hitch report written to %s",
+            frame_number,
+            duration * 1000,
+            path,
+        )
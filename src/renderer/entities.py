@@ -1,3 +1,6 @@
+import logging
+from typing import Iterable
+
 import pygame
 
 from src.entities.entity import Entity
@@ -14,34 +17,50 @@ class EntityRenderer:
     def __init__(self, pack_manager: PackManager, surface: pygame.Surface):
         self.pack_manager = pack_manager
         self.surface = surface
+        # Entities drawn by the last render_entities call
+        self.blits = 0
 
     def render_entity(self, entity: Entity, camera: Camera):
-        logger.debug(
-            f"Rendering entity {entity.uuid} at world position {entity.position}"
-        )
+        # Checked once so the debug arguments are never built at INFO
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(
+                "Rendering entity %s at world position %s", entity.uuid, entity.position
+            )
 
         # Determine texture
         texture_id = entity.texture_id
-        logger.debug(f"Entity {entity.uuid} uses texture ID: {texture_id}")
+        if debug:
+            logger.debug("Entity %s uses texture ID: %s", entity.uuid, texture_id)
         texture_img = self.pack_manager.load_texture_as_surface(texture_id)
         if texture_img is None:
             logger.error(
-                f"MissingTextureError: Missing texture for entity {entity.uuid}: {texture_id}"
+                "MissingTextureError: Missing texture for entity %s: %s",
+                entity.uuid,
+                texture_id,
             )
             raise MissingTextureError(f"Missing texture for ID: {texture_id}")
 
         # Assume entity has hitbox for size
         hitbox = entity.hitbox
         if hitbox:
-            logger.debug(
-                f"Entity {entity.uuid} hitbox size: {hitbox.width}x{hitbox.height} (in tiles) / {hitbox.width * 16}x{hitbox.height * 16} (in pixels)"
-            )
+            if debug:
+                logger.debug(
+                    "Entity %s hitbox size: %sx%s (in tiles) / %sx%s (in pixels)",
+                    entity.uuid,
+                    hitbox.width,
+                    hitbox.height,
+                    hitbox.width * 16,
+                    hitbox.height * 16,
+                )
             width = hitbox.width * 16
             height = hitbox.height * 16
         else:
-            logger.debug(
-                f"Entity {entity.uuid} has no hitbox, using default size: 1x1 tile / 16x16 pixels"
-            )
+            if debug:
+                logger.debug(
+                    "Entity %s has no hitbox, using default size: 1x1 tile / 16x16 pixels",
+                    entity.uuid,
+                )
             width = 16
             height = 16
 
@@ -57,23 +76,30 @@ class EntityRenderer:
         screen_y = int((ent_y - cam_y) * camera.zoom)
         entity_w = int(width * camera.zoom)
         entity_h = int(height * camera.zoom)
-        logger.debug(
-            f"Entity {entity.uuid} screen position: ({screen_x}, {screen_y}), size: ({entity_w}x{entity_h}), camera zoom: {camera.zoom}"
-        )
         rect = pygame.Rect(screen_x, screen_y, entity_w, entity_h)
-
-        logger.debug(f"Blitting entity {entity.uuid} to surface at rect {rect}")
+        if debug:
+            logger.debug(
+                "Entity %s screen position: (%d, %d), size: (%dx%d), camera zoom: %s",
+                entity.uuid,
+                screen_x,
+                screen_y,
+                entity_w,
+                entity_h,
+                camera.zoom,
+            )
+            logger.debug("Blitting entity %s to surface at rect %s", entity.uuid, rect)
         self.surface.blit(
             pygame.transform.scale(texture_img, (entity_w, entity_h)), rect
         )
 
-    def render_entities(self, entities: list[Entity], camera: Camera):
+    def render_entities(self, entities: Iterable[Entity], camera: Camera):
         cam_x, cam_y = camera.position
         cam_w = self.surface.get_width()
         cam_h = self.surface.get_height()
         zoom = camera.zoom
         # Camera view rectangle in world coordinates
         view_rect = pygame.Rect(cam_x, cam_y, cam_w / zoom, cam_h / zoom)
+        blits = 0
         for entity in entities:
             # Get entity position and size
             pos = getattr(entity, "position", (0, 0))
@@ -87,3 +113,5 @@ class EntityRenderer:
             entity_rect = pygame.Rect(pos[0], pos[1], width, height)
             if view_rect.colliderect(entity_rect):
                 self.render_entity(entity, camera)
+                blits += 1
+        self.blits = blits
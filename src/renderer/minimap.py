@@ -0,0 +1,101 @@
+import pygame
+
+from src.camera import Camera
+from src.world.grid import CHUNK_SIZE, TILE_SIZE, TileGrid
+from src.renderer.thumbnails import ChunkThumbnails
+
+CHUNK_PIXELS = CHUNK_SIZE * TILE_SIZE
+BACKGROUND = (0, 0, 0, 160)
+BORDER = (200, 200, 200)
+VIEW_COLOUR = (255, 255, 255)
+PLAYER_COLOUR = (255, 64, 64)
+
+
+class Minimap:
+    def __init__(
+        self,
+        thumbnails: ChunkThumbnails,
+        surface: pygame.Surface,
+        radius: int = 5,
+        refresh_ms: int = 250,
+        margin: int = 4,
+    ):
+        """
+        Overview of the chunks within `radius` chunks of the player, one pixel
+        per tile from the chunk thumbnails, drawn in the top-right corner with
+        the camera's view outlined. The map is rebuilt at most every refresh_ms;
+        thumbnails only change for chunks edited since.
+        """
+        self.thumbnails = thumbnails
+        self.surface = surface
+        self.radius = radius
+        self.refresh_ms = refresh_ms
+        self.margin = margin
+        self.visible = False
+        self._panel: pygame.Surface | None = None
+        self._built_at = -refresh_ms
+        # World pixel position of the panel's top-left corner
+        self._origin = (0, 0)
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._panel = None
+
+    def render(self, grid: TileGrid, centre: tuple[float, float], camera: Camera):
+        if not self.visible:
+            return
+        now = pygame.time.get_ticks()
+        if self._panel is None or now - self._built_at >= self.refresh_ms:
+            self._panel = self._build_panel(grid, centre)
+            self._built_at = now
+        x = self.surface.get_width() - self._panel.get_width() - self.margin
+        y = self.margin
+        self.surface.blit(self._panel, (x, y))
+
+        # View rectangle and player marker move every frame, so they are not
+        # part of the cached panel; one panel pixel is one tile
+        scale = 1 / TILE_SIZE
+        origin_x, origin_y = self._origin
+        view = pygame.Rect(
+            x + int((camera.position[0] - origin_x) * scale),
+            y + int((camera.position[1] - origin_y) * scale),
+            max(1, int(self.surface.get_width() / camera.zoom * scale)),
+            max(1, int(self.surface.get_height() / camera.zoom * scale)),
+        )
+        panel_rect = self._panel.get_rect(topleft=(x, y))
+        clipped = view.clip(panel_rect)
+        if clipped.width and clipped.height:
+            pygame.draw.rect(self.surface, VIEW_COLOUR, clipped, 1)
+        player = (
+            x + int((centre[0] - origin_x) * scale),
+            y + int((centre[1] - origin_y) * scale),
+        )
+        if panel_rect.collidepoint(player):
+            pygame.draw.circle(self.surface, PLAYER_COLOUR, player, 2)
+
+    def _build_panel(
+        self, grid: TileGrid, centre: tuple[float, float]
+    ) -> pygame.Surface:
+        self.thumbnails.prune(grid.chunk_index)
+        centre_x = int(centre[0] // CHUNK_PIXELS)
+        centre_y = int(centre[1] // CHUNK_PIXELS)
+        side = (2 * self.radius + 1) * CHUNK_SIZE
+        panel = pygame.Surface((side, side), pygame.SRCALPHA)
+        panel.fill(BACKGROUND)
+        first_x = centre_x - self.radius
+        first_y = centre_y - self.radius
+        for chunk_y in range(first_y, centre_y + self.radius + 1):
+            for chunk_x in range(first_x, centre_x + self.radius + 1):
+                chunk = grid.get_chunk(chunk_x, chunk_y)
+                if chunk is None:
+                    continue
+                panel.blit(
+                    self.thumbnails.get(chunk),
+                    (
+                        (chunk_x - first_x) * CHUNK_SIZE,
+                        (chunk_y - first_y) * CHUNK_SIZE,
+                    ),
+                )
+        pygame.draw.rect(panel, BORDER, panel.get_rect(), 1)
+        self._origin = (first_x * CHUNK_PIXELS, first_y * CHUNK_PIXELS)
+        return panel
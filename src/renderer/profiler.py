@@ -0,0 +1,94 @@
+import pygame
+
+from src.profiler import FrameProfiler
+
+# Reference lines drawn across the graph: 60 and 30 fps budgets
+BUDGETS_MS = (1000 / 60, 1000 / 30)
+
+
+class ProfilerOverlay:
+    def __init__(
+        self,
+        profiler: FrameProfiler,
+        surface: pygame.Surface,
+        font: pygame.font.Font,
+        refresh_ms: int = 250,
+        graph_size: tuple[int, int] = (240, 60),
+        graph_max_ms: float = 50.0,
+    ):
+        """
+        Draws frame and phase percentiles and a frame-time graph in the top-left
+        corner. The panel is rebuilt at most every refresh_ms so sorting the
+        samples does not itself show up in the profile.
+        """
+        self.profiler = profiler
+        self.surface = surface
+        self.font = font
+        self.refresh_ms = refresh_ms
+        self.graph_size = graph_size
+        self.graph_max_ms = graph_max_ms
+        self.visible = False
+        self._panel: pygame.Surface | None = None
+        self._built_at = -refresh_ms
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._panel = None
+
+    def render(self):
+        if not self.visible:
+            return
+        now = pygame.time.get_ticks()
+        if self._panel is None or now - self._built_at >= self.refresh_ms:
+            self._panel = self._build_panel()
+            self._built_at = now
+        self.surface.blit(self._panel, (4, 4))
+
+    def _build_panel(self) -> pygame.Surface:
+        stats = self.profiler.stats()
+        frame = stats["frame"]
+        lines = [
+            f"FPS {stats['fps']:.1f}  frame p50 {frame['p50'] * 1000:.2f}"
+            f" p95 {frame['p95'] * 1000:.2f} p99 {frame['p99'] * 1000:.2f}"
+            f" max {frame['max'] * 1000:.2f} ms",
+            f"ticks/frame mean {stats['ticks']['mean']:.2f}"
+            f" max {stats['ticks']['max']:.0f}",
+        ]
+        for name, phase in stats["phases"].items():
+            lines.append(
+                f"{name:<24} p50 {phase['p50'] * 1000:6.2f}"
+                f" p95 {phase['p95'] * 1000:6.2f} p99 {phase['p99'] * 1000:6.2f}"
+            )
+
+        texts = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+        line_height = self.font.get_linesize()
+        graph_w, graph_h = self.graph_size
+        width = max([graph_w] + [text.get_width() for text in texts]) + 8
+        height = line_height * len(texts) + graph_h + 12
+
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, text in enumerate(texts):
+            panel.blit(text, (4, 4 + i * line_height))
+
+        graph_top = 8 + line_height * len(texts)
+        graph_bottom = graph_top + graph_h
+        scale = graph_h / self.graph_max_ms
+        for budget in BUDGETS_MS:
+            y = graph_bottom - int(budget * scale)
+            pygame.draw.line(panel, (90, 90, 90), (4, y), (4 + graph_w, y))
+
+        samples = self.profiler.frames.values()[-graph_w:]
+        x = 4 + graph_w - len(samples)
+        for sample in samples:
+            ms = sample * 1000
+            bar = min(graph_h, max(1, int(ms * scale)))
+            if ms <= BUDGETS_MS[0]:
+                colour = (80, 200, 120)
+            elif ms <= BUDGETS_MS[1]:
+                colour = (230, 200, 60)
+            else:
+                colour = (230, 70, 70)
+            pygame.draw.line(panel, colour, (x, graph_bottom), (x, graph_bottom - bar))
+            x += 1
+        return panel
@@ -0,0 +1,97 @@
+import pygame
+
+from src.camera import Camera
+from src.logging import get_logger
+
+logger = get_logger()
+
+
+class RenderScaler:
+    def __init__(
+        self,
+        screen: pygame.Surface,
+        scale: float = 1.0,
+        adaptive: bool = False,
+        min_scale: float = 0.5,
+        target_frame_time: float = 1 / 60,
+        step: float = 0.125,
+        settle_frames: int = 30,
+    ):
+        """
+        Lets the world be drawn into an offscreen surface at `scale` times the
+        screen resolution and upscaled to the screen with one nearest-neighbour
+        scale per frame. UI drawn after present() stays at native resolution.
+
+        adaptive: lower the scale by `step` (down to min_scale) while frames take
+        longer than target_frame_time and raise it back towards `scale` when
+        there is headroom, changing at most once every settle_frames frames
+        """
+        self.screen = screen
+        self.camera = Camera()
+        self.scale = scale
+        self.current_scale = scale
+        self.adaptive = adaptive
+        self.min_scale = min(min_scale, scale)
+        self.target_frame_time = target_frame_time
+        self.step = step
+        self.settle_frames = settle_frames
+        self._offscreen: pygame.Surface | None = None
+        self._average = 0.0
+        self._frames_since_change = 0
+
+    def configure(self, scale: float, adaptive: bool, min_scale: float):
+        self.scale = scale
+        self.adaptive = adaptive
+        self.min_scale = min(min_scale, scale)
+        self.current_scale = scale
+        self._frames_since_change = 0
+
+    def _surface_size(self) -> tuple[int, int]:
+        width, height = self.screen.get_size()
+        return (
+            max(1, round(width * self.current_scale)),
+            max(1, round(height * self.current_scale)),
+        )
+
+    def begin(self, camera: Camera) -> tuple[pygame.Surface, Camera]:
+        """The surface to draw the world on this frame and the camera to draw with."""
+        if self.current_scale >= 1.0:
+            return self.screen, camera
+        size = self._surface_size()
+        if self._offscreen is None or self._offscreen.get_size() != size:
+            self._offscreen = pygame.Surface(size).convert()
+        # Same view of the world, just fewer pixels per world unit
+        self.camera.position = camera.position
+        self.camera.zoom = camera.zoom * size[0] / self.screen.get_width()
+        return self._offscreen, self.camera
+
+    def present(self):
+        """Upscale the offscreen surface onto the screen (no-op at full scale)."""
+        if self.current_scale >= 1.0 or self._offscreen is None:
+            return
+        # transform.scale is nearest-neighbour, which keeps pixel art sharp
+        pygame.transform.scale(self._offscreen, self.screen.get_size(), self.screen)
+
+    def adapt(self, frame_time: float):
+        """Feed the busy time of the last frame (excluding any frame-cap wait)."""
+        if not self.adaptive:
+            return
+        self._average += (frame_time - self._average) * 0.1
+        self._frames_since_change += 1
+        if self._frames_since_change < self.settle_frames:
+            return
+        if self._average > self.target_frame_time:
+            new_scale = max(self.min_scale, self.current_scale - self.step)
+        elif self._average < self.target_frame_time * 0.6:
+            new_scale = min(self.scale, self.current_scale + self.step)
+        else:
+            return
+        if new_scale != self.current_scale:
+            logger.info(
+                "Render scale %.3f -> %.3f (average frame %.1fms)",
+                self.current_scale,
+                new_scale,
+                self._average * 1000,
+            )
+            self.current_scale = new_scale
+            self._frames_since_change = 0
@@ -0,0 +1,67 @@
+import pygame
+
+from src.world.chunk import Chunk
+from src.world.grid import CHUNK_SIZE
+from src.asset.pack_manager import PackManager
+
+
+class ChunkThumbnails:
+    def __init__(self, pack_manager: PackManager):
+        """
+        A 16x16 surface per chunk with one pixel per tile in the average colour
+        of its texture, for drawing the world far zoomed out and for the minimap.
+        A chunk's thumbnail is rebuilt the next time it is requested after its
+        version changed; texture changes drop the affected colours and thumbnails.
+        """
+        self.pack_manager = pack_manager
+        # tile type -> average RGBA of its texture, None when it has none
+        self._colours: dict[str, tuple[int, int, int, int] | None] = {}
+        # chunk position -> (chunk version, thumbnail, tile types drawn in it)
+        self._thumbnails: dict[tuple[int, int], tuple] = {}
+        self.rebuilds = 0
+        pack_manager.add_listener(self.invalidate_textures)
+
+    def colour(self, tile_type: str) -> tuple[int, int, int, int] | None:
+        if tile_type in self._colours:
+            return self._colours[tile_type]
+        surface = self.pack_manager.load_texture_as_surface(tile_type)
+        colour = None
+        if surface is not None:
+            colour = tuple(pygame.transform.average_color(surface))
+        self._colours[tile_type] = colour
+        return colour
+
+    def get(self, chunk: Chunk) -> pygame.Surface:
+        cached = self._thumbnails.get(chunk.position)
+        if cached is not None and cached[0] == chunk.version:
+            return cached[1]
+        thumbnail = pygame.Surface((CHUNK_SIZE, CHUNK_SIZE), pygame.SRCALPHA)
+        types = set()
+        for tile in chunk.tiles:
+            colour = self.colour(tile.type)
+            if colour is not None:
+                thumbnail.set_at((tile.x, tile.y), colour)
+            types.add(tile.type)
+        self._thumbnails[chunk.position] = (chunk.version, thumbnail, types)
+        self.rebuilds += 1
+        return thumbnail
+
+    def prune(self, live_positions):
+        """Forget thumbnails of chunks that are not in live_positions any more."""
+        for position in [p for p in self._thumbnails if p not in live_positions]:
+            del self._thumbnails[position]
+
+    def invalidate_textures(self, texture_ids):
+        for texture_id in texture_ids:
+            self._colours.pop(texture_id, None)
+        stale = [
+            position
+            for position, (_, _, types) in self._thumbnails.items()
+            if not types.isdisjoint(texture_ids)
+        ]
+        for position in stale:
+            del self._thumbnails[position]
+
+    @property
+    def cache_size(self) -> int:
+        return len(self._thumbnails)
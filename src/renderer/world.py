@@ -1,20 +1,68 @@
+import math
+
 import pygame
 
 from src.world.tile import Tile
 from src.world.chunk import Chunk
 from src.camera import Camera
 from src.asset.pack_manager import PackManager
-from src.asset.tile import TileTexture
+from src.renderer.thumbnails import ChunkThumbnails
 
 
 class WorldRenderer:
-    def __init__(self, pack_manager: PackManager, surface: pygame.Surface):
+    def __init__(
+        self,
+        pack_manager: PackManager,
+        surface: pygame.Surface,
+        cache_budget: int | None = None,
+        thumbnails: ChunkThumbnails | None = None,
+        thumbnail_zoom: float = 0.5,
+    ):
+        """
+        cache_budget: most scaled surfaces to keep (None = unbounded); every zoom
+        level seen adds a copy of each texture, so long sessions should set one
+        thumbnails: when given, chunks are drawn as one scaled thumbnail blit each
+        instead of tile by tile while the zoom is below thumbnail_zoom
+        """
         self.pack_manager = pack_manager
+        self.cache_budget = cache_budget
+        self.thumbnails = thumbnails
+        self.thumbnail_zoom = thumbnail_zoom
+        # chunk position -> (thumbnail, size, scaled thumbnail) of the last frame
+        self._scaled_thumbnails: dict[tuple[int, int], tuple] = {}
         self.surface = surface
         # Cache for scaled pygame Surfaces keyed by (texture_id, quantized_zoom)
         # This avoids recreating Surfaces and repeatedly calling pygame.transform.scale
         # for every tile every frame.
         self._scaled_surface_cache: dict[tuple[str, float], pygame.Surface] = {}
+        # Per-frame counters, reset by render_chunks (read by the metrics sink)
+        self.blits = 0
+        self.visible_chunks = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Drop scaled copies of textures whose pack source changes
+        pack_manager.add_listener(self.invalidate_textures)
+
+    def set_cache_budget(self, cache_budget: int | None):
+        self.cache_budget = cache_budget
+        self._trim_cache()
+
+    def _trim_cache(self):
+        # Dicts keep insertion order, so the first keys are the oldest entries
+        if self.cache_budget is None:
+            return
+        cache = self._scaled_surface_cache
+        while len(cache) > self.cache_budget:
+            del cache[next(iter(cache))]
+
+    def _store_scaled(self, key, surface: pygame.Surface):
+        self._scaled_surface_cache[key] = surface
+        self._trim_cache()
+
+    def invalidate_textures(self, texture_ids):
+        stale = [key for key in self._scaled_surface_cache if key[0] in texture_ids]
+        for key in stale:
+            del self._scaled_surface_cache[key]
 
     def get_visible_tiles(self, chunks: list[Chunk], camera: Camera):
         cam_x, cam_y = camera.position
@@ -58,7 +106,7 @@ class WorldRenderer:
             sw = max(1, int(w * zoom))
             sh = max(1, int(h * zoom))
             scaled_surface = pygame.transform.scale(base_surface, (sw, sh))
-            self._scaled_surface_cache[cache_key] = scaled_surface
+            self._store_scaled(cache_key, scaled_surface)
 
         # World to screen transformation (snap camera to avoid subpixel rendering)
         def round_1_16(val):
@@ -94,31 +142,60 @@ class WorldRenderer:
         # Always fill background to avoid flicker
         self.surface.fill((0, 0, 0))
 
-        # Get mouse position in screen coordinates
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-
-        # Calculate hovered tile position in world coordinates
-        # Assume all tiles are 16x16 pixels (from TileTexture)
-        zoom = camera.zoom
-        cam_px = camera.position[0]
-        cam_py = camera.position[1]
-        tile_size = 16 * zoom
-        hovered_tile_x = int((mouse_x / zoom + cam_px) // 16)
-        hovered_tile_y = int((mouse_y / zoom + cam_py) // 16)
-
-        hovered_screen_x = int(((hovered_tile_x * 16) - cam_px) * zoom)
-        hovered_screen_y = int(((hovered_tile_y * 16) - cam_py) * zoom)
-        hovered_rect = pygame.Rect(
-            hovered_screen_x, hovered_screen_y, int(16 * zoom), int(16 * zoom)
-        )
-
         # Iterate chunks and tiles, but use pre-converted pygame Surfaces and
         # cached scaled surfaces to avoid repeated conversion/scale operations.
         def _zoom_key(z: float) -> float:
             return round(z, 3)
 
         zk = _zoom_key(camera.zoom)
+        # Chunks entirely outside the view are skipped without touching their tiles
+        chunk_px = 16 * 16
+        view_left, view_top = camera.position
+        view_right = view_left + self.surface.get_width() / camera.zoom
+        view_bottom = view_top + self.surface.get_height() / camera.zoom
+        blits = visible_chunks = hits = misses = 0
+        use_thumbnails = (
+            self.thumbnails is not None and camera.zoom < self.thumbnail_zoom
+        )
+        if use_thumbnails:
+            # Rounded up so neighbouring chunks never leave a gap between them
+            thumbnail_size = math.ceil(chunk_px * camera.zoom)
+            previous_thumbnails = self._scaled_thumbnails
+            self._scaled_thumbnails = {}
+        else:
+            self._scaled_thumbnails.clear()
         for chunk in chunks:
+            chunk_left = chunk.position[0] * chunk_px
+            chunk_top = chunk.position[1] * chunk_px
+            if (
+                chunk_left >= view_right
+                or chunk_left + chunk_px <= view_left
+                or chunk_top >= view_bottom
+                or chunk_top + chunk_px <= view_top
+            ):
+                continue
+            visible_chunks += 1
+            if use_thumbnails:
+                thumbnail = self.thumbnails.get(chunk)
+                cached = previous_thumbnails.get(chunk.position)
+                if cached and cached[0] is thumbnail and cached[1] == thumbnail_size:
+                    hits += 1
+                else:
+                    scaled = pygame.transform.scale(
+                        thumbnail, (thumbnail_size, thumbnail_size)
+                    )
+                    cached = (thumbnail, thumbnail_size, scaled)
+                    misses += 1
+                self._scaled_thumbnails[chunk.position] = cached
+                self.surface.blit(
+                    cached[2],
+                    (
+                        int((chunk_left - camera.position[0]) * camera.zoom),
+                        int((chunk_top - camera.position[1]) * camera.zoom),
+                    ),
+                )
+                blits += 1
+                continue
             for tile in chunk.tiles:
                 tile_x = tile.x + (16 * chunk.position[0])
                 tile_y = tile.y + (16 * chunk.position[1])
@@ -130,12 +207,14 @@ class WorldRenderer:
                 cache_key = (tile.type, zk)
                 if cache_key in self._scaled_surface_cache:
                     scaled_surface = self._scaled_surface_cache[cache_key]
+                    hits += 1
                 else:
                     w, h = base_surface.get_width(), base_surface.get_height()
                     sw = max(1, int(w * camera.zoom))
                     sh = max(1, int(h * camera.zoom))
                     scaled_surface = pygame.transform.scale(base_surface, (sw, sh))
-                    self._scaled_surface_cache[cache_key] = scaled_surface
+                    self._store_scaled(cache_key, scaled_surface)
+                    misses += 1
 
                 screen_x = int(
                     ((tile_x * base_surface.get_width()) - camera.position[0])
@@ -152,12 +231,50 @@ class WorldRenderer:
                     scaled_surface.get_height(),
                 )
                 self.surface.blit(scaled_surface, rect)
+                blits += 1
+
+        self.blits = blits
+        self.visible_chunks = visible_chunks
+        self.cache_hits += hits
+        self.cache_misses += misses
+
+    @property
+    def cache_size(self) -> int:
+        return len(self._scaled_surface_cache)
+
+    def render_selector(self, camera: Camera):
+        # Get mouse position in screen coordinates
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+
+        # Calculate hovered tile position in world coordinates
+        # Assume all tiles are 16x16 pixels (from TileTexture)
+        zoom = camera.zoom
+        cam_px = camera.position[0]
+        cam_py = camera.position[1]
+        tile_size = 16 * zoom
+        hovered_tile_x = int((mouse_x / zoom + cam_px) // 16)
+        hovered_tile_y = int((mouse_y / zoom + cam_py) // 16)
+
+        hovered_screen_x = int(((hovered_tile_x * 16) - cam_px) * zoom)
+        hovered_screen_y = int(((hovered_tile_y * 16) - cam_py) * zoom)
+        hovered_rect = pygame.Rect(
+            hovered_screen_x, hovered_screen_y, int(16 * zoom), int(16 * zoom)
+        )
 
-        # Draw selector texture on top of hovered tile (even if empty)
-        selector_img = self.pack_manager.load_texture("openbench.selector")
-        if selector_img is not None:
-            selector_texture = TileTexture("openbench.selector", selector_img)
-            selector_surface = pygame.transform.scale(
-                selector_texture.surface, (hovered_rect.width, hovered_rect.height)
+        zk = round(zoom, 3)
+        # Draw selector texture on top of hovered tile (even if empty), reusing
+        # the scaled surface cache instead of converting a PIL image every frame
+        selector_key = ("openbench.selector", zk)
+        selector_surface = self._scaled_surface_cache.get(selector_key)
+        if selector_surface is None:
+            selector_base = self.pack_manager.load_texture_as_surface(
+                "openbench.selector"
             )
+            if selector_base is not None:
+                selector_surface = pygame.transform.scale(
+                    selector_base, (hovered_rect.width, hovered_rect.height)
+                )
+                self._store_scaled(selector_key, selector_surface)
+        if selector_surface is not None:
             self.surface.blit(selector_surface, hovered_rect)
+            self.blits += 1
@@ -0,0 +1,244 @@
+import argparse
+import gzip
+import json
+import struct
+import sys
+import time
+
+from src.entities.player import Player
+from src.keybinds import KeybindManager
+from src.simulation import Simulation, TICK_RATE, create_default_chunks
+from src.logging import get_logger
+
+logger = get_logger()
+
+MAGIC = b"OBREC1"
+FORMAT_VERSION = 1
+
+# Frame header: ticks run this frame, active-action bitmask, number of ops
+_FRAME = struct.Struct("<HIH")
+# Ops: kind byte followed by a kind-specific payload
+_OP_KIND = struct.Struct("<B")
+_OP_EDIT = struct.Struct("<ddH")  # world_x, world_y, tile type index
+_OP_SPAWN = struct.Struct("<dd")  # world_x, world_y
+_OP_STRING = struct.Struct("<H")  # utf-8 length, followed by the bytes
+
+OP_EDIT = 1
+OP_SPAWN = 2
+OP_STRING = 3
+
+NO_TILE = 0xFFFF
+
+
+class InputRecorder:
+    def __init__(
+        self,
+        path: str,
+        seed: int,
+        action_names: list[str],
+        tick_rate: int = TICK_RATE,
+        tile_update_budget: int = 1024,
+        max_entities: int = 512,
+    ):
+        """
+        Records per-frame input (active actions, tile edits, spawns and the number of
+        ticks run) to a gzip-compressed binary file that InputReplayer can play back.
+        tick_rate, tile_update_budget and max_entities are stored since they change
+        the outcome.
+        """
+        self.path = path
+        self.action_names = sorted(action_names)
+        self._action_bits = {name: 1 << i for i, name in enumerate(self.action_names)}
+        self._strings: dict[str, int] = {}
+        self._ops = bytearray()
+        self._op_count = 0
+        self.frames = 0
+
+        self._file = gzip.open(path, "wb")
+        header = json.dumps(
+            {
+                "version": FORMAT_VERSION,
+                "seed": seed,
+                "tick_rate": tick_rate,
+                "tile_update_budget": tile_update_budget,
+                "max_entities": max_entities,
+                "actions": self.action_names,
+                "world": "default",
+            }
+        ).encode("utf-8")
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+        logger.info("Recording input to %s (seed %d)", path, seed)
+
+    def _string_index(self, value: str) -> int:
+        index = self._strings.get(value)
+        if index is None:
+            index = len(self._strings)
+            self._strings[value] = index
+            encoded = value.encode("utf-8")
+            self._ops += _OP_KIND.pack(OP_STRING) + _OP_STRING.pack(len(encoded))
+            self._ops += encoded
+            self._op_count += 1
+        return index
+
+    def record_edit(self, world_x: float, world_y: float, tile_type: str | None):
+        type_index = NO_TILE if tile_type is None else self._string_index(tile_type)
+        self._ops += _OP_KIND.pack(OP_EDIT) + _OP_EDIT.pack(world_x, world_y, type_index)
+        self._op_count += 1
+
+    def record_spawn(self, world_x: float, world_y: float):
+        self._ops += _OP_KIND.pack(OP_SPAWN) + _OP_SPAWN.pack(world_x, world_y)
+        self._op_count += 1
+
+    def end_frame(self, actions: set[str], ticks: int):
+        mask = 0
+        for action in actions:
+            mask |= self._action_bits.get(action, 0)
+        self._file.write(_FRAME.pack(ticks, mask, self._op_count))
+        self._file.write(self._ops)
+        self._ops.clear()
+        self._op_count = 0
+        self.frames += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info("Recorded %d frames to %s", self.frames, self.path)
+
+
+class InputReplayer:
+    def __init__(self, path: str):
+        with gzip.open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{path} is not an openbench input recording")
+        offset = len(MAGIC)
+        (header_len,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        self.header = json.loads(data[offset : offset + header_len].decode("utf-8"))
+        if self.header.get("version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported recording version: {self.header.get('version')}"
+            )
+        self.seed: int = self.header["seed"]
+        self.action_names: list[str] = self.header["actions"]
+        self._data = data
+        self._start = offset + header_len
+
+    def frames(self):
+        """Yield (actions, ops, ticks) for every recorded frame, in order."""
+        data = self._data
+        offset = self._start
+        strings: list[str] = []
+        while offset < len(data):
+            ticks, mask, op_count = _FRAME.unpack_from(data, offset)
+            offset += _FRAME.size
+            ops = []
+            for _ in range(op_count):
+                (kind,) = _OP_KIND.unpack_from(data, offset)
+                offset += _OP_KIND.size
+                if kind == OP_EDIT:
+                    world_x, world_y, type_index = _OP_EDIT.unpack_from(data, offset)
+                    offset += _OP_EDIT.size
+                    tile_type = None if type_index == NO_TILE else strings[type_index]
+                    ops.append((OP_EDIT, world_x, world_y, tile_type))
+                elif kind == OP_SPAWN:
+                    world_x, world_y = _OP_SPAWN.unpack_from(data, offset)
+                    offset += _OP_SPAWN.size
+                    ops.append((OP_SPAWN, world_x, world_y))
+                elif kind == OP_STRING:
+                    (length,) = _OP_STRING.unpack_from(data, offset)
+                    offset += _OP_STRING.size
+                    strings.append(data[offset : offset + length].decode("utf-8"))
+                    offset += length
+                else:
+                    raise ValueError(f"Corrupt recording: unknown op kind {kind}")
+            actions = {
+                name for i, name in enumerate(self.action_names) if mask & (1 << i)
+            }
+            yield actions, ops, ticks
+
+    def create_simulation(self) -> Simulation:
+        player = Player(uuid="player1", username="Player", position=(0, 10))
+        keybind_manager = KeybindManager({name: [] for name in self.action_names})
+        return Simulation(
+            create_default_chunks(),
+            player,
+            keybind_manager,
+            self.seed,
+            max_entities=self.header.get("max_entities", 512),
+            tick_rate=self.header.get("tick_rate", TICK_RATE),
+            tile_update_budget=self.header.get("tile_update_budget", 1024),
+        )
+
+    def run(self, simulation: Simulation | None = None) -> dict:
+        """Replay every frame as fast as possible and return a tick-time report."""
+        if simulation is None:
+            simulation = self.create_simulation()
+        tick_times = []
+        frames = 0
+        start = time.perf_counter()
+        for actions, ops, ticks in self.frames():
+            for op in ops:
+                if op[0] == OP_EDIT:
+                    simulation.set_tile(op[1], op[2], op[3])
+                else:
+                    simulation.spawn_npe(op[1], op[2])
+            simulation.keybind_manager.set_active(actions)
+            for _ in range(ticks):
+                tick_start = time.perf_counter()
+                simulation.tick()
+                tick_times.append(time.perf_counter() - tick_start)
+            frames += 1
+        wall = time.perf_counter() - start
+        return build_report(tick_times, frames, wall, simulation)
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def build_report(
+    tick_times: list[float], frames: int, wall: float, simulation: Simulation
+) -> dict:
+    ordered = sorted(tick_times)
+    ms = 1000.0
+    return {
+        "frames": frames,
+        "ticks": len(tick_times),
+        "wall_seconds": wall,
+        "ticks_per_second": len(tick_times) / wall if wall > 0 else 0.0,
+        "tick_ms_mean": (sum(ordered) / len(ordered) * ms) if ordered else 0.0,
+        "tick_ms_p50": _percentile(ordered, 50) * ms,
+        "tick_ms_p95": _percentile(ordered, 95) * ms,
+        "tick_ms_p99": _percentile(ordered, 99) * ms,
+        "tick_ms_max": (ordered[-1] * ms) if ordered else 0.0,
+        "final_tick": simulation.tick_count,
+        "final_entities": len(simulation.entity_manager),
+        "final_player_position": list(simulation.player.position),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.replay",
+        description="Replay a recorded input file headless and report tick times.",
+    )
+    parser.add_argument("recording", help="path to a recording made with --record")
+    parser.add_argument("--json", help="write the tick-time report to this file")
+    args = parser.parse_args(argv)
+
+    report = InputReplayer(args.recording).run()
+    for key, value in report.items():
+        logger.info("%s: %s", key, value)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import sys
+
+from src.server.server import main
+
+sys.exit(main())
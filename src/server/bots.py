@@ -0,0 +1,245 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from src.server.protocol import (
+    ACTIONS,
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    HEADER_SIZE,
+    decode,
+    encode,
+    read_frame,
+    read_message,
+)
+from src.server.replication import ReplicaClient
+from src.simulation import TICK_RATE
+from src.logging import get_logger
+
+logger = get_logger("openbench_server")
+
+
+class Bot:
+    def __init__(
+        self,
+        name: str,
+        rng: random.Random,
+        input_rate: float = 10.0,
+        edit_chance: float = 0.02,
+        view_radius: int = 4,
+    ):
+        """
+        Simulated client: holds random movement keys, changing them about once a
+        second, sends its input input_rate times a second and places or removes a
+        tile with probability edit_chance per input message. Replication updates
+        are applied to a ReplicaClient and acknowledged like a real client would.
+        """
+        self.name = name
+        self.rng = rng
+        self.input_rate = input_rate
+        self.edit_chance = edit_chance
+        self.view_radius = view_radius
+        self.uuid: str | None = None
+        self.replica = ReplicaClient()
+        self.updates = 0
+        self.bytes_received = 0
+        # message type -> bytes received, framing included
+        self.bytes_by_type: dict[str, int] = {}
+        self.messages_sent = 0
+        self.errors: list[str] = []
+
+    async def run(self, host: str, port: int, duration: float):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(
+            encode(
+                {
+                    "type": "hello",
+                    "username": self.name,
+                    "view_radius": self.view_radius,
+                }
+            )
+        )
+        receiver = asyncio.create_task(self._receive(reader, writer))
+        try:
+            await self._send_inputs(writer, duration)
+        finally:
+            writer.close()
+            receiver.cancel()
+            try:
+                await receiver
+            except asyncio.CancelledError:
+                pass
+
+    async def _send_inputs(self, writer: asyncio.StreamWriter, duration: float):
+        loop = asyncio.get_running_loop()
+        end = loop.time() + duration
+        actions: list[str] = []
+        interval = 1.0 / self.input_rate
+        while loop.time() < end:
+            if self.rng.random() < interval:
+                actions = self.rng.sample(sorted(ACTIONS), self.rng.randint(0, 2))
+            writer.write(encode({"type": "input", "actions": actions}))
+            self.messages_sent += 1
+            if self.rng.random() < self.edit_chance:
+                writer.write(
+                    encode(
+                        {
+                            "type": "set_tile",
+                            "x": self.rng.randrange(0, 48),
+                            "y": self.rng.randrange(0, 15),
+                            "tile": self.rng.choice(["openbench.wood", None]),
+                        }
+                    )
+                )
+                self.messages_sent += 1
+            await writer.drain()
+            await asyncio.sleep(interval)
+
+    async def _receive(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        while True:
+            payload = await read_frame(reader)
+            if payload is None:
+                return
+            message = decode(payload)
+            kind = message["type"]
+            size = HEADER_SIZE + len(payload)
+            self.bytes_received += size
+            self.bytes_by_type[kind] = self.bytes_by_type.get(kind, 0) + size
+            if kind in ("chunk", "entities"):
+                self.replica.apply(message)
+                if kind == "entities":
+                    self.updates += 1
+                # Acknowledge before the next read so the server can send more
+                for reply in self.replica.take_messages():
+                    writer.write(encode(reply))
+            elif kind == "welcome":
+                self.uuid = message["uuid"]
+            elif kind == "error":
+                self.errors.append(message["message"])
+
+
+async def fetch_stats(host: str, port: int, reset: bool = False) -> dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode({"type": "stats", "reset": reset}))
+    await writer.drain()
+    message = await read_message(reader)
+    writer.close()
+    return message or {}
+
+
+async def _wait_for_server(host: str, port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run_load(
+    host: str,
+    port: int,
+    clients: int,
+    duration: float,
+    seed: int = 0,
+    warmup: float = 2.0,
+) -> dict:
+    """
+    Connect `clients` bots for warmup + duration seconds and return the server's
+    tick-time stats over the measured part plus what the bots saw.
+    """
+    rng = random.Random(seed)
+    bots = [Bot(f"bot{i}", random.Random(rng.getrandbits(64))) for i in range(clients)]
+    tasks = [
+        asyncio.create_task(bot.run(host, port, warmup + duration)) for bot in bots
+    ]
+    await asyncio.sleep(warmup)
+    await fetch_stats(host, port, reset=True)
+    await asyncio.sleep(duration)
+    server_stats = await fetch_stats(host, port)
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    failures = [str(r) for r in results if isinstance(r, Exception)]
+    total_updates = sum(bot.updates for bot in bots)
+    total_bytes = sum(bot.bytes_received for bot in bots)
+    elapsed = warmup + duration
+    updates_per_client = total_updates / clients if clients else 0.0
+    return {
+        "clients": clients,
+        "duration": duration,
+        "failed_clients": len(failures),
+        "client_errors": failures[:5] + [e for bot in bots for e in bot.errors][:5],
+        "updates_per_client_per_second": updates_per_client / elapsed,
+        "received_bytes_per_second": total_bytes / elapsed,
+        "messages_sent": sum(bot.messages_sent for bot in bots),
+        "server": server_stats,
+    }
+
+
+async def _main(args) -> dict:
+    server_process = None
+    if args.spawn_server:
+        server_process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "src.server",
+            "--host",
+            args.host,
+            "--port",
+            str(args.port),
+            "--tick-rate",
+            str(args.tick_rate),
+        )
+    try:
+        await _wait_for_server(args.host, args.port)
+        return await run_load(
+            args.host, args.port, args.clients, args.duration, args.seed
+        )
+    finally:
+        if server_process is not None:
+            server_process.terminate()
+            await server_process.wait()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.server.bots",
+        description="Load a server with simulated clients and report its tick times.",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--spawn-server",
+        action="store_true",
+        help="start a server subprocess for the run instead of using a running one",
+    )
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE)
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(_main(args))
+    for key, value in report.items():
+        if key != "server":
+            logger.info("%s: %s", key, value)
+    for key, value in report["server"].items():
+        logger.info("server %s: %s", key, value)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
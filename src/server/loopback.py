@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+
+from src.server.bots import Bot
+from src.server.replication import chunk_cells
+from src.server.server import GameServer
+from src.simulation import TICK_RATE, Simulation, create_default_chunks
+from src.logging import get_logger
+
+logger = get_logger("openbench_server")
+
+
+def _check_replicas(server: GameServer, bots: list[Bot]) -> int:
+    """Count replicated chunks whose cells differ from the server's at that version."""
+    mismatches = 0
+    grid = server.simulation.grid
+    for bot in bots:
+        for position, (version, cells) in bot.replica.chunks.items():
+            chunk = grid.get_chunk(*position)
+            if chunk is not None and chunk.version == version:
+                mismatches += chunk_cells(chunk) != cells
+    return mismatches
+
+
+async def run_loopback(
+    clients: int = 8,
+    duration: float = 5.0,
+    seed: int = 0,
+    tick_rate: int = TICK_RATE,
+    broadcast_rate: int = 20,
+    view_radius: int = 4,
+    edit_chance: float = 0.02,
+) -> dict:
+    """
+    Run a server and `clients` bots in this process over 127.0.0.1 and report
+    the bytes per second each client received, split by message type, and
+    whether the replicated chunks match the server's.
+    """
+    simulation = Simulation(
+        create_default_chunks(), None, None, seed=seed, tick_rate=tick_rate
+    )
+    server = GameServer(simulation, port=0, broadcast_rate=broadcast_rate)
+    await server.start()
+    rng = random.Random(seed)
+    bots = [
+        Bot(
+            f"bot{i}",
+            random.Random(rng.getrandbits(64)),
+            edit_chance=edit_chance,
+            view_radius=view_radius,
+        )
+        for i in range(clients)
+    ]
+    try:
+        results = await asyncio.gather(
+            *(bot.run(server.host, server.port, duration) for bot in bots),
+            return_exceptions=True,
+        )
+        mismatches = _check_replicas(server, bots)
+    finally:
+        await server.close()
+
+    per_client = [
+        {
+            "name": bot.name,
+            "bytes_per_second": bot.bytes_received / duration,
+            **{
+                f"{kind}_bytes_per_second": size / duration
+                for kind, size in sorted(bot.bytes_by_type.items())
+            },
+            "chunks": len(bot.replica.chunks),
+            "entities": len(bot.replica.entities),
+            "resyncs": bot.replica.resyncs,
+        }
+        for bot in bots
+    ]
+    rates = [client["bytes_per_second"] for client in per_client]
+    return {
+        "clients": clients,
+        "duration": duration,
+        "view_radius": view_radius,
+        "failed_clients": sum(isinstance(r, Exception) for r in results),
+        "bytes_per_second_per_client_mean": sum(rates) / len(rates) if rates else 0.0,
+        "bytes_per_second_per_client_max": max(rates, default=0.0),
+        "replica_mismatches": mismatches,
+        "per_client": per_client,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.server.loopback",
+        description="Measure replication bandwidth per client over a local loopback.",
+    )
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE)
+    parser.add_argument("--broadcast-rate", type=int, default=20)
+    parser.add_argument("--view-radius", type=int, default=4)
+    parser.add_argument(
+        "--edit-chance",
+        type=float,
+        default=0.02,
+        help="chance of a tile edit per input message",
+    )
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(
+        run_loopback(
+            args.clients,
+            args.duration,
+            args.seed,
+            args.tick_rate,
+            args.broadcast_rate,
+            args.view_radius,
+            args.edit_chance,
+        )
+    )
+    for key, value in report.items():
+        if key != "per_client":
+            logger.info("%s: %s", key, value)
+    for client in report["per_client"]:
+        logger.info(
+            "%s: %s",
+            client["name"],
+            ", ".join(
+                f"{key} {value:.0f}" if isinstance(value, float) else f"{key} {value}"
+                for key, value in client.items()
+                if key != "name"
+            ),
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=4)
+    return 0 if not report["failed_clients"] and not report["replica_mismatches"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import struct
+
+from src.errors import ProtocolError
+
+# Every message is a 4-byte big-endian length followed by that many bytes of
+# payload: a UTF-8 JSON object for control messages, or for bulk replication
+# data (see src/server/replication.py) one kind byte and a packed struct
+_LENGTH = struct.Struct("!I")
+HEADER_SIZE = _LENGTH.size
+MAX_MESSAGE_SIZE = 1024 * 1024
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 25575
+
+# Actions a client may report as held; anything else is ignored
+ACTIONS = frozenset({"left", "right", "up", "down"})
+
+# kind byte -> message type of binary payloads
+BINARY_KINDS = {1: "chunk", 2: "entities"}
+
+
+def encode(message: dict) -> bytes:
+    payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def encode_binary(payload: bytes) -> bytes:
+    return _LENGTH.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes | None:
+    """The next message's raw payload, or None once the peer has closed."""
+    try:
+        header = await reader.readexactly(_LENGTH.size)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    (length,) = _LENGTH.unpack(header)
+    if length > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"Message of {length} bytes exceeds the limit")
+    try:
+        return await reader.readexactly(length)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+
+def decode(payload: bytes) -> dict:
+    if payload[:1] != b"{":
+        kind = BINARY_KINDS.get(payload[0]) if payload else None
+        if kind is None:
+            raise ProtocolError("Unknown binary message kind")
+        # Left packed; the replication client parses it
+        return {"type": kind, "data": payload}
+    try:
+        message = json.loads(payload)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ProtocolError(f"Malformed message: {e}") from None
+    if not isinstance(message, dict) or not isinstance(message.get("type"), str):
+        raise ProtocolError("Message must be an object with a 'type'")
+    return message
+
+
+async def read_message(reader: asyncio.StreamReader) -> dict | None:
+    """The next message, or None once the peer has closed the connection."""
+    payload = await read_frame(reader)
+    return None if payload is None else decode(payload)
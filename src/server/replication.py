@@ -0,0 +1,495 @@
+import struct
+import zlib
+
+from src.errors import ProtocolError
+from src.server.protocol import encode_binary
+from src.world.chunk import Chunk
+from src.world.grid import CHUNK_SIZE, TILE_SIZE, TileGrid
+from src.logging import get_logger
+
+logger = get_logger("openbench_server")
+
+# Binary replication messages (see protocol.BINARY_KINDS). Chunk contents are a
+# palette of the tile types in use plus one index per cell, bit-packed at the
+# narrowest width the palette allows; index 0 is always "no tile". Cells are
+# numbered y * CHUNK_SIZE + x. Only tile types are replicated, not block_state.
+KIND_CHUNK = 1
+KIND_ENTITIES = 2
+
+MODE_FULL = 0
+MODE_DELTA = 1
+MODE_DROP = 2
+
+CELLS = CHUNK_SIZE * CHUNK_SIZE
+CHUNK_PIXELS = CHUNK_SIZE * TILE_SIZE
+# Entity positions travel as integers in 1/POSITION_SCALE pixel steps
+POSITION_SCALE = 8
+MAX_VIEW_RADIUS = 16
+# Palette entries store their length in one byte
+MAX_TILE_NAME_BYTES = 255
+
+# kind, chunk x, chunk y, version, content hash, mode; then by mode:
+# full: palette, packed cells
+# delta: base version, palette, edit count, edits
+_CHUNK_HEADER = struct.Struct("<BiiIIB")
+_BASE_VERSION = struct.Struct("<I")
+_COUNT = struct.Struct("<H")
+_CELL_EDIT = struct.Struct("<BB")  # cell, palette index
+# kind, tick; then sections of removed, new, moved and jumped entities, each
+# a count followed by that many records
+_ENTITIES_HEADER = struct.Struct("<BI")
+_ENTITY_ID = struct.Struct("<H")
+_ENTITY_NEW = struct.Struct("<HiiB")  # id, x, y, uuid length + uuid bytes
+_ENTITY_MOVE = struct.Struct("<Hhh")  # id, dx, dy since the previous message
+_ENTITY_JUMP = struct.Struct("<Hii")  # id, x, y when a delta does not fit
+_DELTA_MIN, _DELTA_MAX = -(2**15), 2**15 - 1
+_MAX_ENTITY_IDS = 2**16
+
+
+def quantize(value: float) -> int:
+    return round(value * POSITION_SCALE)
+
+
+def chunk_cells(chunk: Chunk) -> tuple:
+    cells = [None] * CELLS
+    for tile in chunk.tiles:
+        cells[tile.y * CHUNK_SIZE + tile.x] = tile.type
+    return tuple(cells)
+
+
+def _pack_palette(names: list[str]) -> bytes:
+    if len(names) > 255:
+        raise ProtocolError("A chunk uses more than 255 tile types")
+    out = bytearray([len(names)])
+    for name in names:
+        data = name.encode("utf-8")
+        if len(data) > MAX_TILE_NAME_BYTES:
+            raise ProtocolError(f"Tile type name too long: {name[:32]}...")
+        out.append(len(data))
+        out += data
+    return bytes(out)
+
+
+def _unpack_palette(data: bytes, offset: int) -> tuple[list, int]:
+    count = data[offset]
+    offset += 1
+    names = [None]
+    for _ in range(count):
+        length = data[offset]
+        names.append(data[offset + 1 : offset + 1 + length].decode("utf-8"))
+        offset += 1 + length
+    return names, offset
+
+
+def encode_cells(cells: tuple) -> bytes:
+    """Palette + packed indices; the palette is sorted so equal tiles encode equally."""
+    names = sorted({cell for cell in cells if cell is not None})
+    index = {name: i for i, name in enumerate(names, 1)}
+    bits = max(1, len(names).bit_length())
+    packed = 0
+    for i, cell in enumerate(cells):
+        if cell is not None:
+            packed |= index[cell] << (i * bits)
+    return _pack_palette(names) + packed.to_bytes(CELLS * bits // 8, "little")
+
+
+def decode_cells(data: bytes, offset: int = 0) -> tuple[tuple, int]:
+    names, offset = _unpack_palette(data, offset)
+    bits = max(1, (len(names) - 1).bit_length())
+    size = CELLS * bits // 8
+    if len(data) < offset + size:
+        raise ProtocolError("Truncated chunk data")
+    packed = int.from_bytes(data[offset : offset + size], "little")
+    mask = (1 << bits) - 1
+    cells = tuple(names[(packed >> (i * bits)) & mask] for i in range(CELLS))
+    return cells, offset + size
+
+
+def content_hash(cells: tuple) -> int:
+    return zlib.crc32(encode_cells(cells))
+
+
+class ChunkSnapshot:
+    __slots__ = ("version", "cells", "body", "hash", "deltas")
+
+    def __init__(self, version: int, cells: tuple):
+        self.version = version
+        self.cells = cells
+        self.body = encode_cells(cells)
+        self.hash = zlib.crc32(self.body)
+        # base version -> encoded delta from it, shared by every client on that base
+        self.deltas: dict[int, bytes] = {}
+
+
+class ChunkHistory:
+    def __init__(self, grid: TileGrid, depth: int = 8):
+        """
+        Encoded chunk contents at the versions sent to clients. Each version is
+        snapshotted and encoded once however many clients receive it, and the
+        last `depth` versions of a chunk are kept as bases for deltas; a client
+        whose acknowledged version has been evicted gets the full chunk.
+        """
+        self.grid = grid
+        self.depth = depth
+        self._snapshots: dict[tuple[int, int], dict[int, ChunkSnapshot]] = {}
+
+    def current(self, chunk: Chunk) -> ChunkSnapshot:
+        versions = self._snapshots.setdefault(chunk.position, {})
+        snapshot = versions.get(chunk.version)
+        if snapshot is None:
+            snapshot = ChunkSnapshot(chunk.version, chunk_cells(chunk))
+            versions[chunk.version] = snapshot
+            if len(versions) > self.depth:
+                # dicts keep insertion order, so the first is the oldest
+                del versions[next(iter(versions))]
+        return snapshot
+
+    def get(self, position: tuple[int, int], version: int) -> ChunkSnapshot | None:
+        return self._snapshots.get(position, {}).get(version)
+
+    def prune(self):
+        """Drop the snapshots of chunks that no longer exist."""
+        for position in list(self._snapshots):
+            if position not in self.grid.chunk_index:
+                del self._snapshots[position]
+
+    def delta(self, base: ChunkSnapshot, snapshot: ChunkSnapshot) -> bytes:
+        data = snapshot.deltas.get(base.version)
+        if data is None:
+            edits = [
+                (i, new)
+                for i, (old, new) in enumerate(zip(base.cells, snapshot.cells))
+                if old != new
+            ]
+            names = sorted({new for _, new in edits if new is not None})
+            index = {None: 0, **{name: i for i, name in enumerate(names, 1)}}
+            data = b"".join(
+                [
+                    _BASE_VERSION.pack(base.version),
+                    _pack_palette(names),
+                    _COUNT.pack(len(edits)),
+                    *(_CELL_EDIT.pack(cell, index[new]) for cell, new in edits),
+                ]
+            )
+            snapshot.deltas[base.version] = data
+        return data
+
+
+class ClientView:
+    def __init__(self, radius: int = 4, chunk_budget: int = 32 * 1024):
+        """
+        Replication state of one client. Chunks within `radius` chunks of its
+        player are subscribed. acked holds the version of each chunk the client
+        confirmed applying and sent the latest version sent to it; a chunk is
+        only sent again once the previous send is acknowledged, so changes made
+        meanwhile coalesce into one delta against the acknowledged version.
+
+        Entities are delta-encoded against the previous entities message, which
+        the ordered stream always delivers first.
+
+        chunk_budget: chunk bytes sent per update at most; nearest chunks go first
+        """
+        self.chunk_budget = chunk_budget
+        self.acked: dict[tuple[int, int], int] = {}
+        self.sent: dict[tuple[int, int], int] = {}
+        self.entity_ids: dict[str, int] = {}
+        self.entity_positions: dict[int, tuple[int, int]] = {}
+        self._free_ids: list[int] = []
+        self._next_id = 0
+        self.chunk_bytes = 0
+        self.entity_bytes = 0
+        self.set_radius(radius)
+
+    def set_radius(self, radius: int):
+        self.radius = max(0, min(radius, MAX_VIEW_RADIUS))
+        # Chunk offsets in the view, nearest first
+        self.offsets = sorted(
+            (
+                (dx, dy)
+                for dx in range(-self.radius, self.radius + 1)
+                for dy in range(-self.radius, self.radius + 1)
+            ),
+            key=lambda offset: offset[0] ** 2 + offset[1] ** 2,
+        )
+
+    def ack(self, position: tuple[int, int], version: int):
+        # Acks for chunks dropped since are stale
+        if position in self.sent:
+            self.acked[position] = version
+
+    def resync(self, position: tuple[int, int]):
+        """Forget what the client has of a chunk so it is sent in full again."""
+        self.acked.pop(position, None)
+        self.sent.pop(position, None)
+
+    def _assign_id(self, uuid: str) -> int | None:
+        if self._free_ids:
+            entity_id = self._free_ids.pop()
+        elif self._next_id < _MAX_ENTITY_IDS:
+            entity_id = self._next_id
+            self._next_id += 1
+        else:
+            return None
+        self.entity_ids[uuid] = entity_id
+        return entity_id
+
+    def _release_id(self, uuid: str) -> int:
+        entity_id = self.entity_ids.pop(uuid)
+        del self.entity_positions[entity_id]
+        self._free_ids.append(entity_id)
+        return entity_id
+
+
+class Replicator:
+    def __init__(self, grid: TileGrid, history_depth: int = 8):
+        """Builds each client's chunk and entity updates from the shared world."""
+        self.grid = grid
+        self.history = ChunkHistory(grid, history_depth)
+        # chunk position -> version that could not be encoded, logged once each
+        self._unencodable: dict[tuple[int, int], int] = {}
+
+    def update(
+        self,
+        view: ClientView,
+        center: tuple[float, float],
+        tick: int,
+        entities: list[tuple[str, int, int]],
+    ) -> list[bytes]:
+        """
+        Framed messages bringing `view` up to date around the pixel position
+        `center`. entities: (uuid, quantized x, quantized y) of every entity.
+        """
+        chunk_x = int(center[0] // CHUNK_PIXELS)
+        chunk_y = int(center[1] // CHUNK_PIXELS)
+        messages = self._chunk_messages(view, chunk_x, chunk_y)
+        for data in messages:
+            view.chunk_bytes += len(data)
+
+        radius = (view.radius + 1) * CHUNK_PIXELS
+        qx, qy = quantize(center[0]), quantize(center[1])
+        limit = quantize(radius)
+        visible = {
+            uuid: (x, y)
+            for uuid, x, y in entities
+            if abs(x - qx) <= limit and abs(y - qy) <= limit
+        }
+        data = self._entities_message(view, tick, visible)
+        if data is not None:
+            view.entity_bytes += len(data)
+            messages.append(data)
+        return messages
+
+    def _chunk_messages(self, view: ClientView, chunk_x: int, chunk_y: int) -> list:
+        messages = []
+        grid = self.grid
+        # Drop chunks that left the view (with one chunk of slack so walking
+        # along a border does not resend them) or the world
+        for position in list(view.sent):
+            if (
+                max(abs(position[0] - chunk_x), abs(position[1] - chunk_y))
+                > view.radius + 1
+                or position not in grid.chunk_index
+            ):
+                view.resync(position)
+                messages.append(self._frame(position, 0, 0, MODE_DROP))
+
+        budget = view.chunk_budget
+        for dx, dy in view.offsets:
+            if budget <= 0:
+                break
+            position = (chunk_x + dx, chunk_y + dy)
+            chunk = grid.chunk_index.get(position)
+            if chunk is None:
+                continue
+            acked = view.acked.get(position)
+            if view.sent.get(position) != acked or chunk.version == acked:
+                # Up to date, or waiting for the previous send to be acknowledged
+                continue
+            try:
+                snapshot = self.history.current(chunk)
+                base = self.history.get(position, acked) if acked is not None else None
+                body = self.history.delta(base, snapshot) if base is not None else None
+            except ProtocolError as e:
+                # Skip the chunk rather than stopping replication for everyone
+                if self._unencodable.get(position) != chunk.version:
+                    self._unencodable[position] = chunk.version
+                    logger.error("Cannot replicate chunk %s: %s", position, e)
+                continue
+            if body is not None and len(body) < len(snapshot.body):
+                data = self._frame(
+                    position, snapshot.version, snapshot.hash, MODE_DELTA, body
+                )
+            else:
+                data = self._frame(
+                    position, snapshot.version, snapshot.hash, MODE_FULL, snapshot.body
+                )
+            view.sent[position] = snapshot.version
+            budget -= len(data)
+            messages.append(data)
+        return messages
+
+    @staticmethod
+    def _frame(position, version: int, hash: int, mode: int, body: bytes = b""):
+        header = _CHUNK_HEADER.pack(
+            KIND_CHUNK, position[0], position[1], version, hash, mode
+        )
+        return encode_binary(header + body)
+
+    def _entities_message(
+        self, view: ClientView, tick: int, visible: dict[str, tuple[int, int]]
+    ) -> bytes | None:
+        removed = [
+            view._release_id(uuid)
+            for uuid in list(view.entity_ids)
+            if uuid not in visible
+        ]
+        new, moved, jumped = [], [], []
+        for uuid, (x, y) in visible.items():
+            entity_id = view.entity_ids.get(uuid)
+            if entity_id is None:
+                entity_id = view._assign_id(uuid)
+                if entity_id is None:
+                    continue
+                encoded = uuid.encode("utf-8")
+                new.append(_ENTITY_NEW.pack(entity_id, x, y, len(encoded)) + encoded)
+            else:
+                old_x, old_y = view.entity_positions[entity_id]
+                dx, dy = x - old_x, y - old_y
+                if not dx and not dy:
+                    continue
+                if _DELTA_MIN <= dx <= _DELTA_MAX and _DELTA_MIN <= dy <= _DELTA_MAX:
+                    moved.append(_ENTITY_MOVE.pack(entity_id, dx, dy))
+                else:
+                    jumped.append(_ENTITY_JUMP.pack(entity_id, x, y))
+            view.entity_positions[entity_id] = (x, y)
+        if not (removed or new or moved or jumped):
+            return None
+
+        parts = [_ENTITIES_HEADER.pack(KIND_ENTITIES, tick), _COUNT.pack(len(removed))]
+        parts.extend(_ENTITY_ID.pack(entity_id) for entity_id in removed)
+        for section in (new, moved, jumped):
+            parts.append(_COUNT.pack(len(section)))
+            parts.extend(section)
+        return encode_binary(b"".join(parts))
+
+
+class ReplicaClient:
+    def __init__(self):
+        """
+        Client side of the replication: applies chunk and entities messages and
+        collects the acknowledgements and resync requests to send back (see
+        take_messages()). A chunk whose content hash does not match after
+        applying an update is discarded and requested again in full.
+        """
+        # chunk position -> (version, cells)
+        self.chunks: dict[tuple[int, int], tuple[int, tuple]] = {}
+        # entity id -> [uuid, quantized x, quantized y]
+        self.entities: dict[int, list] = {}
+        self.tick = 0
+        self.resyncs = 0
+        self._acks: list[list[int]] = []
+        self._resyncs: list[list[int]] = []
+
+    def apply(self, message: dict):
+        try:
+            if message["type"] == "chunk":
+                self._apply_chunk(message["data"])
+            elif message["type"] == "entities":
+                self._apply_entities(message["data"])
+        except (struct.error, IndexError, KeyError, UnicodeDecodeError) as e:
+            raise ProtocolError(f"Malformed {message['type']} message: {e}") from None
+
+    def _apply_chunk(self, data: bytes):
+        _, chunk_x, chunk_y, version, expected_hash, mode = (
+            _CHUNK_HEADER.unpack_from(data)
+        )
+        position = (chunk_x, chunk_y)
+        offset = _CHUNK_HEADER.size
+        if mode == MODE_DROP:
+            self.chunks.pop(position, None)
+            return
+        if mode == MODE_FULL:
+            cells, _ = decode_cells(data, offset)
+        elif mode == MODE_DELTA:
+            (base,) = _BASE_VERSION.unpack_from(data, offset)
+            current = self.chunks.get(position)
+            if current is None or current[0] != base:
+                self._resync(position)
+                return
+            names, offset = _unpack_palette(data, offset + _BASE_VERSION.size)
+            (count,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            edits = data[offset : offset + count * _CELL_EDIT.size]
+            cells = list(current[1])
+            for cell, index in _CELL_EDIT.iter_unpack(edits):
+                cells[cell] = names[index]
+            cells = tuple(cells)
+        else:
+            raise ProtocolError(f"Unknown chunk mode {mode}")
+
+        if content_hash(cells) != expected_hash:
+            logger.warning("Chunk %s failed its hash check, resyncing", position)
+            self._resync(position)
+            return
+        self.chunks[position] = (version, cells)
+        self._acks.append([chunk_x, chunk_y, version])
+
+    def _resync(self, position: tuple[int, int]):
+        self.chunks.pop(position, None)
+        self.resyncs += 1
+        self._resyncs.append(list(position))
+
+    def _apply_entities(self, data: bytes):
+        _, self.tick = _ENTITIES_HEADER.unpack_from(data)
+        offset = _ENTITIES_HEADER.size
+        entities = self.entities
+
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        for (entity_id,) in _ENTITY_ID.iter_unpack(
+            data[offset : offset + count * _ENTITY_ID.size]
+        ):
+            entities.pop(entity_id, None)
+        offset += count * _ENTITY_ID.size
+
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        for _ in range(count):
+            entity_id, x, y, length = _ENTITY_NEW.unpack_from(data, offset)
+            offset += _ENTITY_NEW.size
+            uuid = data[offset : offset + length].decode("utf-8")
+            offset += length
+            entities[entity_id] = [uuid, x, y]
+
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        end = offset + count * _ENTITY_MOVE.size
+        for entity_id, dx, dy in _ENTITY_MOVE.iter_unpack(data[offset:end]):
+            entity = entities[entity_id]
+            entity[1] += dx
+            entity[2] += dy
+        offset = end
+
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        end = offset + count * _ENTITY_JUMP.size
+        for entity_id, x, y in _ENTITY_JUMP.iter_unpack(data[offset:end]):
+            entities[entity_id][1:] = [x, y]
+
+    def take_messages(self) -> list[dict]:
+        """Control messages to send to the server for what was applied since."""
+        messages = []
+        if self._acks:
+            messages.append({"type": "ack", "chunks": self._acks})
+            self._acks = []
+        if self._resyncs:
+            messages.append({"type": "resync", "chunks": self._resyncs})
+            self._resyncs = []
+        return messages
+
+    def entity_positions(self) -> dict[str, tuple[float, float]]:
+        """Pixel position of every replicated entity by uuid."""
+        return {
+            uuid: (x / POSITION_SCALE, y / POSITION_SCALE)
+            for uuid, x, y in self.entities.values()
+        }
@@ -0,0 +1,418 @@
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+
+from src.entities.player import Player
+from src.errors import GameError, ProtocolError
+from src.keybinds import KeybindManager
+from src.profiler import RingBuffer, percentile
+from src.server.protocol import (
+    ACTIONS,
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    encode,
+    read_message,
+)
+from src.server.replication import (
+    MAX_TILE_NAME_BYTES,
+    ClientView,
+    Replicator,
+    quantize,
+)
+from src.simulation import TICK_RATE, Simulation, create_default_chunks
+from src.world.storage import WorldSaver, load_world
+from src.logging import get_logger
+
+logger = get_logger("openbench_server")
+
+SPAWN_POSITION = (0, 10)
+
+
+class ClientConnection:
+    def __init__(
+        self, player: Player, writer: asyncio.StreamWriter, view_radius: int = 4
+    ):
+        self.player = player
+        self.writer = writer
+        self.view = ClientView(view_radius)
+        # Held actions reported by the client, read by the player's PlayerMovement
+        self.input = KeybindManager({action: [] for action in ACTIONS})
+        self.dropped_states = 0
+
+    @property
+    def uuid(self) -> str:
+        return self.player.uuid
+
+    def send(self, data: bytes):
+        self.writer.write(data)
+
+
+class GameServer:
+    def __init__(
+        self,
+        simulation: Simulation,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        broadcast_rate: int = 20,
+        max_players: int = 64,
+        max_send_buffer: int = 256 * 1024,
+        max_catch_up: int = 5,
+        world_saver: WorldSaver | None = None,
+    ):
+        """
+        Authoritative headless server: runs `simulation` at its fixed tick rate on
+        the asyncio loop and replicates the world to every client broadcast_rate
+        times a second (see replication.Replicator).
+
+        max_send_buffer: bytes a client may have queued before state updates to
+        it are skipped, so one slow reader cannot make the server buffer forever
+        max_catch_up: ticks run back to back after a stall before the rest are
+        skipped
+        world_saver: autosaves the world between ticks and once more on close()
+        """
+        self.simulation = simulation
+        self.host = host
+        self.port = port
+        self.broadcast_every = max(1, round(simulation.tick_rate / broadcast_rate))
+        self.max_players = max_players
+        self.max_send_buffer = max_send_buffer
+        self.max_catch_up = max_catch_up
+        self.world_saver = world_saver
+        self.clients: dict[str, ClientConnection] = {}
+        self.tick_times = RingBuffer(simulation.tick_rate * 60)
+        self.skipped_ticks = 0
+        self.broadcast_bytes = 0
+        self.replicator = Replicator(simulation.grid)
+        self._server: asyncio.Server | None = None
+        self._tick_task: asyncio.Task | None = None
+        # Connection handler tasks, awaited on close() so they end before the loop
+        self._handlers: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port
+        )
+        # Port 0 picks a free port; report the real one
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tick_task = asyncio.create_task(self._tick_loop())
+        logger.info(
+            "Server listening on %s:%d at %d ticks/s",
+            self.host,
+            self.port,
+            self.simulation.tick_rate,
+        )
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        try:
+            await self._stopping.wait()
+        finally:
+            # Also on Ctrl-C, which cancels this task, so the final save happens
+            await self.close()
+
+    def stop(self):
+        self._stopping.set()
+
+    async def close(self):
+        if self._tick_task is not None:
+            self._tick_task.cancel()
+            try:
+                await self._tick_task
+            except asyncio.CancelledError:
+                pass
+            self._tick_task = None
+        for client in list(self.clients.values()):
+            client.writer.close()
+        if self._handlers:
+            # Closed writers make their readers see EOF, so handlers return
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self.world_saver is not None:
+            # The final save may take a while; keep it off the loop
+            await asyncio.to_thread(self.world_saver.close)
+        logger.info("Server stopped")
+
+    async def _tick_loop(self):
+        loop = asyncio.get_running_loop()
+        simulation = self.simulation
+        next_tick = loop.time()
+        while True:
+            now = loop.time()
+            if now < next_tick:
+                await asyncio.sleep(next_tick - now)
+                continue
+            interval = simulation.tick_interval
+            behind = int((now - next_tick) / interval)
+            if behind > self.max_catch_up:
+                skipped = behind - self.max_catch_up
+                self.skipped_ticks += skipped
+                next_tick += skipped * interval
+                logger.warning(
+                    "Server is %d ticks behind, skipping %d", behind, skipped
+                )
+
+            start = time.perf_counter()
+            simulation.tick()
+            self.tick_times.append(time.perf_counter() - start)
+            next_tick += interval
+            if simulation.tick_count % self.broadcast_every == 0:
+                self.replicate()
+            if self.world_saver is not None:
+                self.world_saver.update()
+            # Let client I/O run between ticks even while catching up
+            await asyncio.sleep(0)
+
+    def replicate(self):
+        simulation = self.simulation
+        # Quantized once; each client then gets its own delta-encoded view
+        entities = [
+            (entity.uuid, quantize(entity.position[0]), quantize(entity.position[1]))
+            for entity in simulation.iter_entities()
+        ]
+        self.replicator.history.prune()
+        for client in self.clients.values():
+            transport = client.writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > self.max_send_buffer:
+                # Skipped whole: the view only records what was actually sent
+                client.dropped_states += 1
+                continue
+            for data in self.replicator.update(
+                client.view, client.player.position, simulation.tick_count, entities
+            ):
+                client.send(data)
+                self.broadcast_bytes += len(data)
+
+    def broadcast(self, data: bytes, exclude: str | None = None):
+        # Encoded once and written as-is to every client
+        for client in self.clients.values():
+            if client.uuid == exclude:
+                continue
+            transport = client.writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > self.max_send_buffer:
+                client.dropped_states += 1
+                continue
+            client.send(data)
+            self.broadcast_bytes += len(data)
+
+    def stats(self) -> dict:
+        ordered = sorted(self.tick_times.values())
+        ms = 1000.0
+        return {
+            "tick": self.simulation.tick_count,
+            "tick_rate": self.simulation.tick_rate,
+            "clients": len(self.clients),
+            "entities": len(self.simulation.entity_manager),
+            "tick_ms_mean": sum(ordered) / len(ordered) * ms if ordered else 0.0,
+            "tick_ms_p50": percentile(ordered, 50) * ms,
+            "tick_ms_p95": percentile(ordered, 95) * ms,
+            "tick_ms_p99": percentile(ordered, 99) * ms,
+            "tick_ms_max": ordered[-1] * ms if ordered else 0.0,
+            "skipped_ticks": self.skipped_ticks,
+            "broadcast_bytes": self.broadcast_bytes,
+            "dropped_states": sum(c.dropped_states for c in self.clients.values()),
+            "chunk_bytes": sum(c.view.chunk_bytes for c in self.clients.values()),
+            "entity_bytes": sum(c.view.entity_bytes for c in self.clients.values()),
+        }
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        peer = writer.get_extra_info("peername")
+        client = None
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            hello = await read_message(reader)
+            if hello is None:
+                return
+            if hello["type"] == "stats":
+                # Monitoring connections (e.g. the bot load generator) need no player
+                writer.write(encode({"type": "stats", **self.stats()}))
+                if hello.get("reset"):
+                    # Start a fresh measurement window
+                    self.tick_times.clear()
+                    self.skipped_ticks = 0
+                await writer.drain()
+                return
+            client = self._join(hello, writer)
+            if client is None:
+                return
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                self._handle_message(client, message)
+        except (ProtocolError, GameError) as e:
+            logger.warning("Dropping client %s: %s", peer, e)
+            writer.write(encode({"type": "error", "message": str(e)}))
+        except ConnectionError:
+            pass
+        finally:
+            if client is not None:
+                self._leave(client)
+            writer.close()
+            self._handlers.discard(task)
+
+    def _join(
+        self, hello: dict, writer: asyncio.StreamWriter
+    ) -> ClientConnection | None:
+        if hello["type"] != "hello":
+            raise ProtocolError("Expected a hello message")
+        if len(self.clients) >= self.max_players:
+            writer.write(encode({"type": "error", "message": "Server is full"}))
+            return None
+        username = hello.get("username")
+        if not isinstance(username, str) or not username:
+            raise ProtocolError("hello needs a username")
+        view_radius = hello.get("view_radius", 4)
+        if not isinstance(view_radius, int):
+            raise ProtocolError("hello view_radius must be an integer")
+
+        player = Player(
+            uuid=str(uuid.uuid4()), username=username[:32], position=SPAWN_POSITION
+        )
+        client = ClientConnection(player, writer, view_radius)
+        self.simulation.add_player(player, client.input)
+        self.clients[player.uuid] = client
+
+        client.send(
+            encode(
+                {
+                    "type": "welcome",
+                    "uuid": player.uuid,
+                    "tick": self.simulation.tick_count,
+                    "tick_rate": self.simulation.tick_rate,
+                    "players": {
+                        c.uuid: c.player.username for c in self.clients.values()
+                    },
+                }
+            )
+        )
+        self.broadcast(
+            encode({"type": "join", "uuid": player.uuid, "username": player.username}),
+            exclude=player.uuid,
+        )
+        logger.info("%s joined (%d online)", player.username, len(self.clients))
+        return client
+
+    def _leave(self, client: ClientConnection):
+        self.clients.pop(client.uuid, None)
+        self.simulation.remove_player(client.uuid)
+        self.broadcast(encode({"type": "leave", "uuid": client.uuid}))
+        logger.info("%s left (%d online)", client.player.username, len(self.clients))
+
+    def _handle_message(self, client: ClientConnection, message: dict):
+        kind = message["type"]
+        if kind == "input":
+            actions = message.get("actions", [])
+            if not isinstance(actions, list):
+                raise ProtocolError("input actions must be a list")
+            client.input.set_active(a for a in actions if a in ACTIONS)
+        elif kind == "set_tile":
+            x, y, tile = message.get("x"), message.get("y"), message.get("tile")
+            if not (isinstance(x, int) and isinstance(y, int)):
+                raise ProtocolError("set_tile needs integer tile coordinates")
+            if tile is not None and not isinstance(tile, str):
+                raise ProtocolError("set_tile tile must be a string or null")
+            # Tile names travel in replication palettes with a one-byte length
+            if tile is not None and not 0 < len(tile.encode()) <= MAX_TILE_NAME_BYTES:
+                raise ProtocolError(
+                    f"set_tile tile must be 1 to {MAX_TILE_NAME_BYTES} UTF-8 bytes"
+                )
+            self.simulation.set_tiles([(x, y)], tile)
+        elif kind == "spawn":
+            x, y = message.get("x"), message.get("y")
+            if not (isinstance(x, (int, float)) and isinstance(y, (int, float))):
+                raise ProtocolError("spawn needs a position")
+            self.simulation.spawn_npe(float(x), float(y))
+        elif kind == "ack":
+            for x, y, version in _chunk_list(message, 3):
+                client.view.ack((x, y), version)
+        elif kind == "resync":
+            for x, y in _chunk_list(message, 2):
+                client.view.resync((x, y))
+        elif kind == "view":
+            radius = message.get("radius")
+            if not isinstance(radius, int):
+                raise ProtocolError("view needs an integer radius")
+            client.view.set_radius(radius)
+        elif kind == "stats":
+            client.send(encode({"type": "stats", **self.stats()}))
+        else:
+            raise ProtocolError(f"Unknown message type: {kind}")
+
+
+def _chunk_list(message: dict, length: int) -> list[list[int]]:
+    chunks = message.get("chunks")
+    if not isinstance(chunks, list) or not all(
+        isinstance(entry, list)
+        and len(entry) == length
+        and all(isinstance(v, int) for v in entry)
+        for entry in chunks
+    ):
+        raise ProtocolError(f"{message['type']} needs a list of {length}-integer lists")
+    return chunks
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.server",
+        description="Run a headless dedicated server.",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--seed", type=int, help="seed for the simulation RNG")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE)
+    parser.add_argument(
+        "--broadcast-rate", type=int, default=20, help="state updates per second"
+    )
+    parser.add_argument("--max-players", type=int, default=64)
+    parser.add_argument(
+        "--world", help="directory to load the world from and autosave it to"
+    )
+    parser.add_argument(
+        "--autosave-interval", type=float, default=60.0, help="seconds, 0 disables"
+    )
+    args = parser.parse_args(argv)
+
+    chunks = load_world(args.world) if args.world else []
+    simulation = Simulation(
+        chunks or create_default_chunks(),
+        None,
+        None,
+        seed=args.seed,
+        tick_rate=args.tick_rate,
+    )
+    world_saver = None
+    if args.world:
+        world_saver = WorldSaver(simulation.grid, args.world, args.autosave_interval)
+        if chunks:
+            world_saver.mark_saved()
+    server = GameServer(
+        simulation,
+        args.host,
+        args.port,
+        broadcast_rate=args.broadcast_rate,
+        max_players=args.max_players,
+        world_saver=world_saver,
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        logger.info("Interrupted, shutting down")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,31 +10,45 @@ DEFAULT_SETTINGS_PATH = os.path.abspath(
 )
 
 
+def load_default_settings() -> Dict[str, Any]:
+    with open(DEFAULT_SETTINGS_PATH, "r") as f:
+        return json.load(f)
+
+
+def read_settings_file(path: str) -> Dict[str, Any]:
+    """Parse a settings file, raising ValueError/JSONDecodeError if it is malformed."""
+    with open(path, "r") as f:
+        settings = json.load(f)
+    if not isinstance(settings, dict):
+        raise ValueError("settings.json malformed")
+    return settings
+
+
+def with_defaults(settings: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    # Fill missing keys from default (in memory only, the user's file is kept as is)
+    for key, value in defaults.items():
+        if key not in settings:
+            settings[key] = value
+    return settings
+
+
 def load_settings() -> Dict[str, Any]:
     # Load default settings
-    with open(DEFAULT_SETTINGS_PATH, "r") as f:
-        default_settings = json.load(f)
+    default_settings = load_default_settings()
 
     # Try to load top-level settings.json
+    exists = os.path.exists(SETTINGS_PATH)
     try:
         if not os.path.exists(SETTINGS_PATH) or os.path.getsize(SETTINGS_PATH) == 0:
             raise FileNotFoundError("settings.json missing or empty")
-        with open(SETTINGS_PATH, "r") as f:
-            settings = json.load(f)
-        if not isinstance(settings, dict):
-            raise ValueError("settings.json malformed")
+        settings = read_settings_file(SETTINGS_PATH)
     except (FileNotFoundError, json.JSONDecodeError, ValueError):
         settings = {}
 
-    # Fill missing keys from default
-    updated = False
-    for key, value in default_settings.items():
-        if key not in settings:
-            settings[key] = value
-            updated = True
+    settings = with_defaults(settings, default_settings)
 
-    # If settings was empty or updated, write back to settings.json
-    if updated or not settings:
+    # Only create settings.json on first launch so startup doesn't rewrite it
+    if not exists:
         with open(SETTINGS_PATH, "w") as f:
             json.dump(settings, f, indent=4)
 
@@ -0,0 +1,234 @@
+import logging
+from typing import Any, Callable
+
+from src.errors import InvalidSettingsError
+from src.logging import get_logger
+
+logger = get_logger()
+
+
+def _invalid(key: str, value, expected: str):
+    logger.error("InvalidSettingsError: %s must be %s, got %r", key, expected, value)
+    raise InvalidSettingsError(f"Setting '{key}' must be {expected}, got {value!r}.")
+
+
+def _bool(key, value):
+    if not isinstance(value, bool):
+        _invalid(key, value, "true or false")
+    return value
+
+
+def _string(key, value):
+    if not isinstance(value, str):
+        _invalid(key, value, "a string")
+    return value
+
+
+def _string_list(key, value):
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        _invalid(key, value, "a list of strings")
+    return list(value)
+
+
+def _number(minimum: float, maximum: float, integer: bool = False):
+    expected = f"{'an integer' if integer else 'a number'} from {minimum} to {maximum}"
+    types = int if integer else (int, float)
+
+    def validate(key, value):
+        # bool is an int subclass but never a sensible number here
+        if isinstance(value, bool) or not isinstance(value, types):
+            _invalid(key, value, expected)
+        if not minimum <= value <= maximum:
+            _invalid(key, value, expected)
+        return value
+
+    return validate
+
+
+def _optional(validate):
+    def validate_optional(key, value):
+        return None if value is None else validate(key, value)
+
+    return validate_optional
+
+
+def _size(key, value):
+    if (
+        not isinstance(value, (list, tuple))
+        or len(value) != 2
+        or not all(isinstance(v, int) and not isinstance(v, bool) for v in value)
+        or min(value) <= 0
+    ):
+        _invalid(key, value, "a [width, height] pair of positive integers")
+    return tuple(value)
+
+
+def _log_level(key, value):
+    if not isinstance(value, str) or not isinstance(
+        logging.getLevelName(value.upper()), int
+    ):
+        _invalid(key, value, "a log level name such as INFO or DEBUG")
+    return value.upper()
+
+
+def _log_levels(key, value):
+    if not isinstance(value, dict):
+        _invalid(key, value, "an object of logger name -> level")
+    return {name: _log_level(f"{key}.{name}", level) for name, level in value.items()}
+
+
+def _keybinds(key, value):
+    if not isinstance(value, dict) or not all(
+        isinstance(keys, list) and all(isinstance(k, str) for k in keys)
+        for keys in value.values()
+    ):
+        _invalid(key, value, "an object of action -> list of key names")
+    return {action: list(keys) for action, keys in value.items()}
+
+
+# key -> validator returning the normalized value or raising InvalidSettingsError
+FIELDS: dict[str, Callable[[str, Any], Any]] = {
+    "resolution": _size,
+    "fullscreen": _bool,
+    "resource_packs": _string_list,
+    "hot_reload_assets": _bool,
+    "log_level": _log_level,
+    "log_levels": _log_levels,
+    "metrics_file": _optional(_string),
+    "metrics_interval": _number(0.1, 3600),
+    "profile_dir": _string,
+    "profile_frames": _number(1, 100_000, integer=True),
+    "hitch_threshold_ms": _optional(_number(1, 60_000)),
+    "tick_rate": _number(1, 1000, integer=True),
+    "fps_cap": _number(0, 1000, integer=True),
+    "render_distance": _number(1, 256, integer=True),
+    "render_scale": _number(0.1, 1.0),
+    "adaptive_render_scale": _bool,
+    "min_render_scale": _number(0.1, 1.0),
+    "min_zoom": _number(0.05, 100),
+    "max_zoom": _number(0.05, 100),
+    "thumbnail_zoom": _number(0, 100),
+    "scaled_cache_budget": _number(1, 1_000_000, integer=True),
+    "path_cache_size": _number(0, 1_000_000, integer=True),
+    "tile_update_budget": _number(1, 1_000_000, integer=True),
+    "world_dir": _string,
+    "autosave_interval": _number(0, 86_400),
+    "max_entities": _number(1, 1_000_000, integer=True),
+    "keybinds": _keybinds,
+}
+
+# Keys the running game applies immediately; anything else needs a restart
+LIVE_KEYS = frozenset(
+    {
+        "log_level",
+        "log_levels",
+        "profile_frames",
+        "hitch_threshold_ms",
+        "tick_rate",
+        "fps_cap",
+        "render_distance",
+        "render_scale",
+        "adaptive_render_scale",
+        "min_render_scale",
+        "min_zoom",
+        "max_zoom",
+        "thumbnail_zoom",
+        "scaled_cache_budget",
+        "path_cache_size",
+        "tile_update_budget",
+        "autosave_interval",
+        "max_entities",
+    }
+)
+
+
+class Settings:
+    resolution: tuple[int, int]
+    fullscreen: bool
+    resource_packs: list[str]
+    hot_reload_assets: bool
+    log_level: str
+    log_levels: dict[str, str]
+    metrics_file: str | None
+    metrics_interval: float
+    profile_dir: str
+    profile_frames: int
+    hitch_threshold_ms: float | None
+    tick_rate: int
+    fps_cap: int
+    render_distance: int
+    render_scale: float
+    adaptive_render_scale: bool
+    min_render_scale: float
+    min_zoom: float
+    max_zoom: float
+    thumbnail_zoom: float
+    scaled_cache_budget: int
+    path_cache_size: int
+    tile_update_budget: int
+    world_dir: str
+    autosave_interval: float
+    max_entities: int
+    keybinds: dict[str, list[str]]
+
+    def __init__(self, data: dict, fallback: dict | None = None):
+        """
+        Validated, typed view of a raw settings dict (see load_settings()).
+
+        fallback: raw values used for keys that are missing or invalid in data,
+        normally the defaults at startup and the previous settings on reload.
+        Raises InvalidSettingsError if a key is invalid and has no valid fallback.
+        """
+        self.raw = dict(data)
+        for key, validate in FIELDS.items():
+            try:
+                if key not in data:
+                    raise InvalidSettingsError(f"Setting '{key}' is missing.")
+                value = validate(key, data[key])
+            except InvalidSettingsError:
+                if fallback is None or key not in fallback:
+                    raise
+                logger.warning("Using the previous/default value for '%s'", key)
+                value = validate(key, fallback[key])
+                self.raw[key] = fallback[key]
+            setattr(self, key, value)
+
+        if self.min_zoom > self.max_zoom:
+            self._fall_back_zoom(fallback)
+
+    def _fall_back_zoom(self, fallback: dict | None):
+        # min_zoom and max_zoom are only invalid together, so both are replaced
+        expected = f"at most max_zoom ({self.max_zoom})"
+        try:
+            if fallback is None:
+                raise InvalidSettingsError("No fallback zoom range.")
+            min_zoom = FIELDS["min_zoom"]("min_zoom", fallback.get("min_zoom"))
+            max_zoom = FIELDS["max_zoom"]("max_zoom", fallback.get("max_zoom"))
+        except InvalidSettingsError:
+            _invalid("min_zoom", self.min_zoom, expected)
+        if min_zoom > max_zoom:
+            _invalid("min_zoom", self.min_zoom, expected)
+        logger.warning(
+            "min_zoom %r is above max_zoom %r, using the previous/default values",
+            self.min_zoom,
+            self.max_zoom,
+        )
+        self.min_zoom, self.max_zoom = min_zoom, max_zoom
+        self.raw["min_zoom"] = fallback["min_zoom"]
+        self.raw["max_zoom"] = fallback["max_zoom"]
+
+    def to_dict(self) -> dict:
+        return dict(self.raw)
+
+    def changed_keys(self, other: "Settings") -> set[str]:
+        return {key for key in FIELDS if getattr(self, key) != getattr(other, key)}
+
+    def effective_log_levels(self) -> dict[str, str]:
+        """log_level for the game's loggers, overridden per logger by log_levels."""
+        levels = {"openbench": self.log_level, "openbench_common": self.log_level}
+        levels.update(self.log_levels)
+        return levels
+
+    def __repr__(self):
+        fields = ", ".join(f"{key}={getattr(self, key)!r}" for key in FIELDS)
+        return f"Settings({fields})"
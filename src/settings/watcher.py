@@ -0,0 +1,95 @@
+import os
+import queue
+import threading
+
+from src.errors import InvalidSettingsError
+from src.settings.loader import (
+    SETTINGS_PATH,
+    load_default_settings,
+    read_settings_file,
+    with_defaults,
+)
+from src.settings.model import Settings
+from src.logging import get_logger
+
+logger = get_logger()
+
+
+def _stamp(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class SettingsWatcher:
+    def __init__(
+        self, settings: Settings, path: str = SETTINGS_PATH, poll_interval: float = 1.0
+    ):
+        """
+        Polls `path` on a background thread and validates it again whenever it
+        changes. apply_pending() hands the new Settings to the main thread.
+        Invalid values keep their current setting; a file that does not parse
+        (e.g. saved halfway) is ignored until the next change.
+        """
+        self.settings = settings
+        self.path = path
+        self.poll_interval = poll_interval
+        self._defaults = load_default_settings()
+        self._results: queue.Queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="settings-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _run(self):
+        previous = _stamp(self.path)
+        # Validate against the newest settings seen so fallbacks chain correctly
+        current = self.settings
+        while not self._stop.wait(self.poll_interval):
+            stamp = _stamp(self.path)
+            if stamp == previous or stamp is None:
+                continue
+            previous = stamp
+            try:
+                data = with_defaults(read_settings_file(self.path), self._defaults)
+                current = Settings(data, fallback=current.raw)
+            except (OSError, ValueError, InvalidSettingsError) as e:
+                # JSONDecodeError is a ValueError
+                logger.warning("Ignoring settings change: %s", e)
+                continue
+            self._results.put(current)
+
+    def apply_pending(self) -> tuple[Settings, set[str]] | None:
+        """
+        Call once per frame on the main thread. Returns (settings, changed keys)
+        when the file changed since the last call, otherwise None.
+        """
+        latest = None
+        while True:
+            try:
+                latest = self._results.get_nowait()
+            except queue.Empty:
+                break
+        if latest is None:
+            return None
+        changed = latest.changed_keys(self.settings)
+        self.settings = latest
+        if not changed:
+            return None
+        return latest, changed
+
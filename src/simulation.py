@@ -0,0 +1,215 @@
+import math
+import random
+from uuid import UUID
+
+from src.atrribute import Attribute
+from src.entities.broadphase import SweepAndPrune
+from src.entities.hitbox import Hitbox
+from src.entities.manager import EntityManager, bounds_from_chunks
+from src.entities.movement import PathFollower, PlayerMovement
+from src.entities.npe import NonPlayerEntity
+from src.entities.physics import Physics
+from src.entities.player import Player
+from src.world.chunk import Chunk
+from src.world.grid import TileGrid, TILE_SIZE
+from src.world.navigation import NavGrid, PathPlanner
+from src.world.tile_updates import TileChange, TileUpdater
+from src.world.tile import Tile
+from src.logging import get_logger
+
+logger = get_logger("openbench_common")
+
+TICK_RATE = 60  # ticks per second
+TICK_INTERVAL = 1.0 / TICK_RATE
+
+NPE_GRAVITY = 250.0
+NPE_MOVE_SPEED = 3.0 * TILE_SIZE  # pixels per second
+# Launch speed that lifts an NPE 1.25 tiles, enough to clear the one-tile steps
+# NavGrid.neighbours plans jumps over
+NPE_JUMP_SPEED = math.sqrt(2 * NPE_GRAVITY * 1.25 * TILE_SIZE)
+
+
+def create_default_chunks() -> list[Chunk]:
+    chunks = []
+    for cx in range(3):
+        tiles = [Tile(x, 15, "openbench.wood") for x in range(16)]
+        chunks.append(Chunk((cx, 0), tiles))
+    return chunks
+
+
+class Simulation:
+    def __init__(
+        self,
+        chunks: list[Chunk],
+        player: Player | None,
+        keybind_manager,
+        seed: int | None = None,
+        max_entities: int = 512,
+        tick_rate: int = TICK_RATE,
+        tile_update_budget: int = 1024,
+    ):
+        """
+        Fixed-timestep world and entity simulation, independent of pygame.
+
+        player: the local player, or None for a server that only has remote ones
+        keybind_manager: anything with is_active()/get_active_actions(), normally a KeybindManager
+        seed: seed for the simulation RNG (entity uuids etc.), random if not given
+        tick_rate: fixed ticks per second, see set_tick_rate()
+        tile_update_budget: falling/liquid tile updates per tick, see TileUpdater
+        """
+        self.chunks = chunks
+        self.grid = TileGrid(chunks)
+        self.nav_grid = NavGrid(self.grid)
+        self.path_planner = PathPlanner(self.nav_grid)
+        self.tile_updater = TileUpdater(
+            self.grid, self._apply_tile_changes, budget=tile_update_budget
+        )
+        self.tile_updater.schedule_all()
+        self.player = player
+        self.keybind_manager = keybind_manager
+        # uuid -> movement of every player, local and remote
+        self.players: dict[str, PlayerMovement] = {}
+        if player is not None:
+            self.add_player(player, keybind_manager)
+        self.tick_rate = tick_rate
+        self.tick_interval = 1.0 / tick_rate
+        self.entity_manager = EntityManager(
+            max_entities=max_entities, default_lifetime=60 * tick_rate
+        )
+        self.pending_spawns: list[NonPlayerEntity] = []
+        # Entity-entity overlaps for collision response and triggers, see
+        # broadphase.pairs/began/ended after each tick
+        self.broadphase = SweepAndPrune()
+
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        self.tick_count = 0
+        self.recorder = None
+
+    def add_player(self, player: Player, keybind_manager) -> PlayerMovement:
+        """keybind_manager: the input that steers this player"""
+        movement = PlayerMovement(player, keybind_manager)
+        self.players[player.uuid] = movement
+        return movement
+
+    def remove_player(self, uuid: str) -> Player | None:
+        movement = self.players.pop(uuid, None)
+        return movement.player if movement else None
+
+    def new_entity_uuid(self) -> str:
+        # Derived from the seeded RNG so replays produce identical uuids
+        return f"#{UUID(int=self.rng.getrandbits(128), version=4)}"
+
+    def set_tile(self, world_x: float, world_y: float, tile_type: str | None):
+        if self.recorder:
+            self.recorder.record_edit(world_x, world_y, tile_type)
+        result = self.grid.set_tile(world_x, world_y, tile_type)
+        tile_x, tile_y = int(world_x // 16), int(world_y // 16)
+        self.nav_grid.invalidate_tile(tile_x, tile_y)
+        self.tile_updater.schedule_around(tile_x, tile_y)
+        return result
+
+    def set_tiles(self, tiles, tile_type: str | None) -> int:
+        """
+        Apply one edit to many world tiles at once, e.g. a painted stroke.
+        Duplicates and tiles that already hold tile_type are skipped; returns how
+        many tiles changed.
+        """
+        changed = 0
+        for tile_x, tile_y in dict.fromkeys(tiles):
+            current = self.grid.get_tile(tile_x, tile_y)
+            if (current.type if current else None) == tile_type:
+                continue
+            # Tile centre, so recorded edits replay onto the same tile
+            world_x = tile_x * TILE_SIZE + TILE_SIZE / 2
+            world_y = tile_y * TILE_SIZE + TILE_SIZE / 2
+            if self.recorder:
+                self.recorder.record_edit(world_x, world_y, tile_type)
+            self.grid.set_tile(world_x, world_y, tile_type)
+            self.nav_grid.invalidate_tile(tile_x, tile_y)
+            self.tile_updater.schedule_around(tile_x, tile_y)
+            changed += 1
+        return changed
+
+    def _apply_tile_changes(self, changes: list[TileChange]):
+        # Tile updates follow deterministically from the recorded edits, so they
+        # are not recorded themselves
+        for tile_x, tile_y, tile_type, block_state in changes:
+            self.grid.set_tile(
+                tile_x * TILE_SIZE + TILE_SIZE / 2,
+                tile_y * TILE_SIZE + TILE_SIZE / 2,
+                tile_type,
+                block_state,
+            )
+            self.nav_grid.invalidate_tile(tile_x, tile_y)
+
+    def spawn_npe(self, world_x: float, world_y: float) -> NonPlayerEntity:
+        if self.recorder:
+            self.recorder.record_spawn(world_x, world_y)
+        entity = NonPlayerEntity(
+            uuid=self.new_entity_uuid(),
+            texture_id="openbench.icon",
+            hitbox=Hitbox(1.0, 1.0),
+            position=(world_x, world_y),
+            attributes={
+                "gravity": Attribute("gravity", NPE_GRAVITY),
+                "move_speed": Attribute("move_speed", NPE_MOVE_SPEED),
+                "jump_height": Attribute("jump_height", NPE_JUMP_SPEED),
+            },
+        )
+        entity.physics = Physics(entity, self.grid)
+        self.pending_spawns.append(entity)
+        return entity
+
+    def flush_spawns(self):
+        if self.pending_spawns:
+            self.entity_manager.spawn_batch(self.pending_spawns)
+            self.pending_spawns.clear()
+
+    def tick(self):
+        self.flush_spawns()
+        # Before movement so entities collide with where tiles moved to
+        self.tile_updater.tick()
+        for movement in self.players.values():
+            movement.update()
+        self.path_planner.process()
+        for entity in self.entity_manager:
+            if entity.controller is not None:
+                entity.controller.update()
+            # Apply physics (gravity, collisions)
+            entity.physics.apply(self.tick_interval)
+        self.entity_manager.world_bounds = bounds_from_chunks(self.chunks, margin=4)
+        for uuid in self.entity_manager.update():
+            self.path_planner.cancel(uuid)
+        self.broadphase.update(self.iter_entities())
+        self.tick_count += 1
+
+    def set_tick_rate(self, tick_rate: int):
+        """Change the fixed timestep; entity lifetimes stay the same in seconds."""
+        # Lifetimes are counted in ticks, so live entities' remaining ones are rescaled
+        self.entity_manager.scale_lifetimes(tick_rate / self.tick_rate)
+        self.tick_rate = tick_rate
+        self.tick_interval = 1.0 / tick_rate
+        self.entity_manager.default_lifetime = 60 * tick_rate
+
+    def navigate_to(self, entity, goal: tuple[int, int] | None):
+        """Make `entity` walk to the world tile `goal` (None stops it)."""
+        if entity.controller is None:
+            entity.controller = PathFollower(entity, self.path_planner)
+        entity.controller.set_goal(goal)
+
+    def iter_entities(self):
+        for movement in self.players.values():
+            yield movement.player
+        yield from self.entity_manager
+
+    def advance(self, accumulated_time: list[float]) -> int:
+        """Run as many fixed ticks as fit in accumulated_time[0] and return how many ran."""
+        ticks = 0
+        while accumulated_time[0] >= self.tick_interval:
+            self.tick()
+            accumulated_time[0] -= self.tick_interval
+            ticks += 1
+        if self.recorder:
+            self.recorder.end_frame(self.keybind_manager.get_active_actions(), ticks)
+        return ticks
@@ -0,0 +1,129 @@
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupTimeline:
+    def __init__(self):
+        """Records how long each startup phase takes, in the order they first ran."""
+        self.start = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.total: float | None = None
+        self._last_end = self.start
+
+    @contextmanager
+    def phase(self, name: str):
+        phase_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._last_end = time.perf_counter()
+            elapsed = self._last_end - phase_start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def mark(self, name: str):
+        """Record everything since the previous phase ended as phase `name`."""
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + (now - self._last_end)
+        self._last_end = now
+
+    def finish(self):
+        self.total = time.perf_counter() - self.start
+
+    def log(self, logger):
+        if self.total is None:
+            self.finish()
+        parts = ", ".join(
+            f"{name} {secs * 1000:.1f}ms" for name, secs in self.phases.items()
+        )
+        logger.info("Startup took %.1fms: %s", self.total * 1000, parts)
+
+
+class _TimedLoader:
+    def __init__(self, profiler: "ImportProfiler", name: str, loader):
+        self._profiler = profiler
+        self._name = name
+        self._loader = loader
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if create else None
+
+    def exec_module(self, module):
+        # Put the real loader back so the module looks normally imported
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._profiler._enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._leave(self._name)
+
+
+class ImportProfiler:
+    def __init__(self):
+        """
+        Times every import made while installed and reports it in the same format
+        as `python -X importtime`: self and cumulative microseconds, indented by
+        nesting depth, children before their parent.
+        """
+        self.lines: list[tuple[int, int, int, str]] = []
+        self._stack: list[list[float]] = []
+        self._finding = False
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(self, fullname, spec.loader)
+        return spec
+
+    def _enter(self):
+        # [start, time spent in nested imports]
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def _leave(self, name: str):
+        start, children = self._stack.pop()
+        cumulative = time.perf_counter() - start
+        if self._stack:
+            self._stack[-1][1] += cumulative
+        self.lines.append(
+            (
+                int((cumulative - children) * 1e6),
+                int(cumulative * 1e6),
+                len(self._stack),
+                name,
+            )
+        )
+
+    def dump(self, path: str):
+        with open(path, "w") as f:
+            f.write("import time: self [us] | cumulative | imported package\n")
+            for self_us, cumulative_us, depth, name in self.lines:
+                indent = "  " * depth
+                f.write(
+                    f"import time: {self_us:>9} | {cumulative_us:>10} | {indent}{name}\n"
+                )
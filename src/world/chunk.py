@@ -1,9 +1,15 @@
+import itertools
+
 from src.world.tile import Tile
 from src.errors import InvalidChunkDataError
 from src.logging import get_logger
 
 logger = get_logger("openbench_common")
 
+# Versions are drawn from one world-wide counter so a chunk that is removed and
+# recreated never repeats a version that caches may still hold.
+_next_version = itertools.count(1).__next__
+
 
 class Chunk:
     def __init__(self, position: tuple[int, int], tiles: list[Tile]):
@@ -13,4 +19,25 @@ class Chunk:
 
         self.position = position
         self.tiles = tiles
+        self.tile_map: dict[tuple[int, int], Tile] = {(t.x, t.y): t for t in tiles}
         self.chunk_id_string = f"{position[0]}.{position[1]}"
+        # Bumped on every edit; derived data caches compare against it
+        self.version = _next_version()
+
+    def get_tile(self, x: int, y: int) -> Tile | None:
+        return self.tile_map.get((x, y))
+
+    def put_tile(self, tile: Tile):
+        existing = self.tile_map.get((tile.x, tile.y))
+        if existing is not None:
+            self.tiles.remove(existing)
+        self.tiles.append(tile)
+        self.tile_map[(tile.x, tile.y)] = tile
+        self.version = _next_version()
+
+    def remove_tile(self, x: int, y: int) -> Tile | None:
+        tile = self.tile_map.pop((x, y), None)
+        if tile is not None:
+            self.tiles.remove(tile)
+            self.version = _next_version()
+        return tile
@@ -0,0 +1,74 @@
+from src.world.chunk import Chunk
+from src.world.tile import Tile
+from src.world.set_tile import set_tile
+
+CHUNK_SIZE = 16  # tiles per chunk side
+TILE_SIZE = 16  # pixels per tile side
+
+
+def line_tiles(x0: int, y0: int, x1: int, y1: int) -> list[tuple[int, int]]:
+    """Tiles on the Bresenham line from (x0, y0) to (x1, y1), both ends included."""
+    dx = abs(x1 - x0)
+    dy = -abs(y1 - y0)
+    step_x = 1 if x0 < x1 else -1
+    step_y = 1 if y0 < y1 else -1
+    error = dx + dy
+    tiles = [(x0, y0)]
+    while (x0, y0) != (x1, y1):
+        doubled = 2 * error
+        if doubled >= dy:
+            error += dy
+            x0 += step_x
+        if doubled <= dx:
+            error += dx
+            y0 += step_y
+        tiles.append((x0, y0))
+    return tiles
+
+
+class TileGrid:
+    def __init__(self, chunks: list[Chunk]):
+        """
+        O(1) access to tiles by world tile coordinates over a list of chunks.
+        Edits made through set_tile() keep the chunk index in sync with the list
+        and are reported to every callable in edit_listeners with the position of
+        the chunk they touched.
+        """
+        self.chunks = chunks
+        self.chunk_index: dict[tuple[int, int], Chunk] = {}
+        self.edit_listeners: list = []
+        self.rebuild_index()
+
+    def rebuild_index(self):
+        self.chunk_index = {chunk.position: chunk for chunk in self.chunks}
+
+    def get_chunk(self, chunk_x: int, chunk_y: int) -> Chunk | None:
+        return self.chunk_index.get((chunk_x, chunk_y))
+
+    def get_tile(self, tile_x: int, tile_y: int) -> Tile | None:
+        chunk = self.chunk_index.get((tile_x // CHUNK_SIZE, tile_y // CHUNK_SIZE))
+        if chunk is None:
+            return None
+        return chunk.tile_map.get((tile_x % CHUNK_SIZE, tile_y % CHUNK_SIZE))
+
+    def is_solid(self, tile_x: int, tile_y: int) -> bool:
+        return self.get_tile(tile_x, tile_y) is not None
+
+    def set_tile(
+        self,
+        world_x: float,
+        world_y: float,
+        tile_type: str | None,
+        block_state: dict | None = None,
+    ):
+        result = set_tile(
+            self.chunks, world_x, world_y, tile_type, self.chunk_index, block_state
+        )
+        if self.edit_listeners:
+            position = (
+                int(world_x // TILE_SIZE) // CHUNK_SIZE,
+                int(world_y // TILE_SIZE) // CHUNK_SIZE,
+            )
+            for listener in self.edit_listeners:
+                listener(position)
+        return result
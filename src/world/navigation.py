@@ -0,0 +1,262 @@
+import heapq
+from collections import OrderedDict, deque
+
+from src.world.grid import TileGrid, CHUNK_SIZE
+from src.logging import get_logger
+
+logger = get_logger("openbench_common")
+
+Cell = tuple[int, int]
+
+
+class NavGrid:
+    def __init__(self, grid: TileGrid, clearance: int = 1):
+        """
+        Walkable-surface cells derived from chunk tiles, cached per chunk.
+
+        A cell is walkable when it and the `clearance - 1` cells above it are empty
+        and the cell below it is solid. Nav data for a chunk is rebuilt lazily the
+        next time it is read after invalidate_tile() touched it.
+        """
+        self.grid = grid
+        self.clearance = clearance
+        self._chunks: dict[Cell, frozenset[Cell]] = {}
+        # Per-chunk rebuild counter, used by path caches to detect stale paths
+        self.revisions: dict[Cell, int] = {}
+        self.rebuilds = 0
+
+    def _build_chunk(self, chunk_x: int, chunk_y: int) -> frozenset[Cell]:
+        is_solid = self.grid.is_solid
+        base_x = chunk_x * CHUNK_SIZE
+        base_y = chunk_y * CHUNK_SIZE
+        walkable = []
+        for local_y in range(CHUNK_SIZE):
+            ty = base_y + local_y
+            for local_x in range(CHUNK_SIZE):
+                tx = base_x + local_x
+                if not is_solid(tx, ty + 1):
+                    continue
+                if any(is_solid(tx, ty - k) for k in range(self.clearance)):
+                    continue
+                walkable.append((local_x, local_y))
+        self.rebuilds += 1
+        return frozenset(walkable)
+
+    def chunk_cells(self, chunk_x: int, chunk_y: int) -> frozenset[Cell]:
+        key = (chunk_x, chunk_y)
+        cells = self._chunks.get(key)
+        if cells is None:
+            cells = self._build_chunk(chunk_x, chunk_y)
+            self._chunks[key] = cells
+        return cells
+
+    def is_walkable(self, tile_x: int, tile_y: int) -> bool:
+        cells = self.chunk_cells(tile_x // CHUNK_SIZE, tile_y // CHUNK_SIZE)
+        return (tile_x % CHUNK_SIZE, tile_y % CHUNK_SIZE) in cells
+
+    def is_clear(self, tile_x: int, tile_y: int) -> bool:
+        return not self.grid.is_solid(tile_x, tile_y)
+
+    def invalidate_chunk(self, chunk_x: int, chunk_y: int):
+        key = (chunk_x, chunk_y)
+        self._chunks.pop(key, None)
+        self.revisions[key] = self.revisions.get(key, 0) + 1
+
+    def invalidate_tile(self, tile_x: int, tile_y: int):
+        """Drop nav data of the chunks whose walkable cells depend on this tile."""
+        chunk_x, chunk_y = tile_x // CHUNK_SIZE, tile_y // CHUNK_SIZE
+        local_y = tile_y % CHUNK_SIZE
+        self.invalidate_chunk(chunk_x, chunk_y)
+        # The cell above the edited tile may live in the chunk above
+        if local_y == 0:
+            self.invalidate_chunk(chunk_x, chunk_y - 1)
+        # Cells below it check their clearance against this tile
+        if local_y + self.clearance - 1 >= CHUNK_SIZE:
+            self.invalidate_chunk(chunk_x, chunk_y + 1)
+
+    def clear(self):
+        for key in list(self._chunks):
+            self.invalidate_chunk(*key)
+
+    def neighbours(self, cell: Cell, max_drop: int = 4):
+        """Yield (cell, cost) moves: walk, jump up one tile, or drop up to max_drop."""
+        x, y = cell
+        is_walkable = self.is_walkable
+        is_clear = self.is_clear
+        head_clear = is_clear(x, y - self.clearance)
+        for dx in (-1, 1):
+            nx = x + dx
+            if is_walkable(nx, y):
+                yield (nx, y), 1.0
+                continue
+            if head_clear and is_walkable(nx, y - 1):
+                yield (nx, y - 1), 2.0
+                continue
+            for drop in range(1, max_drop + 1):
+                if not is_clear(nx, y + drop - 1):
+                    break
+                if is_walkable(nx, y + drop):
+                    yield (nx, y + drop), 1.0 + 0.5 * drop
+                    break
+
+    def find_ground(self, cell: Cell, max_drop: int = 4) -> Cell | None:
+        """The walkable cell at or below `cell`, if one is within max_drop tiles."""
+        x, y = cell
+        for drop in range(max_drop + 1):
+            if self.is_walkable(x, y + drop):
+                return (x, y + drop)
+            if not self.is_clear(x, y + drop + 1):
+                return None
+        return None
+
+
+def find_path(
+    nav: NavGrid, start: Cell, goal: Cell, max_expansions: int = 4096
+) -> list[Cell] | None:
+    """A* over walkable cells; returns the cells from start to goal inclusive, or None."""
+    if start == goal:
+        return [start]
+
+    gx, gy = goal
+
+    def heuristic(cell: Cell) -> float:
+        # Admissible for the move costs in NavGrid.neighbours
+        return abs(cell[0] - gx) + 0.5 * abs(cell[1] - gy)
+
+    open_heap = [(heuristic(start), 0.0, start)]
+    came_from: dict[Cell, Cell] = {}
+    best_cost = {start: 0.0}
+    expansions = 0
+    while open_heap:
+        _, cost, cell = heapq.heappop(open_heap)
+        if cell == goal:
+            path = [cell]
+            while cell in came_from:
+                cell = came_from[cell]
+                path.append(cell)
+            path.reverse()
+            return path
+        if cost > best_cost.get(cell, float("inf")):
+            continue
+        expansions += 1
+        if expansions > max_expansions:
+            break
+        for neighbour, step in nav.neighbours(cell):
+            new_cost = cost + step
+            if new_cost < best_cost.get(neighbour, float("inf")):
+                best_cost[neighbour] = new_cost
+                came_from[neighbour] = cell
+                heapq.heappush(
+                    open_heap, (new_cost + heuristic(neighbour), new_cost, neighbour)
+                )
+    return None
+
+
+class PathPlanner:
+    def __init__(
+        self,
+        nav: NavGrid,
+        requests_per_tick: int = 4,
+        cache_size: int = 256,
+        goal_tolerance: int = 1,
+    ):
+        """
+        Queues path requests and solves at most `requests_per_tick` of them per
+        tick. Solved paths are cached by goal and shared: any agent whose start
+        lies on a cached path to a goal within `goal_tolerance` tiles of its own
+        reuses the remainder of that path.
+        """
+        self.nav = nav
+        self.requests_per_tick = requests_per_tick
+        self.cache_size = cache_size
+        self.goal_tolerance = goal_tolerance
+        self._queue: deque[str] = deque()
+        self._pending: dict[str, tuple[Cell, Cell]] = {}
+        self._results: dict[str, list[Cell] | None] = {}
+        # goal -> list of (path, {cell: index}, {chunk: revision})
+        self._cache: OrderedDict[Cell, list[tuple]] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def request(self, agent_id: str, start: Cell, goal: Cell):
+        """Ask for a path; the result is available from take_result() once solved."""
+        cached = self._lookup(start, goal)
+        if cached is not None:
+            self.cache_hits += 1
+            self._pending.pop(agent_id, None)
+            self._results[agent_id] = cached
+            return
+        if agent_id not in self._pending:
+            self._queue.append(agent_id)
+        # A newer request from the same agent replaces the queued one
+        self._pending[agent_id] = (start, goal)
+
+    def cancel(self, agent_id: str):
+        self._pending.pop(agent_id, None)
+        self._results.pop(agent_id, None)
+
+    def take_result(self, agent_id: str):
+        """Return (True, path_or_None) once solved, otherwise (False, None)."""
+        if agent_id in self._results:
+            return True, self._results.pop(agent_id)
+        return False, None
+
+    def process(self) -> int:
+        """Solve up to requests_per_tick queued requests; returns how many were solved."""
+        solved = 0
+        while self._queue and solved < self.requests_per_tick:
+            agent_id = self._queue.popleft()
+            request = self._pending.pop(agent_id, None)
+            if request is None:
+                continue  # Cancelled
+            start, goal = request
+            # An earlier request this tick may already have cached a usable path
+            path = self._lookup(start, goal)
+            if path is not None:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+                path = find_path(self.nav, start, goal)
+                solved += 1
+                if path is not None:
+                    self._store(path)
+            self._results[agent_id] = path
+        return solved
+
+    def _chunk_revisions(self, path: list[Cell]) -> dict[Cell, int]:
+        revisions = self.nav.revisions
+        chunks = {(x // CHUNK_SIZE, y // CHUNK_SIZE) for x, y in path}
+        return {chunk: revisions.get(chunk, 0) for chunk in chunks}
+
+    def _store(self, path: list[Cell]):
+        goal = path[-1]
+        index = {cell: i for i, cell in enumerate(path)}
+        entry = (path, index, self._chunk_revisions(path))
+        self._cache.setdefault(goal, []).append(entry)
+        self._cache.move_to_end(goal)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _lookup(self, start: Cell, goal: Cell) -> list[Cell] | None:
+        tolerance = self.goal_tolerance
+        revisions = self.nav.revisions
+        for dy in range(-tolerance, tolerance + 1):
+            for dx in range(-tolerance, tolerance + 1):
+                key = (goal[0] + dx, goal[1] + dy)
+                entries = self._cache.get(key)
+                if not entries:
+                    continue
+                # Drop paths through chunks whose nav data was rebuilt since
+                entries[:] = [
+                    e
+                    for e in entries
+                    if all(revisions.get(c, 0) == r for c, r in e[2].items())
+                ]
+                for path, index, _ in entries:
+                    i = index.get(start)
+                    if i is not None:
+                        self._cache.move_to_end(key)
+                        return path[i:]
+                if not entries:
+                    del self._cache[key]
+        return None
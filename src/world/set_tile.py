@@ -2,7 +2,13 @@ from src.world.tile import Tile
 from src.world.chunk import Chunk
 
 
-def set_tile(chunks, world_x, world_y, tile_type):
+def set_tile(chunks, world_x, world_y, tile_type, chunk_index=None, block_state=None):
+    """
+    chunk_index: optional dict of chunk position -> Chunk kept in sync with `chunks`;
+    when given it replaces the linear chunk search
+    block_state: state for the new tile; a tile of the same type is replaced when
+    its state differs
+    """
     tile_x = int(world_x // 16)
     tile_y = int(world_y // 16)
     chunk_x = tile_x // 16
@@ -11,33 +17,38 @@ def set_tile(chunks, world_x, world_y, tile_type):
     local_y = tile_y % 16
     # Find chunk by position
     found_chunk = None
-    for chunk in chunks:
-        if chunk.position == (chunk_x, chunk_y):
-            found_chunk = chunk
-            break
-    found_tile = None
-    if found_chunk:
-        for tile in found_chunk.tiles:
-            if tile.x == local_x and tile.y == local_y:
-                found_tile = tile
+    if chunk_index is not None:
+        found_chunk = chunk_index.get((chunk_x, chunk_y))
+    else:
+        for chunk in chunks:
+            if chunk.position == (chunk_x, chunk_y):
+                found_chunk = chunk
                 break
+    if found_chunk:
+        found_tile = found_chunk.get_tile(local_x, local_y)
         if tile_type is None:
             if found_tile:
-                found_chunk.tiles.remove(found_tile)
+                found_chunk.remove_tile(local_x, local_y)
                 if not found_chunk.tiles:
                     chunks.remove(found_chunk)
+                    if chunk_index is not None:
+                        del chunk_index[found_chunk.position]
             return found_chunk, None
-        if not found_tile:
-            found_tile = Tile(local_x, local_y, tile_type)
-            found_chunk.tiles.append(found_tile)
-        else:
-            found_tile.type = tile_type
+        if (
+            not found_tile
+            or found_tile.type != tile_type
+            or (block_state is not None and found_tile.block_state != block_state)
+        ):
+            found_tile = Tile(local_x, local_y, tile_type, block_state)
+            found_chunk.put_tile(found_tile)
         return found_chunk, found_tile
     else:
         if tile_type is None:
             return None, None
         # Create chunk with the new tile
-        found_tile = Tile(local_x, local_y, tile_type)
+        found_tile = Tile(local_x, local_y, tile_type, block_state)
         found_chunk = Chunk((chunk_x, chunk_y), [found_tile])
         chunks.append(found_chunk)
+        if chunk_index is not None:
+            chunk_index[found_chunk.position] = found_chunk
         return found_chunk, found_tile
@@ -0,0 +1,241 @@
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+
+from src.errors import InvalidChunkDataError
+from src.world.chunk import Chunk
+from src.world.grid import TileGrid
+from src.world.tile import Tile
+from src.logging import get_logger
+
+logger = get_logger("openbench_common")
+
+FORMAT_VERSION = 1
+# One file per chunk, named after Chunk.chunk_id_string
+CHUNK_SUFFIX = ".chunk"
+
+
+def chunk_file_name(chunk_id_string: str) -> str:
+    return chunk_id_string + CHUNK_SUFFIX
+
+
+def encode_chunk(position: tuple[int, int], tiles: list[Tile], level: int = 6) -> bytes:
+    """zlib-compressed JSON of a chunk's tiles."""
+    data = {
+        "version": FORMAT_VERSION,
+        "position": list(position),
+        "tiles": [
+            [tile.x, tile.y, tile.type, tile.block_state]
+            if tile.block_state
+            else [tile.x, tile.y, tile.type]
+            for tile in tiles
+        ],
+    }
+    return zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"), level)
+
+
+def decode_chunk(data: bytes) -> Chunk:
+    try:
+        decoded = json.loads(zlib.decompress(data))
+        if decoded.get("version") != FORMAT_VERSION:
+            raise ValueError(f"unsupported format version {decoded.get('version')}")
+        x, y = decoded["position"]
+        tiles = [Tile(*entry) for entry in decoded["tiles"]]
+    except (zlib.error, ValueError, KeyError, TypeError) as e:
+        # JSONDecodeError and UnicodeDecodeError are ValueErrors
+        logger.error(f"InvalidChunkDataError: Could not decode chunk: {e}")
+        raise InvalidChunkDataError(f"Could not decode chunk: {e}") from None
+    return Chunk((x, y), tiles)
+
+
+def write_atomic(path: str, data: bytes):
+    """Write data to path so readers see either the old file or the new one."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def load_world(directory: str) -> list[Chunk]:
+    """Every chunk saved in directory; unreadable chunk files are skipped."""
+    if not os.path.isdir(directory):
+        return []
+    chunks = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(CHUNK_SUFFIX):
+            continue
+        try:
+            with open(os.path.join(directory, name), "rb") as f:
+                chunks.append(decode_chunk(f.read()))
+        except (OSError, InvalidChunkDataError) as e:
+            logger.warning("Skipping chunk file %s: %s", name, e)
+    logger.info("Loaded %d chunks from %s", len(chunks), directory)
+    return chunks
+
+
+class WorldSaver:
+    def __init__(
+        self,
+        grid: TileGrid,
+        directory: str,
+        interval: float = 60.0,
+        compress_level: int = 6,
+    ):
+        """
+        Saves the chunks of `grid` to `directory` every `interval` seconds
+        (0 turns autosave off; save() still works).
+
+        The calling thread only snapshots chunks edited since the last save (see
+        TileGrid.edit_listeners) whose version changed, as a shallow copy of each
+        tile list. Edits replace Tile objects rather than changing them (see
+        set_tile), so the copy keeps showing the saved state while the world
+        moves on. Encoding, compression and atomic file replacement run on a
+        worker thread; a save requested while the previous one is still writing
+        is skipped.
+        """
+        self.grid = grid
+        self.directory = directory
+        self.interval = interval
+        self.compress_level = compress_level
+        # chunk position -> (version, chunk_id_string) as of the last snapshot
+        self.saved: dict[tuple[int, int], tuple[int, str]] = {}
+        # Positions of chunks edited since the last snapshot; all of them at first
+        self._dirty: set[tuple[int, int]] = set(grid.chunk_index)
+        grid.edit_listeners.append(self._dirty.add)
+        self.saves = 0
+        self.last_report: dict | None = None
+        self._next_due = time.perf_counter() + interval
+        self._idle = threading.Event()
+        self._idle.set()
+        self._failed: list[tuple[int, int]] = []
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="world-saver", daemon=True
+        )
+        self._thread.start()
+
+    def mark_saved(self):
+        """Treat the world as saved as it is now, e.g. right after loading it."""
+        self.saved = {
+            position: (chunk.version, chunk.chunk_id_string)
+            for position, chunk in self.grid.chunk_index.items()
+        }
+        self._dirty.clear()
+
+    def update(self) -> bool:
+        """Call once per frame or tick; saves when the interval has passed."""
+        if self.interval <= 0:
+            return False
+        now = time.perf_counter()
+        if now < self._next_due:
+            return False
+        self._next_due = now + self.interval
+        return self.save()
+
+    def save(self) -> bool:
+        """Snapshot the changed chunks and queue them for writing."""
+        if not self._idle.is_set():
+            logger.debug("Previous save still running, skipping this one")
+            return False
+        start = time.perf_counter()
+        saved = self.saved
+        # Chunks the worker could not write are saved again
+        while self._failed:
+            position = self._failed.pop()
+            saved.pop(position, None)
+            self._dirty.add(position)
+        index = self.grid.chunk_index
+        changed = []
+        removed = []
+        for position in self._dirty:
+            chunk = index.get(position)
+            entry = saved.get(position)
+            if chunk is None:
+                if entry is not None:
+                    removed.append((position, entry[1]))
+                    del saved[position]
+            elif entry is None or entry[0] != chunk.version:
+                changed.append((position, chunk.chunk_id_string, list(chunk.tiles)))
+                saved[position] = (chunk.version, chunk.chunk_id_string)
+        self._dirty.clear()
+        snapshot_time = time.perf_counter() - start
+        if not changed and not removed:
+            return False
+        self._idle.clear()
+        self._queue.put((changed, removed, snapshot_time))
+        return True
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._idle.wait(timeout)
+
+    def close(self, save: bool = True):
+        """Stop the worker, first saving any remaining changes when `save` is set."""
+        if save:
+            self.wait()
+            self.save()
+        self._queue.put(None)
+        self._thread.join(timeout=30.0)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            try:
+                self._write(*job)
+            finally:
+                self._idle.set()
+
+    def _write(self, changed: list, removed: list, snapshot_time: float):
+        start = time.perf_counter()
+        written = 0
+        failed = 0
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError as e:
+            logger.error("Could not create world directory %s: %s", self.directory, e)
+            self._failed.extend(position for position, _, _ in changed)
+            return
+        for position, chunk_id, tiles in changed:
+            path = os.path.join(self.directory, chunk_file_name(chunk_id))
+            try:
+                data = encode_chunk(position, tiles, self.compress_level)
+                write_atomic(path, data)
+            except OSError as e:
+                logger.error("Could not save chunk %s: %s", chunk_id, e)
+                self._failed.append(position)
+                failed += 1
+                continue
+            written += len(data)
+        for _, chunk_id in removed:
+            try:
+                os.remove(os.path.join(self.directory, chunk_file_name(chunk_id)))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error("Could not delete chunk file %s: %s", chunk_id, e)
+
+        duration = time.perf_counter() - start
+        self.saves += 1
+        self.last_report = {
+            "chunks": len(changed) - failed,
+            "removed": len(removed),
+            "failed": failed,
+            "bytes": written,
+            "snapshot_us": round(snapshot_time * 1e6, 1),
+            "duration_ms": round(duration * 1000, 3),
+        }
+        logger.info(
+            "Saved %d chunks (%d removed) to %s: %d bytes in %.1fms, snapshot %.0fus",
+            len(changed) - failed,
+            len(removed),
+            self.directory,
+            written,
+            duration * 1000,
+            snapshot_time * 1e6,
+        )
@@ -0,0 +1,241 @@
+from collections import deque
+from itertools import islice
+from typing import Callable
+
+from src.world.grid import CHUNK_SIZE, TileGrid
+from src.world.tile import Tile
+from src.logging import get_logger
+
+logger = get_logger("openbench_common")
+
+Cell = tuple[int, int]
+# tile x, tile y, new tile type (None removes the tile), new block_state
+TileChange = tuple[int, int, str | None, dict | None]
+
+FALLING = "falling"
+LIQUID = "liquid"
+
+# Tile types that move on their own -> how they move
+BEHAVIOURS: dict[str, str] = {
+    "openbench.sand": FALLING,
+    "openbench.water": LIQUID,
+}
+# A liquid tile holds block_state["level"] units, 1..MAX_LEVEL; no level means full
+MAX_LEVEL = 8
+# Tile row below which moving tiles are removed rather than falling forever
+WORLD_FLOOR = 4096
+
+
+def liquid_level(tile: Tile) -> int:
+    return tile.block_state.get("level", MAX_LEVEL)
+
+
+class TileUpdater:
+    def __init__(
+        self,
+        grid: TileGrid,
+        apply: Callable[[list[TileChange]], None],
+        budget: int = 1024,
+        chunk_budget: int = 256,
+        floor: int | None = WORLD_FLOOR,
+    ):
+        """
+        Moves falling and liquid tiles (see BEHAVIOURS) without scanning the
+        world: only cells scheduled by an edit, or next to a cell that changed,
+        are updated. Each chunk has its own queue. A tick updates at most `budget`
+        cells, and at most chunk_budget in any one chunk, leaving the rest queued
+        for later ticks; a chunk whose queue empties sleeps until a cell in it is
+        scheduled again.
+
+        Tiles move into cells of chunks that do not exist yet, since a missing
+        chunk is just empty space; set_tile creates it.
+
+        apply: writes the changes of one cell update to the world
+        floor: tile row that falling and liquid tiles are removed below, None for none
+        """
+        self.grid = grid
+        self.apply = apply
+        self.budget = budget
+        self.chunk_budget = chunk_budget
+        self.floor = floor
+        # chunk position -> queued cells, oldest first (dict as an ordered set)
+        self._queues: dict[Cell, dict[Cell, None]] = {}
+        # Positions of the chunks with queued cells, in round-robin order
+        self._awake: deque[Cell] = deque()
+        self.tick_count = 0
+        # Cells updated and tiles changed during the last tick
+        self.updates = 0
+        self.changes = 0
+
+    @property
+    def active_cells(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    @property
+    def awake_chunks(self) -> int:
+        return len(self._queues)
+
+    def schedule(self, tile_x: int, tile_y: int):
+        key = (tile_x // CHUNK_SIZE, tile_y // CHUNK_SIZE)
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = {}
+            self._awake.append(key)
+        queue[(tile_x, tile_y)] = None
+
+    def schedule_around(self, tile_x: int, tile_y: int):
+        """Schedule a cell and its eight neighbours, e.g. after it was edited."""
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                self.schedule(tile_x + dx, tile_y + dy)
+
+    def schedule_all(self):
+        """Schedule every moving tile in the world, e.g. after it was loaded."""
+        for chunk in self.grid.chunks:
+            base_x = chunk.position[0] * CHUNK_SIZE
+            base_y = chunk.position[1] * CHUNK_SIZE
+            for tile in chunk.tiles:
+                if tile.type in BEHAVIOURS:
+                    self.schedule(base_x + tile.x, base_y + tile.y)
+
+    def clear(self):
+        self._queues.clear()
+        self._awake.clear()
+
+    def tick(self):
+        self.tick_count += 1
+        budget = self.budget
+        updates = changes = 0
+        # Cells changed this tick; each tile moves at most one step per tick
+        touched: set[Cell] = set()
+        # Chunks woken during this tick join the rotation at the back
+        for _ in range(len(self._awake)):
+            if budget <= 0:
+                break
+            key = self._awake.popleft()
+            queue = self._queues[key]
+            batch = list(islice(queue, min(budget, self.chunk_budget)))
+            for cell in batch:
+                del queue[cell]
+            # Bottom-up, so a column of falling tiles moves together
+            batch.sort(key=lambda cell: -cell[1])
+            for cell in batch:
+                if cell in touched:
+                    queue[cell] = None
+                    continue
+                updates += 1
+                cell_changes = self._update(*cell)
+                if not cell_changes:
+                    continue
+                self.apply(cell_changes)
+                changes += len(cell_changes)
+                for tile_x, tile_y, _, _ in cell_changes:
+                    touched.add((tile_x, tile_y))
+                    self.schedule_around(tile_x, tile_y)
+            budget -= len(batch)
+            if queue:
+                self._awake.append(key)
+            else:
+                # Stable: sleep until something schedules a cell here again
+                del self._queues[key]
+        self.updates = updates
+        self.changes = changes
+
+    def _below_floor(self, tile_y: int) -> bool:
+        return self.floor is not None and tile_y > self.floor
+
+    def _sides(self) -> tuple[int, int]:
+        # Alternate which side goes first so piles and pools stay symmetric
+        return (-1, 1) if self.tick_count % 2 else (1, -1)
+
+    def _update(self, tile_x: int, tile_y: int) -> list[TileChange]:
+        tile = self.grid.get_tile(tile_x, tile_y)
+        if tile is None:
+            return []
+        behaviour = BEHAVIOURS.get(tile.type)
+        if behaviour == FALLING:
+            return self._fall(tile, tile_x, tile_y)
+        if behaviour == LIQUID:
+            return self._flow(tile, tile_x, tile_y)
+        return []
+
+    # Changes list the destination before the source so moving the last tile
+    # of a chunk does not remove and recreate the chunk
+
+    def _fall(self, tile: Tile, tile_x: int, tile_y: int) -> list[TileChange]:
+        get_tile = self.grid.get_tile
+        below = get_tile(tile_x, tile_y + 1)
+        if below is None:
+            if self._below_floor(tile_y + 1):
+                # Fell out of the world
+                return [(tile_x, tile_y, None, None)]
+            return [
+                (tile_x, tile_y + 1, tile.type, None),
+                (tile_x, tile_y, None, None),
+            ]
+        if BEHAVIOURS.get(below.type) == LIQUID:
+            # Sinks through liquids
+            return [
+                (tile_x, tile_y + 1, tile.type, None),
+                (tile_x, tile_y, below.type, below.block_state),
+            ]
+        for dx in self._sides():
+            if (
+                get_tile(tile_x + dx, tile_y) is None
+                and get_tile(tile_x + dx, tile_y + 1) is None
+                and not self._below_floor(tile_y + 1)
+            ):
+                return [
+                    (tile_x + dx, tile_y + 1, tile.type, None),
+                    (tile_x, tile_y, None, None),
+                ]
+        return []
+
+    def _flow(self, tile: Tile, tile_x: int, tile_y: int) -> list[TileChange]:
+        get_tile = self.grid.get_tile
+        level = liquid_level(tile)
+        below = get_tile(tile_x, tile_y + 1)
+        if below is None:
+            if self._below_floor(tile_y + 1):
+                return [(tile_x, tile_y, None, None)]
+            return [
+                (tile_x, tile_y + 1, tile.type, {"level": level}),
+                (tile_x, tile_y, None, None),
+            ]
+
+        changes = []
+        remaining = level
+        if below.type == tile.type:
+            below_level = liquid_level(below)
+            flow = min(MAX_LEVEL - below_level, remaining)
+            if flow > 0:
+                changes.append(
+                    (tile_x, tile_y + 1, tile.type, {"level": below_level + flow})
+                )
+                remaining -= flow
+        # Spread sideways over anything it cannot flow into, evening out levels
+        # until neighbours differ by at most one so pools come to rest
+        for dx in self._sides():
+            if remaining < 2:
+                break
+            side = get_tile(tile_x + dx, tile_y)
+            if side is None:
+                side_level = 0
+            elif side.type == tile.type:
+                side_level = liquid_level(side)
+            else:
+                continue
+            flow = (remaining - side_level) // 2
+            if flow > 0:
+                changes.append(
+                    (tile_x + dx, tile_y, tile.type, {"level": side_level + flow})
+                )
+                remaining -= flow
+
+        if remaining == level:
+            return []
+        if remaining:
+            changes.append((tile_x, tile_y, tile.type, {"level": remaining}))
+        else:
+            changes.append((tile_x, tile_y, None, None))
+        return changes